@@ -1,22 +1,52 @@
-from typing import Final
+from functools import partial
+from typing import Awaitable, Callable, Final
+import inspect
+import logging
+import os
+import traceback
 
 import voluptuous as vol
 
 from homeassistant.const import ATTR_ENTITY_ID, Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ConfigEntryError
 from homeassistant.helpers import llm
 from homeassistant.util.json import JsonObjectType
 
 from .const import (
     ALLOWED_SERVICE_CALL_ARGUMENTS,
+    CONF_MEDIA_PLAYER,
+    CONF_SATELLITE_DEVICE,
+    DATA_PROMPT_CACHE,
+    DATA_QPL,
+    DATA_SELECTION_CACHE,
+    DATA_VIRTUAL_TIMERS,
     DOMAIN,
+    PROMPT_DIRECTORIES,
     SERVICE_TOOL_ALLOWED_DOMAINS,
     SERVICE_TOOL_ALLOWED_SERVICES,
     SERVICE_TOOL_NAME,
+    SUBENTRY_TYPE_TTS_TARGET,
     YURY_LLM_API_ID,
 )
+from .area_resolver import async_get_area_resolver
 from .entity import LocalLLMConfigEntry
+from .skills.calendar_entities import async_get_calendar_entity_cache
+from .skills.music_search_cache import async_get_music_search_cache
+from .skills.media_catalog import async_get_media_catalog
+from .skills.reminder_cache import async_get_reminder_cache
+from .skills.reminder_scheduler import async_get_reminder_scheduler
+from .skills.timer_pool import async_get_timer_pool
+from .skills.virtual_timers import VirtualTimerEngine
+from .tts_targets import async_get_tts_target_index
+from .notify_targets import async_get_notify_target_index
+from .maybe import maybe
 from .ollama import OllamaAPIClient
+from .prompt_cache import PromptCache
+from .selection_cache import SelectionCache
+from .qpl import QPL
+
+_LOGGER = logging.getLogger(__name__)
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: LocalLLMConfigEntry) -> bool:
@@ -25,17 +55,107 @@ async def async_setup_entry(hass: HomeAssistant, entry: LocalLLMConfigEntry) ->
         llm.async_register_api(hass, YuryLLMAPI(hass))
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = entry
+    if DATA_QPL not in hass.data:
+        hass.data[DATA_QPL] = QPL()
+    if DATA_PROMPT_CACHE not in hass.data:
+        hass.data[DATA_PROMPT_CACHE] = await _async_preload_prompts(
+            hass, hass.data[DATA_QPL]
+        )
+    # Shared by all entries of the domain, shut down with the last of them
+    shared_shutdowns = [
+        partial(hass.data.pop, DATA_PROMPT_CACHE, None),
+        async_get_area_resolver(hass).async_shutdown,
+        async_get_timer_pool(hass).async_shutdown,
+    ]
+    reminder_scheduler = async_get_reminder_scheduler(hass)
+    await reminder_scheduler.async_load()
+    shared_shutdowns += [
+        reminder_scheduler.async_shutdown,
+        async_get_reminder_cache(hass).async_shutdown,
+        async_get_calendar_entity_cache(hass).async_shutdown,
+        async_get_music_search_cache(hass).async_shutdown,
+        async_get_media_catalog(hass).async_shutdown,
+    ]
+    tts_targets = async_get_tts_target_index(hass)
+    entry.async_on_unload(
+        tts_targets.async_set_overrides(
+            entry.entry_id,
+            {
+                subentry.data[CONF_SATELLITE_DEVICE]: subentry.data[CONF_MEDIA_PLAYER]
+                for subentry in entry.subentries.values()
+                if subentry.subentry_type == SUBENTRY_TYPE_TTS_TARGET
+            },
+        )
+    )
+    shared_shutdowns += [
+        tts_targets.async_shutdown,
+        async_get_notify_target_index(hass).async_shutdown,
+    ]
+    if DATA_SELECTION_CACHE not in hass.data:
+        selection_cache = SelectionCache(hass)
+        await selection_cache.async_load()
+        hass.data[DATA_SELECTION_CACHE] = selection_cache
+    if DATA_VIRTUAL_TIMERS not in hass.data:
+        virtual_timers = VirtualTimerEngine(hass)
+        await virtual_timers.async_load()
+        hass.data[DATA_VIRTUAL_TIMERS] = virtual_timers
+    shared_shutdowns.append(hass.data[DATA_VIRTUAL_TIMERS].async_shutdown)
+    entry.async_on_unload(_async_release_shared(hass, shared_shutdowns))
 
     def create_client():
         client_options = {**dict(entry.data), **dict(entry.options)}
         return OllamaAPIClient(hass, client_options)
 
     entry.runtime_data = await hass.async_add_executor_job(create_client)
-    await hass.config_entries.async_forward_entry_setups(entry, [Platform.CONVERSATION])
+    await hass.config_entries.async_forward_entry_setups(
+        entry, [Platform.CONVERSATION, Platform.SENSOR]
+    )
     entry.async_on_unload(entry.add_update_listener(_async_update_listener))
 
     return True
 
+def _async_release_shared(
+    hass: HomeAssistant, shutdowns: list[Callable[[], Awaitable[None] | None]]
+) -> Callable[[], Awaitable[None]]:
+    """Unload callback that shuts the shared singletons down once no entry is left."""
+
+    async def _async_release():
+        # Runs after async_unload_entry dropped the entry from hass.data[DOMAIN]
+        if hass.data.get(DOMAIN):
+            return
+        for shutdown in reversed(shutdowns):
+            result = shutdown()
+            if inspect.isawaitable(result):
+                await result
+
+    return _async_release
+
+
+async def _async_preload_prompts(hass: HomeAssistant, qpl_provider: QPL) -> PromptCache:
+    """Load and compile all prompt templates in one executor job."""
+    prompts = PromptCache()
+    directories = [
+        os.path.join(os.path.dirname(__file__), directory)
+        for directory in PROMPT_DIRECTORIES
+    ]
+    qpl_flow = qpl_provider.create_flow("preload_prompts")
+    qpl_flow.mark_subspan_begin("load_prompt_templates")
+    try:
+        count = await hass.async_add_executor_job(prompts.preload, directories)
+    except Exception as err:
+        qpl_flow.mark_failed(traceback.format_exc())
+        raise ConfigEntryError(f"Failed to load prompt templates: {err}") from err
+    point = qpl_flow.mark_subspan_end("load_prompt_templates")
+    maybe(point).annotate("template_count", count)
+    qpl_flow.mark_success()
+    _LOGGER.debug(
+        "Loaded %d prompt templates in %.1f ms",
+        count,
+        (qpl_flow.ended - qpl_flow.start).total_seconds() * 1000,
+    )
+    return prompts
+
+
 async def _async_update_listener(
     hass: HomeAssistant, entry: LocalLLMConfigEntry
 ) -> None:
@@ -44,7 +164,9 @@ async def _async_update_listener(
 
 async def async_unload_entry(hass: HomeAssistant, entry: LocalLLMConfigEntry) -> bool:
     """Unload the integration."""
-    unload_ok = await hass.config_entries.async_unload_platforms(entry, [Platform.CONVERSATION])
+    unload_ok = await hass.config_entries.async_unload_platforms(
+        entry, [Platform.CONVERSATION, Platform.SENSOR]
+    )
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
     return unload_ok
@@ -0,0 +1,153 @@
+"""Memoized entity/device to area and floor resolution shared by all skills."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import logging
+from typing import Callable
+
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import (
+    area_registry,
+    device_registry,
+    entity_registry,
+    floor_registry,
+)
+
+from .const import DATA_AREA_RESOLVER
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Location:
+    """Where an entity or device lives."""
+    device_id: str | None
+    area_id: str | None
+    area: str | None  # Area name
+    floor: str | None  # Floor name
+
+
+class AreaResolver:
+    """Precomputes entity_id/device_id -> Location and serves O(1) lookups.
+
+    The maps are rebuilt lazily on the first lookup after an entity, device,
+    area or floor registry update.
+    """
+
+    hass: HomeAssistant
+    _entities: dict[str, Location]
+    _devices: dict[str, Location]
+    _dirty: bool
+    _unsubscribers: list[Callable[[], None]]
+
+    def __init__(self, hass: HomeAssistant):
+        self.hass = hass
+        self._entities = {}
+        self._devices = {}
+        self._dirty = True
+        self._unsubscribers = []
+
+    @callback
+    def async_setup(self):
+        """Subscribe to registry updates."""
+        for event_type in (
+            entity_registry.EVENT_ENTITY_REGISTRY_UPDATED,
+            device_registry.EVENT_DEVICE_REGISTRY_UPDATED,
+            area_registry.EVENT_AREA_REGISTRY_UPDATED,
+            floor_registry.EVENT_FLOOR_REGISTRY_UPDATED,
+        ):
+            self._unsubscribers.append(
+                self.hass.bus.async_listen(event_type, self._async_invalidate)
+            )
+
+    @callback
+    def async_shutdown(self):
+        """Unsubscribe from registry updates and drop the shared instance."""
+        for unsubscribe in self._unsubscribers:
+            unsubscribe()
+        self._unsubscribers = []
+        if self.hass.data.get(DATA_AREA_RESOLVER) is self:
+            del self.hass.data[DATA_AREA_RESOLVER]
+
+    @callback
+    def _async_invalidate(self, event: Event):
+        self._dirty = True
+
+    def get_entity_location(self, entity_id: str) -> Location | None:
+        """Get the location of an entity. Entity area overrides device area."""
+        self._ensure_built()
+        return self._entities.get(entity_id)
+
+    def get_device_location(self, device_id: str | None) -> Location | None:
+        """Get the location of a device, e.g. a voice satellite."""
+        if device_id is None:
+            return None
+        self._ensure_built()
+        return self._devices.get(device_id)
+
+    def get_entity_area(self, entity_id: str) -> str | None:
+        """Get the area name of an entity."""
+        location = self.get_entity_location(entity_id)
+        return location.area if location else None
+
+    def get_device_area(self, device_id: str | None) -> str | None:
+        """Get the area name of a device."""
+        location = self.get_device_location(device_id)
+        return location.area if location else None
+
+    def _ensure_built(self):
+        if not self._dirty:
+            return
+
+        er = entity_registry.async_get(self.hass)
+        dr = device_registry.async_get(self.hass)
+        ar = area_registry.async_get(self.hass)
+        fr = floor_registry.async_get(self.hass)
+
+        areas: dict[str, tuple[str, str | None]] = {}
+        for area in ar.async_list_areas():
+            floor_name = None
+            if area.floor_id:
+                floor = fr.async_get_floor(area.floor_id)
+                if floor:
+                    floor_name = floor.name
+            areas[area.id] = (area.name, floor_name)
+
+        def make_location(device_id: str | None, area_id: str | None) -> Location:
+            area_name, floor_name = areas.get(area_id, (None, None))
+            return Location(
+                device_id=device_id,
+                area_id=area_id if area_name else None,
+                area=area_name,
+                floor=floor_name,
+            )
+
+        devices = {}
+        for device in dr.devices.values():
+            devices[device.id] = make_location(device.id, device.area_id)
+
+        entities = {}
+        for entity in er.entities.values():
+            area_id = entity.area_id
+            if area_id is None and entity.device_id in devices:
+                area_id = devices[entity.device_id].area_id
+            entities[entity.entity_id] = make_location(entity.device_id, area_id)
+
+        self._devices = devices
+        self._entities = entities
+        self._dirty = False
+        _LOGGER.debug(
+            "Area resolver rebuilt: %d entities, %d devices", len(entities), len(devices)
+        )
+
+
+@callback
+def async_get_area_resolver(hass: HomeAssistant) -> AreaResolver:
+    """Get the shared AreaResolver, creating it on first use."""
+    resolver = hass.data.get(DATA_AREA_RESOLVER)
+    if resolver is None:
+        resolver = AreaResolver(hass)
+        resolver.async_setup()
+        hass.data[DATA_AREA_RESOLVER] = resolver
+    return resolver
@@ -9,7 +9,7 @@ import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.const import CONF_HOST, CONF_PORT, CONF_SSL
 from homeassistant.data_entry_flow import AbortFlow
-from homeassistant.helpers import llm
+from homeassistant.helpers import device_registry, llm
 from homeassistant.components import conversation
 
 from . import YuryLLMAPI
@@ -17,12 +17,28 @@ from .const import (
     DOMAIN,
     YURY_LLM_API_ID,
     CONF_CHAT_MODEL,
+    CONF_CONTEXT_LENGTH,
+    CONF_INBOX_TODO_LIST,
+    CONF_MEDIA_PLAYER,
+    CONF_REMINDER_CALENDAR,
+    CONF_SATELLITE_DEVICE,
+    CONF_TIMER_BACKEND,
+    CONF_TIMER_MIRROR_SENSORS,
     CONF_TTS_ENGINE,
+    DEFAULT_TIMER_BACKEND,
+    TIMER_BACKEND_HELPERS,
+    TIMER_BACKEND_VIRTUAL,
     SUBENTRY_TYPE_TTS,
+    SUBENTRY_TYPE_TTS_TARGET,
 )
 from .entity import LocalLLMConfigEntry, LocalLLMClient
 
 from homeassistant.helpers.selector import (
+    DeviceSelector,
+    DeviceSelectorConfig,
+    EntityFilterSelectorConfig,
+    EntitySelector,
+    EntitySelectorConfig,
     SelectSelector,
     SelectSelectorConfig,
     SelectSelectorMode,
@@ -79,10 +95,19 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         return {
             conversation.DOMAIN: LLMSubentryFlowHandler,
             SUBENTRY_TYPE_TTS: TTSSubentryFlowHandler,
+            SUBENTRY_TYPE_TTS_TARGET: TTSTargetSubentryFlowHandler,
         }
 
 
-def _build_llm_schema(available_models: list[str], current_model: str | None = None):
+def _build_llm_schema(
+    available_models: list[str],
+    current_model: str | None = None,
+    current_context_length: int | None = None,
+    current_timer_backend: str | None = None,
+    current_mirror_sensors: bool | None = None,
+    current_reminder_calendar: str | None = None,
+    current_inbox_todo_list: str | None = None,
+):
     """Build schema for LLM model selection."""
     default = (
         current_model
@@ -99,6 +124,32 @@ def _build_llm_schema(available_models: list[str], current_model: str | None = N
                     mode=SelectSelectorMode.DROPDOWN,
                 )
             ),
+            vol.Optional(
+                CONF_CONTEXT_LENGTH,
+                description={"suggested_value": current_context_length},
+            ): vol.All(vol.Coerce(int), vol.Range(min=512)),
+            vol.Optional(
+                CONF_TIMER_BACKEND,
+                default=current_timer_backend or DEFAULT_TIMER_BACKEND,
+            ): SelectSelector(
+                SelectSelectorConfig(
+                    options=[TIMER_BACKEND_HELPERS, TIMER_BACKEND_VIRTUAL],
+                    multiple=False,
+                    mode=SelectSelectorMode.DROPDOWN,
+                    translation_key=CONF_TIMER_BACKEND,
+                )
+            ),
+            vol.Optional(
+                CONF_TIMER_MIRROR_SENSORS, default=bool(current_mirror_sensors)
+            ): bool,
+            vol.Optional(
+                CONF_REMINDER_CALENDAR,
+                description={"suggested_value": current_reminder_calendar},
+            ): EntitySelector(EntitySelectorConfig(domain="calendar")),
+            vol.Optional(
+                CONF_INBOX_TODO_LIST,
+                description={"suggested_value": current_inbox_todo_list},
+            ): EntitySelector(EntitySelectorConfig(domain="todo")),
         }
     )
 
@@ -124,6 +175,26 @@ def _build_tts_schema(available_tts_engines: list[str], current_tts: str | None
     )
 
 
+def _build_tts_target_schema(
+    current_device: str | None = None, current_media_player: str | None = None
+):
+    """Build schema for pinning a satellite's TTS media player."""
+    return vol.Schema(
+        {
+            vol.Required(
+                CONF_SATELLITE_DEVICE, description={"suggested_value": current_device}
+            ): DeviceSelector(
+                DeviceSelectorConfig(
+                    entity=[EntityFilterSelectorConfig(domain="assist_satellite")]
+                )
+            ),
+            vol.Required(
+                CONF_MEDIA_PLAYER, description={"suggested_value": current_media_player}
+            ): EntitySelector(EntitySelectorConfig(domain="media_player")),
+        }
+    )
+
+
 class LLMSubentryFlowHandler(config_entries.ConfigSubentryFlow):
     """Flow for managing LLM conversation agent subentries."""
 
@@ -183,10 +254,23 @@ class LLMSubentryFlowHandler(config_entries.ConfigSubentryFlow):
 
         available_models = await entry.runtime_data.async_get_available_models()
         current_model = subentry.data.get(CONF_CHAT_MODEL)
+        current_context_length = subentry.data.get(CONF_CONTEXT_LENGTH)
+        current_timer_backend = subentry.data.get(CONF_TIMER_BACKEND)
+        current_mirror_sensors = subentry.data.get(CONF_TIMER_MIRROR_SENSORS)
+        current_reminder_calendar = subentry.data.get(CONF_REMINDER_CALENDAR)
+        current_inbox_todo_list = subentry.data.get(CONF_INBOX_TODO_LIST)
 
         return self.async_show_form(
             step_id="reconfigure",
-            data_schema=_build_llm_schema(available_models, current_model),
+            data_schema=_build_llm_schema(
+                available_models,
+                current_model,
+                current_context_length,
+                current_timer_backend,
+                current_mirror_sensors,
+                current_reminder_calendar,
+                current_inbox_todo_list,
+            ),
             last_step=True,
         )
 
@@ -255,3 +339,58 @@ class TTSSubentryFlowHandler(config_entries.ConfigSubentryFlow):
         )
 
     async_step_init = async_step_user
+
+
+class TTSTargetSubentryFlowHandler(config_entries.ConfigSubentryFlow):
+    """Flow for overriding the media player a satellite speaks on."""
+
+    def _make_title(self, user_input: dict[str, Any]) -> str:
+        device = device_registry.async_get(self.hass).async_get(
+            user_input[CONF_SATELLITE_DEVICE]
+        )
+        device_name = (
+            (device.name_by_user or device.name) if device else None
+        ) or user_input[CONF_SATELLITE_DEVICE]
+        return f"{device_name} -> {user_input[CONF_MEDIA_PLAYER]}"
+
+    async def async_step_user(
+        self, user_input: dict[str, Any] | None = None
+    ) -> config_entries.SubentryFlowResult:
+        """Handle new TTS target override creation."""
+        if user_input is not None:
+            return self.async_create_entry(
+                title=self._make_title(user_input),
+                data=user_input,
+            )
+
+        return self.async_show_form(
+            step_id="user",
+            data_schema=_build_tts_target_schema(),
+            last_step=True,
+        )
+
+    async def async_step_reconfigure(
+        self, user_input: dict[str, Any] | None = None
+    ) -> config_entries.SubentryFlowResult:
+        """Handle reconfiguration of an existing TTS target override."""
+        entry = self._get_entry()
+        subentry = self._get_reconfigure_subentry()
+
+        if user_input is not None:
+            return self.async_update_and_abort(
+                entry,
+                subentry,
+                title=self._make_title(user_input),
+                data=user_input,
+            )
+
+        return self.async_show_form(
+            step_id="reconfigure",
+            data_schema=_build_tts_target_schema(
+                subentry.data.get(CONF_SATELLITE_DEVICE),
+                subentry.data.get(CONF_MEDIA_PLAYER),
+            ),
+            last_step=True,
+        )
+
+    async_step_init = async_step_user
@@ -55,6 +55,48 @@ SERVICE_TOOL_ALLOWED_DOMAINS = [
 ]
 
 CONF_CHAT_MODEL = "conf_chat_model"
+CONF_CONTEXT_LENGTH = "conf_context_length"
+# Budget used until the model reports its own context length, num_ctx is only
+# sent when CONF_CONTEXT_LENGTH is configured
+DEFAULT_CONTEXT_LENGTH = 8192
+CONF_TIMER_BACKEND = "conf_timer_backend"
+CONF_TIMER_MIRROR_SENSORS = "conf_timer_mirror_sensors"
+TIMER_BACKEND_VIRTUAL = "virtual"
+TIMER_BACKEND_HELPERS = "timer_helpers"
+# Virtual timers are opt-in, existing installations keep their timer helpers
+DEFAULT_TIMER_BACKEND = TIMER_BACKEND_HELPERS
+CONF_REMINDER_CALENDAR = "conf_reminder_calendar"
+CONF_INBOX_TODO_LIST = "conf_inbox_todo_list"
 CONF_TTS_ENGINE = "conf_tts_engine"
 SUBENTRY_TYPE_TTS = "tts"
+CONF_SATELLITE_DEVICE = "conf_satellite_device"
+CONF_MEDIA_PLAYER = "conf_media_player"
+SUBENTRY_TYPE_TTS_TARGET = "tts_target"
 LLM_RETRY_COUNT = 3
+
+# Keywords to match preferred calendar
+CALENDAR_KEYWORDS = ["yury", "local"]
+
+# Hashtag prefix for reminder notifications
+REMINDER_HASHTAG_PREFIX = "#remind:"
+
+# Keywords to match notification targets by person
+NOTIFICATION_TARGETS = {
+    "yury": ["yury_dymov", "delorean"],
+    "eugenia": ["eugenia", "zhenya"],
+}
+
+DATA_PROMPT_CACHE = "yury_smarthome_prompt_cache"
+DATA_QPL = "yury_smarthome_qpl"
+DATA_AREA_RESOLVER = "yury_smarthome_area_resolver"
+DATA_TIMER_POOL = "yury_smarthome_timer_pool"
+DATA_VIRTUAL_TIMERS = "yury_smarthome_virtual_timers"
+DATA_TTS_TARGETS = "yury_smarthome_tts_targets"
+DATA_REMINDER_SCHEDULER = "yury_smarthome_reminder_scheduler"
+DATA_SELECTION_CACHE = "yury_smarthome_selection_cache"
+DATA_REMINDER_CACHE = "yury_smarthome_reminder_cache"
+DATA_NOTIFY_TARGETS = "yury_smarthome_notify_targets"
+DATA_CALENDAR_ENTITIES = "yury_smarthome_calendar_entities"
+DATA_MUSIC_SEARCH_CACHE = "yury_smarthome_music_search_cache"
+DATA_MEDIA_CATALOG = "yury_smarthome_media_catalog"
+PROMPT_DIRECTORIES = ["prompts", "skills"]
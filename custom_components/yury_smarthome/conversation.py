@@ -12,7 +12,6 @@ from custom_components.yury_smarthome.skills.skill_registry import (
     SkillRegistry,
     UnknownSkillException,
 )
-from jinja2 import Template
 
 from homeassistant.components import conversation
 from homeassistant.components.conversation import (
@@ -27,15 +26,26 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers import intent
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 
-from .const import CONF_CHAT_MODEL, LLM_RETRY_COUNT
+from .const import (
+    CONF_CHAT_MODEL,
+    CONF_CONTEXT_LENGTH,
+    DATA_PROMPT_CACHE,
+    DATA_QPL,
+    DEFAULT_CONTEXT_LENGTH,
+    LLM_RETRY_COUNT,
+)
 from .entity import LocalLLMClient, LocalLLMConfigEntry, LocalLLMEntity
 from .prompt_cache import PromptCache
 from .conversation_history import ConversationHistoryCache
+from .token_budget import TokenBudgeter
 from .maybe import maybe
 import json
 
 _LOGGER = logging.getLogger(__name__)
 
+# The classifier answers with a single skill name
+ENTRY_RESPONSE_TOKENS = 64
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -43,7 +53,8 @@ async def async_setup_entry(
     async_add_entities: AddConfigEntryEntitiesCallback,
 ) -> bool:
     """Set up Local LLM Conversation from a config entry."""
-    qpl_provider = QPL()
+    qpl_provider = hass.data[DATA_QPL]
+    prompts = hass.data[DATA_PROMPT_CACHE]
     for subentry in entry.subentries.values():
         if subentry.subentry_type != conversation.DOMAIN:
             continue
@@ -58,7 +69,7 @@ async def async_setup_entry(
 
         # create one agent entity per conversation subentry
         agent_entity = LocalLLMAgent(
-            hass, entry, subentry, entry.runtime_data, qpl_provider
+            hass, entry, subentry, entry.runtime_data, qpl_provider, prompts
         )
         # register the agent entity
         async_add_entities(
@@ -84,12 +95,16 @@ class LocalLLMAgent(ConversationEntity, AbstractConversationAgent, LocalLLMEntit
         subentry: ConfigSubentry,
         client: LocalLLMClient,
         qplProvider: QPL,
+        prompts: PromptCache,
     ) -> None:
         super().__init__(hass, entry, subentry, client)
 
         self.qplProvider = qplProvider
+        # Only an explicitly configured context length is sent as num_ctx
+        self._num_ctx = subentry.data.get(CONF_CONTEXT_LENGTH)
+        self.token_budgeter = TokenBudgeter(self._num_ctx or DEFAULT_CONTEXT_LENGTH)
         self.conversation_history = ConversationHistoryCache()
-        self.prompts = PromptCache(self.conversation_history)
+        self.prompts = prompts.with_conversation_history(self.conversation_history)
         self.skill_registry = SkillRegistry(hass, self, self.prompts, qplProvider)
 
         if subentry.data.get(CONF_LLM_HASS_API):
@@ -101,6 +116,19 @@ class LocalLLMAgent(ConversationEntity, AbstractConversationAgent, LocalLLMEntit
         """When entity is added to Home Assistant."""
         await super().async_added_to_hass()
         conversation.async_set_agent(self.hass, self.entry, self)
+        if self._num_ctx is None:
+            self.hass.async_create_background_task(
+                self._async_load_context_length(),
+                "yury_smarthome model context length",
+            )
+
+    async def _async_load_context_length(self):
+        """Budget against the model's own context length when none is configured."""
+        model = self.subentry.data[CONF_CHAT_MODEL]
+        context_length = await self.client.async_get_context_length(model)
+        if context_length:
+            self.token_budgeter.context_length = context_length
+            _LOGGER.debug("Context length of %s is %d", model, context_length)
 
     async def async_will_remove_from_hass(self) -> None:
         """When entity will be removed from Home Assistant."""
@@ -112,32 +140,57 @@ class LocalLLMAgent(ConversationEntity, AbstractConversationAgent, LocalLLMEntit
         """Return a list of supported languages."""
         return MATCH_ALL
 
-    async def send_message(self, prompt: str) -> str:
+    async def send_message(self, prompt: str, qpl_flow: QPLFlow | None = None) -> str:
         model = self.subentry.data[CONF_CHAT_MODEL]
-        response = await self.client.send_message(model, prompt)
-        return response if response else "No response"
+        options = {"num_ctx": self._num_ctx} if self._num_ctx else None
+        result = await self.client.generate(model, prompt, options)
+        point = qpl_flow.mark_point("prompt_tokens") if qpl_flow is not None else None
+        self.token_budgeter.record(prompt, result.prompt_eval_count, point)
+        return result.response if result.response else "No response"
 
     async def _async_process(
         self, user_input: ConversationInput, qpl_flow: QPLFlow
     ) -> ConversationResult:
+        intent_response = intent.IntentResponse(language="en")
+        qpl_flow.mark_subspan_begin("fast_path")
+        handled = await self.skill_registry.try_fast_path(
+            user_input, intent_response, qpl_flow
+        )
+        point = qpl_flow.mark_subspan_end("fast_path")
+        maybe(point).annotate("handled", handled)
+        if handled:
+            qpl_flow.mark_success()
+            self._record_exchange(user_input, intent_response)
+            return ConversationResult(
+                response=intent_response, conversation_id=user_input.conversation_id
+            )
+
         qpl_flow.mark_subspan_begin("building_prompt")
         prompt_path = self._make_prompt_key("entry.md")
-        entry_prompt_template = await self.prompts.get(
-            prompt_path, user_input.conversation_id
-        )
-        template = Template(entry_prompt_template, trim_blocks=True)
+        template = await self.prompts.get(prompt_path)
         skill_list = self.skill_registry.skill_list()
-        prompt = template.render(skill_list=skill_list, prompt=user_input.text)
+        budget = self.token_budgeter.create_budget(ENTRY_RESPONSE_TOKENS)
+        budget.reserve(
+            "static_instructions",
+            template.render(skill_list=skill_list, prompt=user_input.text),
+        )
+        prompt = template.render(
+            skill_list=skill_list,
+            prompt=user_input.text,
+            conversation_history=self.prompts.get_history(
+                user_input.conversation_id, budget
+            ),
+        )
         point = qpl_flow.mark_subspan_end("building_prompt")
         maybe(point).annotate("prompt", prompt)
+        budget.annotate(point)
         updated_prompt = None
 
-        intent_response = intent.IntentResponse(language="en")
         for _ in range(LLM_RETRY_COUNT):
             try:
                 qpl_flow.mark_subspan_begin("sending_prompt")
                 llm_response = await self.send_message(
-                    updated_prompt if updated_prompt is not None else prompt
+                    updated_prompt if updated_prompt is not None else prompt, qpl_flow
                 )
                 llm_response = llm_response.strip()
                 point = qpl_flow.mark_subspan_end("sending_prompt")
@@ -148,15 +201,7 @@ class LocalLLMAgent(ConversationEntity, AbstractConversationAgent, LocalLLMEntit
                 )
                 qpl_flow.mark_subspan_end("processing_user_request")
                 qpl_flow.mark_success()
-
-                # Record the exchange in conversation history
-                speech = intent_response.speech.get("plain", {}).get("speech", "")
-                if speech:
-                    self.conversation_history.add_exchange(
-                        user_input.conversation_id,
-                        user_input.text,
-                        speech,
-                    )
+                self._record_exchange(user_input, intent_response)
 
                 return ConversationResult(
                     response=intent_response, conversation_id=user_input.conversation_id
@@ -164,7 +209,7 @@ class LocalLLMAgent(ConversationEntity, AbstractConversationAgent, LocalLLMEntit
             except UnknownSkillException:
                 if updated_prompt is None:
                     updated_prompt_path = self._make_prompt_key("entry_retry.md")
-                    template = Template(updated_prompt_path, trim_blocks=True)
+                    template = await self.prompts.get(updated_prompt_path)
                     updated_prompt = template.render(
                         original_prompt=prompt, skill_list=skill_list
                     )
@@ -178,6 +223,18 @@ class LocalLLMAgent(ConversationEntity, AbstractConversationAgent, LocalLLMEntit
             response=intent_response, conversation_id=user_input.conversation_id
         )
 
+    def _record_exchange(
+        self, user_input: ConversationInput, intent_response: intent.IntentResponse
+    ):
+        """Record the exchange in conversation history."""
+        speech = intent_response.speech.get("plain", {}).get("speech", "")
+        if speech:
+            self.conversation_history.add_exchange(
+                user_input.conversation_id,
+                user_input.text,
+                speech,
+            )
+
     async def async_process(self, user_input: ConversationInput) -> ConversationResult:
         qpl_flow = self.qplProvider.create_flow("processing_user_prompt")
         qpl_flow.mark_subspan_begin("async_process")
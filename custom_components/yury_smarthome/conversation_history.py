@@ -29,9 +29,15 @@ class ConversationContext:
         if len(self.exchanges) > self.max_exchanges:
             self.exchanges = self.exchanges[-self.max_exchanges:]
 
-    def format_for_prompt(self) -> str:
-        """Format the conversation history as a string for LLM context."""
-        if not self.exchanges:
+    def format_for_prompt(self, max_exchanges: int | None = None) -> str:
+        """Format the conversation history as a string for LLM context.
+
+        If max_exchanges is set, only the most recent exchanges are included.
+        """
+        exchanges = self.exchanges
+        if max_exchanges is not None:
+            exchanges = exchanges[-max_exchanges:] if max_exchanges > 0 else []
+        if not exchanges:
             return ""
 
         lines = [
@@ -39,7 +45,7 @@ class ConversationContext:
             "The following shows what happened earlier in this conversation for context:",
             ""
         ]
-        for i, exchange in enumerate(self.exchanges, 1):
+        for i, exchange in enumerate(exchanges, 1):
             lines.append(f"[{i}] User said: \"{exchange.user_prompt}\" → Result: \"{exchange.assistant_response}\"")
 
         return "\n".join(lines)
@@ -73,7 +79,9 @@ class ConversationHistoryCache:
 
         self._cache[conversation_id].add_exchange(user_prompt, assistant_response)
 
-    def get_history(self, conversation_id: str | None) -> str:
+    def get_history(
+        self, conversation_id: str | None, max_exchanges: int | None = None
+    ) -> str:
         """Get formatted conversation history for a conversation_id."""
         if conversation_id is None:
             return ""
@@ -82,7 +90,18 @@ class ConversationHistoryCache:
         if context is None:
             return ""
 
-        return context.format_for_prompt()
+        return context.format_for_prompt(max_exchanges)
+
+    def exchange_count(self, conversation_id: str | None) -> int:
+        """Get the number of recorded exchanges for a conversation_id."""
+        if conversation_id is None:
+            return 0
+
+        context = self._cache.get(conversation_id)
+        if context is None:
+            return 0
+
+        return len(context.exchanges)
 
     def clear(self, conversation_id: str | None):
         """Clear history for a specific conversation."""
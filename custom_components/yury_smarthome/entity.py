@@ -5,6 +5,8 @@ from homeassistant.const import MATCH_ALL
 from homeassistant.helpers import llm, device_registry as dr, entity
 from dataclasses import dataclass
 from .const import DOMAIN, CONF_CHAT_MODEL
+from .qpl import QPLFlow
+from .token_budget import TokenBudgeter
 from abc import abstractmethod
 
 type LocalLLMConfigEntry = ConfigEntry[LocalLLMClient]
@@ -21,6 +23,17 @@ class LocalLLMClient:
     async def send_message(self, model: str, message: str) -> str | None:
         raise NotImplementedError()
 
+    async def generate(
+        self, model: str, message: str, options: dict[str, Any] | None = None
+    ) -> "TextGenerationResult":
+        """Send a message and return the response with usage stats, if the backend reports them."""
+        response = await self.send_message(model, message)
+        return TextGenerationResult(response=response)
+
+    async def async_get_context_length(self, model: str) -> int | None:
+        """Context length the backend runs the model with, if it reports one."""
+        return None
+
     @staticmethod
     def get_name(client_options: dict[str, Any]):
         raise NotImplementedError()
@@ -49,6 +62,7 @@ class TextGenerationResult:
     response_streamed: bool = False
     raise_error: bool = False
     error_msg: Optional[str] = None
+    prompt_eval_count: Optional[int] = None
 
 
 class LocalLLMEntity(entity.Entity):
@@ -57,6 +71,7 @@ class LocalLLMEntity(entity.Entity):
     hass: HomeAssistant
     client: LocalLLMClient
     entry_id: str
+    token_budgeter: TokenBudgeter
 
     _attr_has_entity_name = True
 
@@ -120,5 +135,5 @@ class LocalLLMEntity(entity.Entity):
         return MATCH_ALL
 
     @abstractmethod
-    async def send_message(self, prompt: str) -> str:
-        """Send a message."""
+    async def send_message(self, prompt: str, qpl_flow: QPLFlow | None = None) -> str:
+        """Send a message, recording its prompt token counts on the flow if given."""
@@ -0,0 +1,152 @@
+"""Index of notify services by person, and concurrent delivery to them."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from typing import Callable
+
+from homeassistant.const import EVENT_SERVICE_REGISTERED, EVENT_SERVICE_REMOVED
+from homeassistant.core import Event, HomeAssistant, callback
+
+from .const import DATA_NOTIFY_TARGETS, NOTIFICATION_TARGETS
+from .maybe import maybe
+from .qpl import QPLFlow
+
+_LOGGER = logging.getLogger(__name__)
+
+NOTIFY_DOMAIN = "notify"
+# A single slow push must not hold up the others
+SEND_TIMEOUT = 10  # seconds
+
+RESULT_SENT = "sent"
+RESULT_TIMEOUT = "timeout"
+RESULT_ERROR = "error"
+
+
+class NotifyTargetIndex:
+    """Maps a person to the notify services that reach them.
+
+    Services are matched against the NOTIFICATION_TARGETS keywords. The index is
+    rebuilt lazily on the first lookup after a notify service is registered or
+    removed, instead of scanning all services on every call.
+    """
+
+    hass: HomeAssistant
+    _by_person: dict[str, list[str]]
+    _person_of: dict[str, str]
+    _dirty: bool
+    _unsubscribers: list[Callable[[], None]]
+
+    def __init__(self, hass: HomeAssistant):
+        self.hass = hass
+        self._by_person = {}
+        self._person_of = {}
+        self._dirty = True
+        self._unsubscribers = []
+
+    @callback
+    def async_setup(self):
+        """Subscribe to service registration changes."""
+        for event_type in (EVENT_SERVICE_REGISTERED, EVENT_SERVICE_REMOVED):
+            self._unsubscribers.append(
+                self.hass.bus.async_listen(event_type, self._async_service_changed)
+            )
+
+    @callback
+    def async_shutdown(self):
+        """Unsubscribe and drop the shared instance."""
+        for unsubscribe in self._unsubscribers:
+            unsubscribe()
+        self._unsubscribers = []
+        if self.hass.data.get(DATA_NOTIFY_TARGETS) is self:
+            del self.hass.data[DATA_NOTIFY_TARGETS]
+
+    @callback
+    def _async_service_changed(self, event: Event):
+        if event.data.get("domain") == NOTIFY_DOMAIN:
+            self._dirty = True
+
+    def get_targets(self, persons: list[str]) -> list[str]:
+        """notify.* services for the given persons, in a stable order."""
+        self._ensure_built()
+        targets = []
+        for person in persons:
+            targets.extend(self._by_person.get(person.lower(), []))
+        return list(dict.fromkeys(targets))
+
+    def person_for(self, target: str) -> str | None:
+        """The person a notify.* service belongs to, if any."""
+        self._ensure_built()
+        return self._person_of.get(target)
+
+    def _ensure_built(self):
+        if not self._dirty:
+            return
+
+        by_person: dict[str, list[str]] = {person: [] for person in NOTIFICATION_TARGETS}
+        person_of = {}
+        services = self.hass.services.async_services().get(NOTIFY_DOMAIN, {})
+        for service_name in sorted(services):
+            service_lower = service_name.lower()
+            for person, keywords in NOTIFICATION_TARGETS.items():
+                if any(keyword.lower() in service_lower for keyword in keywords):
+                    target = f"{NOTIFY_DOMAIN}.{service_name}"
+                    by_person[person].append(target)
+                    person_of.setdefault(target, person)
+
+        self._by_person = by_person
+        self._person_of = person_of
+        self._dirty = False
+        _LOGGER.debug("Notify target index rebuilt: %s", by_person)
+
+    async def async_send(
+        self, messages: dict[str, dict], qpl_flow: QPLFlow
+    ) -> dict[str, str]:
+        """Send each target its notification data, all targets at once.
+
+        Returns the result per target: RESULT_SENT, RESULT_TIMEOUT or RESULT_ERROR.
+        """
+        targets = list(messages)
+        point = qpl_flow.mark_subspan_begin("send_notifications")
+        maybe(point).annotate("targets", json.dumps(targets))
+        outcomes = await asyncio.gather(
+            *(self._async_send_one(target, messages[target]) for target in targets)
+        )
+        results = dict(zip(targets, outcomes))
+
+        point = qpl_flow.mark_subspan_end("send_notifications")
+        maybe(point).annotate("results", json.dumps(results))
+        for result in (RESULT_SENT, RESULT_TIMEOUT, RESULT_ERROR):
+            maybe(point).annotate(
+                f"{result}_count", sum(1 for r in outcomes if r == result)
+            )
+        return results
+
+    async def _async_send_one(self, target: str, data: dict) -> str:
+        service_name = target.removeprefix(f"{NOTIFY_DOMAIN}.")
+        try:
+            async with asyncio.timeout(SEND_TIMEOUT):
+                await self.hass.services.async_call(
+                    NOTIFY_DOMAIN, service_name, data, blocking=True
+                )
+        except TimeoutError:
+            _LOGGER.warning(f"Timed out sending notification to {target}")
+            return RESULT_TIMEOUT
+        except Exception as e:
+            _LOGGER.warning(f"Failed to send notification to {target}: {e}")
+            return RESULT_ERROR
+        _LOGGER.info(f"Notification sent to {target}: {data.get('message')}")
+        return RESULT_SENT
+
+
+@callback
+def async_get_notify_target_index(hass: HomeAssistant) -> NotifyTargetIndex:
+    """Get the shared NotifyTargetIndex, creating it on first use."""
+    index = hass.data.get(DATA_NOTIFY_TARGETS)
+    if index is None:
+        index = NotifyTargetIndex(hass)
+        index.async_setup()
+        hass.data[DATA_NOTIFY_TARGETS] = index
+    return index
@@ -81,6 +81,12 @@ class OllamaAPIClient(LocalLLMClient):
         )
 
     async def send_message(self, model: str, message: str) -> str | None:
+        result = await self.generate(model, message)
+        return result.response
+
+    async def generate(
+        self, model: str, message: str, options: dict[str, Any] | None = None
+    ) -> TextGenerationResult:
         client = self._build_client()
         messages = [
             {
@@ -88,8 +94,32 @@ class OllamaAPIClient(LocalLLMClient):
                 "content": message,
             },
         ]
-        response = await client.chat(model, messages=messages, stream=False)
-        return response.message.content
+        response = await client.chat(
+            model, messages=messages, stream=False, options=options
+        )
+        return TextGenerationResult(
+            response=response.message.content,
+            stop_reason=response.done_reason,
+            prompt_eval_count=response.prompt_eval_count,
+        )
+
+    async def async_get_context_length(self, model: str) -> int | None:
+        client = self._build_client(timeout=5)
+        try:
+            response = await client.show(model)
+        except (httpx.HTTPError, ResponseError, ConnectionError) as err:
+            _LOGGER.debug("Failed to fetch model info for %s: %s", model, err)
+            return None
+
+        # A num_ctx baked into the Modelfile wins over the architecture's maximum
+        for line in (getattr(response, "parameters", None) or "").splitlines():
+            parts = line.split()
+            if len(parts) == 2 and parts[0] == "num_ctx" and parts[1].isdigit():
+                return int(parts[1])
+        for key, value in (getattr(response, "modelinfo", None) or {}).items():
+            if key.endswith(".context_length") and isinstance(value, int):
+                return value
+        return None
 
     @staticmethod
     def get_name(client_options: dict[str, Any]):
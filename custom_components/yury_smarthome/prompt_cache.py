@@ -1,40 +1,125 @@
+from dataclasses import dataclass
+import glob
+import os
+import time
 import aiofiles
+import aiofiles.os
+from jinja2 import Environment, Template
 from .conversation_history import ConversationHistoryCache
+from .token_budget import PromptBudget
+
+# Minimum number of seconds between mtime checks of an already compiled prompt
+RELOAD_CHECK_INTERVAL = 2.0
+
+
+@dataclass
+class CachedTemplate:
+    """A compiled prompt template and the file mtime it was compiled from."""
+    template: Template
+    mtime: float
+    checked_at: float
 
 
 class PromptCache:
-    cache: dict[str, str] = {}
+    cache: dict[str, CachedTemplate] = {}
     conversation_history: ConversationHistoryCache | None = None
+    environment: Environment
 
     def __init__(self, conversation_history: ConversationHistoryCache | None = None):
         self.cache = {}
         self.conversation_history = conversation_history
+        self.environment = Environment(trim_blocks=True)
 
     def set_conversation_history(self, history: ConversationHistoryCache):
         """Set the conversation history cache instance."""
         self.conversation_history = history
 
-    async def get(self, key: str, conversation_id: str | None = None) -> str:
-        """Get a prompt template, optionally appending conversation history.
+    def with_conversation_history(
+        self, history: ConversationHistoryCache
+    ) -> "PromptCache":
+        """Return a cache bound to the given history that shares compiled templates."""
+        prompts = PromptCache(history)
+        prompts.cache = self.cache
+        prompts.environment = self.environment
+        return prompts
+
+    def preload(self, directories: list[str]) -> int:
+        """Read and compile every prompt template in the given directories.
+
+        Blocking, meant to run in a single executor job at integration setup.
+        Raises on the first template that can't be read or compiled.
+
+        Returns:
+            The number of templates loaded
+        """
+        now = time.monotonic()
+        count = 0
+        for directory in directories:
+            for key in sorted(glob.glob(os.path.join(directory, "*.md"))):
+                with open(key) as file:
+                    data = file.read()
+                self.cache[key] = CachedTemplate(
+                    template=self.environment.from_string(data),
+                    mtime=os.stat(key).st_mtime,
+                    checked_at=now,
+                )
+                count += 1
+        return count
+
+    async def get(self, key: str) -> Template:
+        """Get a compiled prompt template.
+
+        Templates are cached by (path, mtime), so editing a prompt file on disk
+        recompiles it on the next request without restarting Home Assistant.
 
         Args:
             key: The file path to the prompt template
-            conversation_id: If provided, conversation history will be appended
 
         Returns:
-            The prompt template, optionally with conversation history appended
+            The compiled Jinja template
         """
+        now = time.monotonic()
         cached_version = self.cache.get(key)
-        if cached_version is None:
-            async with aiofiles.open(key) as file:
-                data = await file.read()
-                self.cache[key] = data
-                cached_version = data
-
-        # Append conversation history if available and conversation_id provided
-        if conversation_id and self.conversation_history:
-            history = self.conversation_history.get_history(conversation_id)
-            if history:
-                return cached_version + "\n\n" + history
-
-        return cached_version
+        if (
+            cached_version is not None
+            and now - cached_version.checked_at < RELOAD_CHECK_INTERVAL
+        ):
+            return cached_version.template
+
+        stat = await aiofiles.os.stat(key)
+        if cached_version is not None and cached_version.mtime == stat.st_mtime:
+            cached_version.checked_at = now
+            return cached_version.template
+
+        async with aiofiles.open(key) as file:
+            data = await file.read()
+        template = self.environment.from_string(data)
+        self.cache[key] = CachedTemplate(
+            template=template, mtime=stat.st_mtime, checked_at=now
+        )
+        return template
+
+    def get_history(
+        self, conversation_id: str | None, budget: PromptBudget | None = None
+    ) -> str:
+        """Get formatted conversation history to pass as a render variable.
+
+        Args:
+            conversation_id: The conversation to fetch history for
+            budget: If provided, the oldest exchanges are dropped until the
+                history fits in the remaining token budget
+
+        Returns:
+            The formatted history, or an empty string if there is none
+        """
+        if conversation_id is None or self.conversation_history is None:
+            return ""
+        if budget is None:
+            return self.conversation_history.get_history(conversation_id)
+
+        count = self.conversation_history.exchange_count(conversation_id)
+        candidates = [
+            self.conversation_history.get_history(conversation_id, max_exchanges)
+            for max_exchanges in range(count, 0, -1)
+        ]
+        return budget.fit_text("history", candidates)
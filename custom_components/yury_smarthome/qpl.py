@@ -88,6 +88,26 @@ class QPLFlow:
     def annotate(self, key: str, value: Any):
         self.payload[key] = value
 
+    def fork(self, nm: str) -> "QPLFlow":
+        """Child flow for work running concurrently with this one.
+
+        Subspans nest, so concurrent work can't share a flow. The child is never
+        uploaded on its own; join() brings its points back into this flow.
+        """
+        child = QPLFlow(nm)
+        child.complete_callback = lambda flow: None
+        return child
+
+    def join(self, children: list["QPLFlow"]):
+        """Add the points of forked flows, tagged with the fork they came from."""
+        if self.outcome != "":
+            return
+        points = [point for child in children for point in child.points]
+        for child in children:
+            for point in child.points:
+                point.annotate("fork", child.name)
+        self.points.extend(sorted(points, key=lambda p: p.timestamp))
+
     def _close_all_subspans(self):
         """Close all open subspans in reverse order (LIFO)."""
         for subspan in list(reversed(self.opened_subspans)):
@@ -0,0 +1,73 @@
+"""Remembers which calendar or todo list the LLM picked for a given set of entities."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DATA_SELECTION_CACHE, DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_KEY = f"{DOMAIN}.selections"
+STORAGE_VERSION = 1
+SAVE_DELAY = 5
+
+
+def fingerprint(entities: list[dict]) -> str:
+    """Fingerprint of the available entities, changes when one is added, removed or renamed."""
+    items = sorted((entity["entity_id"], entity.get("friendly_name") or "") for entity in entities)
+    return hashlib.sha256(json.dumps(items).encode()).hexdigest()[:16]
+
+
+class SelectionCache:
+    """Selection per kind (e.g. "reminder_calendar"), valid while the fingerprint matches."""
+
+    hass: HomeAssistant
+    _selections: dict[str, dict[str, str]]  # kind -> {"fingerprint", "entity_id"}
+
+    def __init__(self, hass: HomeAssistant):
+        self.hass = hass
+        self._selections = {}
+        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+
+    async def async_load(self):
+        data = await self._store.async_load()
+        if data:
+            self._selections = data.get("selections", {})
+
+    def get(self, kind: str, entities: list[dict]) -> str | None:
+        """Cached selection, or None if the entity set changed since it was made."""
+        selection = self._selections.get(kind)
+        if selection is None or selection["fingerprint"] != fingerprint(entities):
+            return None
+        return selection["entity_id"]
+
+    def last(self, kind: str) -> str | None:
+        """Most recent selection, whatever set of entities it was made for."""
+        selection = self._selections.get(kind)
+        return selection["entity_id"] if selection else None
+
+    @callback
+    def async_set(self, kind: str, entities: list[dict], entity_id: str):
+        if entity_id not in {entity["entity_id"] for entity in entities}:
+            # Don't remember hallucinated entities
+            return
+        self._selections[kind] = {
+            "fingerprint": fingerprint(entities),
+            "entity_id": entity_id,
+        }
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+        _LOGGER.debug("Remembered %s selection %s", kind, entity_id)
+
+    def _data_to_save(self) -> dict:
+        return {"selections": self._selections}
+
+
+def get_selection_cache(hass: HomeAssistant) -> SelectionCache | None:
+    """Get the cache loaded by the integration, if any."""
+    return hass.data.get(DATA_SELECTION_CACHE)
@@ -0,0 +1,111 @@
+"""Sensor entities mirroring virtual timers for dashboards and automations."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any
+
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntity
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
+
+from .entity import LocalLLMConfigEntry
+from .skills.virtual_timers import (
+    TIMER_REMOVED,
+    VirtualTimer,
+    get_virtual_timer_engine,
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: LocalLLMConfigEntry,
+    async_add_entities: AddConfigEntryEntitiesCallback,
+) -> bool:
+    """Add a sensor for every virtual timer this entry started with mirroring enabled."""
+    engine = get_virtual_timer_engine(hass)
+    if engine is None:
+        return True
+
+    sensors: dict[str, VirtualTimerSensor] = {}
+    registry = er.async_get(hass)
+
+    def _is_mirrored(timer: VirtualTimer) -> bool:
+        # Each timer is mirrored by the entry that started it, not by every entry
+        return timer.mirror and timer.entry_id == entry.entry_id
+
+    @callback
+    def _async_timer_changed(timer: VirtualTimer, event: str):
+        if not _is_mirrored(timer):
+            return
+
+        sensor = sensors.get(timer.timer_id)
+        if event == TIMER_REMOVED:
+            if sensor is not None:
+                del sensors[timer.timer_id]
+                _async_remove_sensor(sensor)
+        elif sensor is not None:
+            sensor.async_write_ha_state()
+        else:
+            sensors[timer.timer_id] = VirtualTimerSensor(entry, timer)
+            async_add_entities([sensors[timer.timer_id]])
+
+    @callback
+    def _async_remove_sensor(sensor: VirtualTimerSensor):
+        # Dropping the registry entry removes the entity too, and leaves no orphan
+        if sensor.entity_id and registry.async_get(sensor.entity_id) is not None:
+            registry.async_remove(sensor.entity_id)
+        else:
+            hass.async_create_task(sensor.async_remove())
+
+    # Timers restored from the snapshot
+    for timer in engine.timers:
+        if _is_mirrored(timer):
+            sensors[timer.timer_id] = VirtualTimerSensor(entry, timer)
+    # Sensors of timers that finished while Home Assistant was stopped
+    prefix = VirtualTimerSensor.unique_id_prefix(entry)
+    current = {sensor.unique_id for sensor in sensors.values()}
+    for entity_entry in er.async_entries_for_config_entry(registry, entry.entry_id):
+        if entity_entry.unique_id.startswith(prefix) and entity_entry.unique_id not in current:
+            registry.async_remove(entity_entry.entity_id)
+    if sensors:
+        async_add_entities(list(sensors.values()))
+
+    entry.async_on_unload(engine.async_add_listener(_async_timer_changed))
+    return True
+
+
+class VirtualTimerSensor(SensorEntity):
+    """Shows when a virtual timer finishes. Removed once the timer is gone."""
+
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _attr_should_poll = False
+    _attr_icon = "mdi:timer-outline"
+
+    @staticmethod
+    def unique_id_prefix(entry: LocalLLMConfigEntry) -> str:
+        return f"{entry.entry_id}_virtual_timer_"
+
+    def __init__(self, entry: LocalLLMConfigEntry, timer: VirtualTimer):
+        self.timer = timer
+        self._attr_unique_id = f"{self.unique_id_prefix(entry)}{timer.timer_id}"
+        label = timer.label.capitalize() if timer.label else "Voice"
+        self._attr_name = f"{label} timer"
+
+    @property
+    def native_value(self) -> datetime | None:
+        if self.timer.state != "active" or self.timer.deadline is None:
+            return None
+        return datetime.fromtimestamp(self.timer.deadline, tz=timezone.utc)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        return {
+            "timer_id": self.timer.timer_id,
+            "label": self.timer.label,
+            "state": self.timer.state,
+            "duration": round(self.timer.duration),
+            "remaining": round(self.timer.remaining()),
+            "device_id": self.timer.device_id,
+        }
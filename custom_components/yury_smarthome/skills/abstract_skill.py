@@ -35,6 +35,15 @@ class AbstractSkill:
     ):
         """Proccesses user request"""
 
+    async def try_fast_path(
+        self,
+        request: ConversationInput,
+        response: intent.IntentResponse,
+        qplFlow: QPLFlow,
+    ) -> bool:
+        """Handles the request without the LLM if it's unambiguous. Returns True if handled"""
+        return False
+
     @abstractmethod
     async def undo(self, response: intent.IntentResponse, qplFlow: QPLFlow):
         """Revert the last action"""
@@ -0,0 +1,117 @@
+"""Resolved CalendarEntity handles, so reminder paths don't rediscover them on every call."""
+
+from __future__ import annotations
+
+import logging
+from typing import Callable
+
+from homeassistant.components.calendar import CalendarEntity
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import entity_registry
+from homeassistant.helpers.entity_platform import async_get_platforms
+from homeassistant.helpers.event import (
+    TrackStates,
+    async_track_state_change_filtered,
+)
+from custom_components.yury_smarthome.const import DATA_CALENDAR_ENTITIES
+
+_LOGGER = logging.getLogger(__name__)
+
+CALENDAR_DOMAIN = "calendar"
+
+
+class CalendarEntityCache:
+    """CalendarEntity handles by entity_id.
+
+    A handle is dropped when its entity is removed or renamed in the entity
+    registry, or when its state is removed, which also happens when the
+    calendar's platform is reloaded and the entity object is replaced.
+    """
+
+    hass: HomeAssistant
+    _entities: dict[str, CalendarEntity]
+
+    def __init__(self, hass: HomeAssistant):
+        self.hass = hass
+        self._entities = {}
+        self._unsubscribers: list[Callable[[], None]] = []
+        self._tracker = None
+
+    @callback
+    def async_setup(self):
+        """Subscribe to registry updates and calendar state removal."""
+        self._unsubscribers.append(
+            self.hass.bus.async_listen(
+                entity_registry.EVENT_ENTITY_REGISTRY_UPDATED,
+                self._async_registry_updated,
+            )
+        )
+        self._tracker = async_track_state_change_filtered(
+            self.hass,
+            TrackStates(False, set(), {CALENDAR_DOMAIN}),
+            self._async_state_changed,
+        )
+
+    @callback
+    def async_shutdown(self):
+        """Unsubscribe and drop the shared instance."""
+        for unsubscribe in self._unsubscribers:
+            unsubscribe()
+        self._unsubscribers = []
+        if self._tracker is not None:
+            self._tracker.async_remove()
+            self._tracker = None
+        self._entities = {}
+        if self.hass.data.get(DATA_CALENDAR_ENTITIES) is self:
+            del self.hass.data[DATA_CALENDAR_ENTITIES]
+
+    @callback
+    def _async_registry_updated(self, event: Event):
+        if event.data.get("action") == "remove":
+            self._entities.pop(event.data["entity_id"], None)
+        elif event.data.get("action") == "update" and "old_entity_id" in event.data:
+            self._entities.pop(event.data["old_entity_id"], None)
+
+    @callback
+    def _async_state_changed(self, event: Event):
+        if event.data.get("new_state") is None:
+            self._entities.pop(event.data["entity_id"], None)
+
+    def get(self, entity_id: str) -> CalendarEntity | None:
+        """The CalendarEntity instance for the given entity_id."""
+        entity = self._entities.get(entity_id)
+        if entity is None:
+            entity = self._discover(entity_id)
+            if entity is not None:
+                self._entities[entity_id] = entity
+        return entity
+
+    def _discover(self, entity_id: str) -> CalendarEntity | None:
+        # Try the standard EntityComponent path
+        entity_component = self.hass.data.get(CALENDAR_DOMAIN)
+        if entity_component is not None and hasattr(entity_component, "get_entity"):
+            entity = entity_component.get_entity(entity_id)
+            if entity:
+                return entity
+
+        # Try via entity_platform
+        try:
+            for platform in async_get_platforms(self.hass, CALENDAR_DOMAIN):
+                if entity_id in platform.entities:
+                    return platform.entities[entity_id]
+        except Exception as e:
+            _LOGGER.debug(f"Could not get calendar entity via platforms: {e}")
+
+        _LOGGER.warning(f"Could not find calendar entity: {entity_id}")
+        return None
+
+
+@callback
+def async_get_calendar_entity_cache(hass: HomeAssistant) -> CalendarEntityCache:
+    """Get the shared CalendarEntityCache, creating it on first use."""
+    cache = hass.data.get(DATA_CALENDAR_ENTITIES)
+    if cache is None:
+        cache = CalendarEntityCache(hass)
+        cache.async_setup()
+        hass.data[DATA_CALENDAR_ENTITIES] = cache
+    return cache
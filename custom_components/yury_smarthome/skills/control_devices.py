@@ -1,17 +1,16 @@
 from .abstract_skill import AbstractSkill
 from homeassistant.components import conversation
 from homeassistant.components.homeassistant.exposed_entities import async_should_expose
-from homeassistant.helpers import entity_registry, area_registry, device_registry
 from dataclasses import dataclass
 import json
 import logging
 import os
-from jinja2 import Template
 from homeassistant.helpers import intent
 from homeassistant.components.conversation import ConversationInput
 from custom_components.yury_smarthome.qpl import QPLFlow
 from custom_components.yury_smarthome.maybe import maybe
 from custom_components.yury_smarthome.prompt_cache import PromptCache
+from custom_components.yury_smarthome.area_resolver import async_get_area_resolver
 import traceback
 
 
@@ -49,7 +48,7 @@ class ControlDevices(AbstractSkill):
         point = qpl_flow.mark_subspan_end("building_prompt")
         maybe(point).annotate("prompt", prompt)
         qpl_flow.mark_subspan_begin("sending_message_to_llm")
-        llm_response = await self.client.send_message(prompt)
+        llm_response = await self.client.send_message(prompt, qpl_flow)
         point = qpl_flow.mark_subspan_end("sending_message_to_llm")
         llm_response = llm_response.replace("```json", "")
         llm_response = llm_response.replace("```", "")
@@ -342,29 +341,16 @@ class ControlDevices(AbstractSkill):
     async def _build_prompt(self, request: ConversationInput, qpl_flow: QPLFlow) -> str:
         qpl_flow.mark_subspan_begin("fetching_device_list_from_ha")
         entities = []
-        er = entity_registry.async_get(self.hass)
-        dr = device_registry.async_get(self.hass)
-        ar = area_registry.async_get(self.hass)
-        user_location = None
+        area_resolver = async_get_area_resolver(self.hass)
 
         # Determine user's location from the device they're using (e.g., voice assistant)
-        if request.device_id:
-            user_device = dr.async_get(request.device_id)
-            if user_device and user_device.area_id:
-                user_area = ar.async_get_area(user_device.area_id)
-                if user_area:
-                    user_location = user_area.name
+        user_location = area_resolver.get_device_area(request.device_id)
 
         for state in self.hass.states.async_all():
-            if not async_should_expose(self.hass, conversation.DOMAIN, state.entity_id):
+            if state.state not in {"on", "off"}:
                 continue
 
-            entity = er.async_get(state.entity_id)
-            device = None
-            if entity and entity.device_id:
-                device = dr.async_get(entity.device_id)
-
-            if state.state not in {"on", "off"}:
+            if not async_should_expose(self.hass, conversation.DOMAIN, state.entity_id):
                 continue
 
             entry = {
@@ -379,31 +365,35 @@ class ControlDevices(AbstractSkill):
                 if brightness_ha is not None:
                     entry["brightness"] = int(brightness_ha * 100 / 255)
 
-            # area could be on device or entity. prefer device area
-            area_id = None
-            if device and device.area_id:
-                area_id = device.area_id
-            if entity and entity.area_id:
-                area_id = entity.area_id
-
-            if area_id:
-                area = ar.async_get_area(area_id)
-                if area:
-                    entry["area"] = area.name
+            area = area_resolver.get_entity_area(state.entity_id)
+            if area:
+                entry["area"] = area
 
             entities.append(entry)
 
         qpl_flow.mark_subspan_end("fetching_device_list_from_ha")
         qpl_flow.mark_subspan_begin("rendering_prompt_template")
-        device_list = json.dumps(entities)
         prompt_key = os.path.join(os.path.dirname(__file__), "control_devices.md")
-        prompt_template = await self.prompt_cache.get(prompt_key, request.conversation_id)
-        template = Template(prompt_template, trim_blocks=True)
+        template = await self.prompt_cache.get(prompt_key)
+
+        # Devices in the user's area are the last to be trimmed from the snapshot
+        entities.sort(key=lambda e: e.get("area") != user_location)
+        budget = self.client.token_budgeter.create_budget()
+        budget.reserve(
+            "static_instructions",
+            template.render(user_prompt=request.text, user_location=user_location),
+        )
+        device_list = json.dumps(budget.fit_items("snapshot", entities))
+        conversation_history = self.prompt_cache.get_history(
+            request.conversation_id, budget
+        )
 
         result = template.render(
             device_list=device_list,
             user_prompt=request.text,
+            conversation_history=conversation_history,
             user_location=user_location,
         )
-        qpl_flow.mark_subspan_end("rendering_prompt_template")
+        point = qpl_flow.mark_subspan_end("rendering_prompt_template")
+        budget.annotate(point)
         return result
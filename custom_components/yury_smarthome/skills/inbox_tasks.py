@@ -2,7 +2,6 @@ from .abstract_skill import AbstractSkill
 import json
 import os
 from dataclasses import dataclass
-from jinja2 import Template
 from homeassistant.helpers import intent
 from homeassistant.components.conversation import ConversationInput
 from homeassistant.components.todo.intent import (
@@ -11,6 +10,8 @@ from homeassistant.components.todo.intent import (
 )
 from custom_components.yury_smarthome.qpl import QPLFlow
 from custom_components.yury_smarthome.maybe import maybe
+from custom_components.yury_smarthome.const import CONF_INBOX_TODO_LIST
+from custom_components.yury_smarthome.selection_cache import get_selection_cache
 import traceback
 
 
@@ -62,7 +63,7 @@ class InboxTasks(AbstractSkill):
             )
             point = qpl_flow.mark_subspan_begin("sending_action_prompt_to_llm")
             maybe(point).annotate("prompt", action_prompt)
-            llm_response = await self.client.send_message(action_prompt)
+            llm_response = await self.client.send_message(action_prompt, qpl_flow)
             point = qpl_flow.mark_subspan_end("sending_action_prompt_to_llm")
             llm_response = llm_response.replace("```json", "")
             llm_response = llm_response.replace("```", "")
@@ -200,19 +201,36 @@ class InboxTasks(AbstractSkill):
             qpl_flow.mark_subspan_end("select_todo_list")
             return None
 
+        # A list pinned in the agent options wins over everything else
+        pinned = self.client.runtime_options.get(CONF_INBOX_TODO_LIST)
+        if pinned and any(todo["entity_id"] == pinned for todo in todo_lists):
+            point = qpl_flow.mark_subspan_end("select_todo_list")
+            maybe(point).annotate("selected_entity_id", pinned)
+            maybe(point).annotate("selection_source", "pinned")
+            return pinned
+
+        # Reuse the previous choice while the set of lists is unchanged
+        selection_cache = get_selection_cache(self.hass)
+        if selection_cache is not None:
+            entity_id = selection_cache.get("inbox_todo_list", todo_lists)
+            if entity_id is not None:
+                point = qpl_flow.mark_subspan_end("select_todo_list")
+                maybe(point).annotate("selected_entity_id", entity_id)
+                maybe(point).annotate("selection_source", "cache")
+                return entity_id
+
         # Build and send prompt to select list
         qpl_flow.mark_subspan_begin("render_select_list_prompt")
         prompt_key = os.path.join(
             os.path.dirname(__file__), "inbox_tasks_select_list.md"
         )
-        prompt_template = await self.prompt_cache.get(prompt_key)
-        template = Template(prompt_template, trim_blocks=True)
+        template = await self.prompt_cache.get(prompt_key)
         prompt = template.render(todo_lists=todo_lists_json)
         point = qpl_flow.mark_subspan_end("render_select_list_prompt")
         maybe(point).annotate("prompt", prompt)
 
         qpl_flow.mark_subspan_begin("sending_select_list_to_llm")
-        llm_response = await self.client.send_message(prompt)
+        llm_response = await self.client.send_message(prompt, qpl_flow)
         point = qpl_flow.mark_subspan_end("sending_select_list_to_llm")
         llm_response = llm_response.replace("```json", "")
         llm_response = llm_response.replace("```", "")
@@ -221,8 +239,11 @@ class InboxTasks(AbstractSkill):
         try:
             json_data = json.loads(llm_response)
             entity_id = json_data.get("entity_id")
+            if selection_cache is not None and entity_id:
+                selection_cache.async_set("inbox_todo_list", todo_lists, entity_id)
             point = qpl_flow.mark_subspan_end("select_todo_list")
             maybe(point).annotate("selected_entity_id", entity_id)
+            maybe(point).annotate("selection_source", "llm")
             return entity_id
         except json.JSONDecodeError:
             qpl_flow.mark_subspan_end("select_todo_list")
@@ -245,17 +266,24 @@ class InboxTasks(AbstractSkill):
         qpl_flow.mark_subspan_begin("build_action_prompt")
 
         prompt_key = os.path.join(os.path.dirname(__file__), "inbox_tasks.md")
-        prompt_template = await self.prompt_cache.get(prompt_key, request.conversation_id)
-        template = Template(prompt_template, trim_blocks=True)
+        template = await self.prompt_cache.get(prompt_key)
+
+        budget = self.client.token_budgeter.create_budget()
+        budget.reserve("static_instructions", template.render(user_prompt=request.text))
+        tasks_json = json.dumps(budget.fit_items("existing_items", existing_tasks))
+        conversation_history = self.prompt_cache.get_history(
+            request.conversation_id, budget
+        )
 
-        tasks_json = json.dumps(existing_tasks)
         output = template.render(
             existing_tasks=tasks_json,
             user_prompt=request.text,
+            conversation_history=conversation_history,
         )
         point = qpl_flow.mark_subspan_end("build_action_prompt")
         maybe(point).annotate("prompt", output)
         maybe(point).annotate("existing_tasks", tasks_json)
+        budget.annotate(point)
         return output
 
     async def undo(self, response: intent.IntentResponse, qpl_flow: QPLFlow):
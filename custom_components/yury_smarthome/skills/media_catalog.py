@@ -0,0 +1,365 @@
+"""In-memory catalog of the Music Assistant library with fuzzy lookup."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import logging
+import re
+import time
+from typing import Any, Callable
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+from custom_components.yury_smarthome.const import DATA_MEDIA_CATALOG
+
+_LOGGER = logging.getLogger(__name__)
+
+MUSIC_ASSISTANT_DOMAIN = "music_assistant"
+# (media_type, favorites only) synced into the catalog
+CATALOG_KINDS = (
+    ("artist", False),
+    ("album", False),
+    ("playlist", False),
+    ("radio", False),
+    ("track", True),
+)
+PAGE_SIZE = 500
+MAX_ITEMS_PER_KIND = 5000
+# Full resync picks up renames and removals, incremental syncs only additions
+FULL_SYNC_INTERVAL = timedelta(hours=6)
+# Library change events come in bursts, e.g. during a provider sync
+INCREMENTAL_SYNC_DELAY = 30  # seconds
+# Don't hammer Music Assistant while it's unavailable
+RETRY_DELAY = 60  # seconds
+LIBRARY_EVENTS = ("media_item_added", "media_item_updated", "media_item_deleted")
+
+# Minimum score for a catalog match, and how clearly it must beat the runner-up
+MIN_SCORE = 0.6
+MIN_MARGIN = 0.1
+# Soundex alone collides too often ("hello" and "halo" are both H400), so a
+# sound-alike is only trusted when its spelling is close as well
+PHONETIC_SCORE = 0.9
+PHONETIC_MIN_SIMILARITY = 0.4
+
+STOPWORDS = {"the", "a", "an"}
+_TOKEN_RE = re.compile(r"\w+")
+
+
+@dataclass(frozen=True)
+class CatalogItem:
+    uri: str
+    name: str
+    media_type: str
+    artist: str | None
+    tokens: tuple[str, ...]
+    trigrams: frozenset[str]
+    phonetic: tuple[str, ...]
+
+
+def tokens(text: str | None) -> tuple[str, ...]:
+    if not text:
+        return ()
+    return tuple(t for t in _TOKEN_RE.findall(text.lower()) if t not in STOPWORDS)
+
+
+def trigrams(words: tuple[str, ...]) -> frozenset[str]:
+    padded = f" {' '.join(words)} "
+    return frozenset(padded[i : i + 3] for i in range(len(padded) - 2))
+
+
+def soundex(word: str) -> str:
+    """Classic American Soundex, e.g. "beetles" and "beatles" are both B342."""
+    codes = {
+        **dict.fromkeys("bfpv", "1"),
+        **dict.fromkeys("cgjkqsxz", "2"),
+        **dict.fromkeys("dt", "3"),
+        "l": "4",
+        **dict.fromkeys("mn", "5"),
+        "r": "6",
+    }
+    letters = [c for c in word.lower() if c.isalpha()]
+    if not letters:
+        return word
+    result = letters[0].upper()
+    previous = codes.get(letters[0], "")
+    for letter in letters[1:]:
+        code = codes.get(letter, "")
+        if code and code != previous:
+            result += code
+        if letter not in "hw":
+            previous = code
+    return (result + "000")[:4]
+
+
+def make_item(uri: str, name: str, media_type: str, artist: str | None) -> CatalogItem:
+    words = tokens(name)
+    return CatalogItem(
+        uri=uri,
+        name=name,
+        media_type=media_type,
+        artist=artist,
+        tokens=words,
+        trigrams=trigrams(words),
+        phonetic=tuple(soundex(w) for w in words),
+    )
+
+
+class MediaCatalog:
+    """Artists, albums, playlists, radio stations and favorite tracks by URI.
+
+    Synced in the background: fully every FULL_SYNC_INTERVAL, and incrementally
+    (newest additions until a known item) shortly after Music Assistant reports
+    a library change. Lookups never call Music Assistant; they match the query
+    by exact tokens or trigram similarity against an inverted index, with
+    Soundex finding sound-alike candidates.
+    """
+
+    hass: HomeAssistant
+    _items: dict[str, CatalogItem]  # uri -> item
+    _by_trigram: dict[str, set[str]]
+    _by_phonetic: dict[tuple[str, ...], set[str]]
+
+    def __init__(self, hass: HomeAssistant):
+        self.hass = hass
+        self._items = {}
+        self._by_trigram = {}
+        self._by_phonetic = {}
+        self._synced_at: float | None = None
+        self._last_attempt: float | None = None
+        self._syncing = False
+        self._mass: Any = None
+        self._unsubscribers: list[Callable[[], None]] = []
+        self._unsubscribe_mass: Callable[[], None] | None = None
+        self._cancel_incremental: Callable[[], None] | None = None
+
+    @callback
+    def async_setup(self):
+        """Schedule the periodic full sync and start the first one."""
+        self._unsubscribers.append(
+            async_track_time_interval(
+                self.hass, self._async_full_sync_tick, FULL_SYNC_INTERVAL
+            )
+        )
+        self._async_request_sync(full=True)
+
+    @callback
+    def async_shutdown(self):
+        """Stop syncing and drop the shared instance."""
+        for unsubscribe in self._unsubscribers:
+            unsubscribe()
+        self._unsubscribers = []
+        if self._unsubscribe_mass is not None:
+            self._unsubscribe_mass()
+            self._unsubscribe_mass = None
+        if self._cancel_incremental is not None:
+            self._cancel_incremental()
+            self._cancel_incremental = None
+        self._mass = None
+        if self.hass.data.get(DATA_MEDIA_CATALOG) is self:
+            del self.hass.data[DATA_MEDIA_CATALOG]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def lookup(
+        self, query: str, media_type: str | None = None, artist: str | None = None
+    ) -> dict | None:
+        """Best catalog match as a search pick ({"type", "item"}), or None.
+
+        None when nothing scores high enough or two items are too close to call,
+        so the caller falls back to a Music Assistant search.
+        """
+        if self._synced_at is None:
+            # Music Assistant may have come up after us
+            self._async_request_sync(full=True)
+        query_tokens = tokens(query)
+        if not query_tokens:
+            return None
+        query_trigrams = trigrams(query_tokens)
+        query_phonetic = tuple(soundex(w) for w in query_tokens)
+        artist_tokens = set(tokens(artist))
+
+        candidates: set[str] = set(self._by_phonetic.get(query_phonetic, set()))
+        for trigram in query_trigrams:
+            candidates.update(self._by_trigram.get(trigram, ()))
+
+        scored = []
+        for uri in candidates:
+            item = self._items[uri]
+            if media_type and item.media_type != media_type:
+                continue
+            if artist_tokens and item.media_type in ("album", "track"):
+                if not artist_tokens & set(tokens(item.artist)):
+                    continue
+            union = len(item.trigrams | query_trigrams)
+            similarity = len(item.trigrams & query_trigrams) / union if union else 0.0
+            if item.tokens == query_tokens:
+                score = 1.0
+            elif item.phonetic == query_phonetic and similarity >= PHONETIC_MIN_SIMILARITY:
+                score = max(similarity, PHONETIC_SCORE)
+            else:
+                score = similarity
+            scored.append((score, item))
+
+        if not scored:
+            return None
+        scored.sort(key=lambda pair: pair[0], reverse=True)
+        best_score, best = scored[0]
+        if best_score < MIN_SCORE:
+            return None
+        if len(scored) > 1 and best_score - scored[1][0] < MIN_MARGIN:
+            # Too close to call, e.g. an artist and their album of the same name
+            return None
+
+        item = {"uri": best.uri, "name": best.name}
+        if best.artist:
+            item["artist"] = {"name": best.artist}
+        return {"type": best.media_type, "item": item}
+
+    @callback
+    def _async_full_sync_tick(self, _now: datetime):
+        self._async_request_sync(full=True)
+
+    @callback
+    def _async_library_changed(self, *_args):
+        if self._cancel_incremental is None:
+            self._cancel_incremental = async_call_later(
+                self.hass, INCREMENTAL_SYNC_DELAY, self._async_incremental_sync_due
+            )
+
+    @callback
+    def _async_incremental_sync_due(self, _now: datetime):
+        self._cancel_incremental = None
+        self._async_request_sync(full=False)
+
+    @callback
+    def _async_request_sync(self, full: bool):
+        if self._syncing:
+            return
+        if (
+            self._synced_at is None
+            and self._last_attempt is not None
+            and time.monotonic() - self._last_attempt < RETRY_DELAY
+        ):
+            return
+        self._syncing = True
+        self._last_attempt = time.monotonic()
+        self.hass.async_create_background_task(
+            self._async_sync(full or self._synced_at is None),
+            "yury_smarthome media catalog sync",
+        )
+
+    async def _async_sync(self, full: bool):
+        try:
+            config_entry_id = self._ensure_subscribed()
+            if config_entry_id is None:
+                return
+
+            items = {} if full else dict(self._items)
+            for media_type, favorite in CATALOG_KINDS:
+                offset = 0
+                while offset < MAX_ITEMS_PER_KIND:
+                    page = await self._async_library_page(
+                        config_entry_id, media_type, favorite, full, offset
+                    )
+                    known = False
+                    for entry in page:
+                        uri = entry.get("uri")
+                        name = entry.get("name")
+                        if not uri or not name:
+                            continue
+                        if not full and uri in items:
+                            # Newest first, everything older is already known
+                            known = True
+                            break
+                        items[uri] = make_item(uri, name, media_type, _artist_name(entry))
+                    if known or len(page) < PAGE_SIZE:
+                        break
+                    offset += PAGE_SIZE
+
+            self._rebuild(items)
+            self._synced_at = time.monotonic()
+            _LOGGER.debug(
+                "Media catalog %s sync: %d items", "full" if full else "incremental", len(items)
+            )
+        except Exception as e:
+            _LOGGER.debug(f"Media catalog sync failed: {e}")
+        finally:
+            self._syncing = False
+
+    async def _async_library_page(
+        self,
+        config_entry_id: str,
+        media_type: str,
+        favorite: bool,
+        full: bool,
+        offset: int,
+    ) -> list[dict]:
+        service_data = {
+            "config_entry_id": config_entry_id,
+            "media_type": media_type,
+            "limit": PAGE_SIZE,
+            "offset": offset,
+            "order_by": "name" if full else "timestamp_added_desc",
+        }
+        if favorite:
+            service_data["favorite"] = True
+        result = await self.hass.services.async_call(
+            MUSIC_ASSISTANT_DOMAIN,
+            "get_library",
+            service_data,
+            blocking=True,
+            return_response=True,
+        )
+        return (result or {}).get("items", [])
+
+    def _rebuild(self, items: dict[str, CatalogItem]):
+        by_trigram: dict[str, set[str]] = {}
+        by_phonetic: dict[tuple[str, ...], set[str]] = {}
+        for uri, item in items.items():
+            for trigram in item.trigrams:
+                by_trigram.setdefault(trigram, set()).add(uri)
+            by_phonetic.setdefault(item.phonetic, set()).add(uri)
+        self._items = items
+        self._by_trigram = by_trigram
+        self._by_phonetic = by_phonetic
+
+    def _ensure_subscribed(self) -> str | None:
+        """Config entry id of Music Assistant, following its client for library events."""
+        entries = self.hass.config_entries.async_entries(MUSIC_ASSISTANT_DOMAIN)
+        if not entries:
+            return None
+        mass = getattr(getattr(entries[0], "runtime_data", None), "mass", None)
+        if mass is not self._mass:
+            if self._unsubscribe_mass is not None:
+                self._unsubscribe_mass()
+                self._unsubscribe_mass = None
+            self._mass = mass
+            if mass is not None:
+                try:
+                    self._unsubscribe_mass = mass.subscribe(
+                        self._async_library_changed, LIBRARY_EVENTS
+                    )
+                except Exception as e:
+                    # Older clients: rely on the periodic full sync alone
+                    _LOGGER.debug(f"Cannot subscribe to Music Assistant library events: {e}")
+        return entries[0].entry_id
+
+
+def _artist_name(entry: dict) -> str | None:
+    artists = entry.get("artists") or []
+    if artists and isinstance(artists[0], dict):
+        return artists[0].get("name")
+    return None
+
+
+@callback
+def async_get_media_catalog(hass: HomeAssistant) -> MediaCatalog:
+    """Get the shared MediaCatalog, creating it on first use."""
+    catalog = hass.data.get(DATA_MEDIA_CATALOG)
+    if catalog is None:
+        catalog = MediaCatalog(hass)
+        catalog.async_setup()
+        hass.data[DATA_MEDIA_CATALOG] = catalog
+    return catalog
@@ -1,23 +1,46 @@
 from .abstract_skill import AbstractSkill
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers import intent, entity_registry, area_registry, device_registry
+from homeassistant.helpers import intent
 from homeassistant.components.conversation import ConversationInput
 from homeassistant.components import conversation
 from homeassistant.components.homeassistant.exposed_entities import async_should_expose
 from custom_components.yury_smarthome.entity import LocalLLMEntity
 from custom_components.yury_smarthome.prompt_cache import PromptCache
+from custom_components.yury_smarthome.area_resolver import async_get_area_resolver
 from custom_components.yury_smarthome.qpl import QPLFlow
 from custom_components.yury_smarthome.maybe import maybe
+from .music_search_cache import async_get_music_search_cache, search_key
+from .media_catalog import async_get_media_catalog
+from .music_parser import PlayerTarget, parse_music_command, resolve_player
 from dataclasses import dataclass
-from jinja2 import Template
+import asyncio
 import json
 import logging
 import os
+import time
 import traceback
 
 
 _LOGGER = logging.getLogger(__name__)
 
+# How long a library search may still finish after the global search did
+LIBRARY_GRACE = 0.3  # seconds
+# Transport commands, and how a fan-out to several players reports success
+TRANSPORT_SPEECH = {
+    "play": "Playing",
+    "pause": "Paused",
+    "stop": "Stopped",
+    "next": "Skipped to next track",
+    "previous": "Went to previous track",
+    "volume_set": "Volume set",
+    "volume_up": "Volume up",
+    "volume_down": "Volume down",
+    "mute": "Muted",
+    "unmute": "Unmuted",
+}
+# A single unresponsive player must not hold up the others
+PLAYER_TIMEOUT = 10  # seconds
+
 
 @dataclass
 class MusicAction:
@@ -28,6 +51,13 @@ class MusicAction:
     media_query: str | None = None
 
 
+def _step_players(step: dict | tuple[dict, list[str]]) -> set[str]:
+    if isinstance(step, tuple):
+        return set(step[1])
+    entity_id = step.get("entity_id")
+    return {entity_id} if entity_id else set()
+
+
 class Music(AbstractSkill):
     last_actions: list[MusicAction]
 
@@ -39,6 +69,8 @@ class Music(AbstractSkill):
     ):
         super().__init__(hass, client, prompt_cache)
         self.last_actions = []
+        self._search_cache = async_get_music_search_cache(hass)
+        self._catalog = async_get_media_catalog(hass)
 
     def name(self) -> str:
         return "Control Music Devices"
@@ -52,7 +84,7 @@ class Music(AbstractSkill):
         self.last_actions = []
         prompt = await self._build_prompt(request, qpl_flow)
         qpl_flow.mark_subspan_begin("sending_message_to_llm")
-        llm_response = await self.client.send_message(prompt)
+        llm_response = await self.client.send_message(prompt, qpl_flow)
         point = qpl_flow.mark_subspan_end("sending_message_to_llm")
         llm_response = llm_response.replace("```json", "")
         llm_response = llm_response.replace("```", "")
@@ -61,80 +93,7 @@ class Music(AbstractSkill):
         try:
             json_data = json.loads(llm_response)
             commands = json_data if isinstance(json_data, list) else [json_data]
-
-            messages = []
-            for cmd in commands:
-                action = cmd.get("action")
-                entity_id = cmd.get("entity_id")
-
-                if action is None or entity_id is None:
-                    messages.append("Missing action or player")
-                    continue
-
-                result = None
-                if action == "play":
-                    result = await self._play(entity_id, qpl_flow)
-                elif action == "pause":
-                    result = await self._pause(entity_id, qpl_flow)
-                elif action == "stop":
-                    result = await self._stop(entity_id, qpl_flow)
-                elif action == "next":
-                    result = await self._next_track(entity_id, qpl_flow)
-                elif action == "previous":
-                    result = await self._previous_track(entity_id, qpl_flow)
-                elif action == "volume_set":
-                    volume = cmd.get("volume")
-                    result = await self._set_volume(entity_id, volume, qpl_flow)
-                elif action == "volume_up":
-                    amount = cmd.get("amount", 10)
-                    result = await self._adjust_volume(entity_id, amount, qpl_flow)
-                elif action == "volume_down":
-                    amount = cmd.get("amount", 10)
-                    result = await self._adjust_volume(entity_id, -amount, qpl_flow)
-                elif action == "mute":
-                    result = await self._mute(entity_id, True, qpl_flow)
-                elif action == "unmute":
-                    result = await self._mute(entity_id, False, qpl_flow)
-                elif action == "play_media":
-                    media_query = cmd.get("query")
-                    media_type = cmd.get("media_type")
-                    artist = cmd.get("artist")
-                    album = cmd.get("album")
-                    result = await self._play_media(
-                        entity_id, media_query, media_type, artist, album, qpl_flow
-                    )
-                elif action == "queue_add_next":
-                    media_query = cmd.get("query")
-                    media_type = cmd.get("media_type")
-                    artist = cmd.get("artist")
-                    album = cmd.get("album")
-                    result = await self._queue_add(
-                        entity_id, media_query, media_type, artist, album, "next", qpl_flow
-                    )
-                elif action == "queue_add":
-                    media_query = cmd.get("query")
-                    media_type = cmd.get("media_type")
-                    artist = cmd.get("artist")
-                    album = cmd.get("album")
-                    result = await self._queue_add(
-                        entity_id, media_query, media_type, artist, album, "add", qpl_flow
-                    )
-                elif action == "queue_clear":
-                    result = await self._queue_clear(entity_id, qpl_flow)
-                elif action == "queue_clear_upcoming":
-                    result = await self._queue_clear_upcoming(entity_id, qpl_flow)
-                else:
-                    messages.append(f"Unknown action: {action}")
-                    continue
-
-                if result:
-                    messages.append(result)
-
-            if messages:
-                response.async_set_speech(". ".join(messages))
-            else:
-                response.async_set_speech("No music actions performed")
-
+            await self._run_commands(commands, response, qpl_flow)
         except json.JSONDecodeError as err:
             qpl_flow.mark_failed(err.msg)
             response.async_set_speech("Failed to understand music request")
@@ -142,7 +101,237 @@ class Music(AbstractSkill):
             qpl_flow.mark_failed(traceback.format_exc())
             response.async_set_speech("Failed to control music")
 
-    async def _play(self, entity_id: str, qpl_flow: QPLFlow) -> str:
+    async def try_fast_path(
+        self,
+        request: ConversationInput,
+        response: intent.IntentResponse,
+        qpl_flow: QPLFlow,
+    ) -> bool:
+        qpl_flow.mark_subspan_begin("music_fast_path")
+        command = parse_music_command(request.text)
+        if command is not None:
+            location = async_get_area_resolver(self.hass).get_device_location(
+                request.device_id
+            )
+            command["entity_id"] = resolve_player(
+                self._player_targets(), location.area_id if location else None
+            )
+        point = qpl_flow.mark_subspan_end("music_fast_path")
+        if command is None:
+            return False
+
+        maybe(point).annotate("command", json.dumps(command))
+        if command["entity_id"] is None:
+            # Parsed, but the player is ambiguous
+            maybe(point).annotate("ambiguous_player", True)
+            return False
+
+        self.last_actions = []
+        try:
+            await self._run_commands([command], response, qpl_flow)
+        except Exception:
+            qpl_flow.mark_failed(traceback.format_exc())
+            response.async_set_speech("Failed to control music")
+        return True
+
+    async def _run_commands(
+        self,
+        commands: list[dict],
+        response: intent.IntentResponse,
+        qpl_flow: QPLFlow,
+    ):
+        messages = []
+        for step in self._plan_steps(commands):
+            if isinstance(step, tuple):
+                messages.append(await self._fan_out(*step, qpl_flow))
+                continue
+
+            cmd = step
+            action = cmd.get("action")
+            entity_id = cmd.get("entity_id")
+
+            if action is None or entity_id is None:
+                messages.append("Missing action or player")
+                continue
+
+            result = None
+            if action in TRANSPORT_SPEECH:
+                _, result = await self._run_transport(cmd, entity_id, qpl_flow)
+            elif action == "play_media":
+                media_query = cmd.get("query")
+                media_type = cmd.get("media_type")
+                artist = cmd.get("artist")
+                album = cmd.get("album")
+                result = await self._play_media(
+                    entity_id, media_query, media_type, artist, album, qpl_flow
+                )
+            elif action == "queue_add_next":
+                media_query = cmd.get("query")
+                media_type = cmd.get("media_type")
+                artist = cmd.get("artist")
+                album = cmd.get("album")
+                result = await self._queue_add(
+                    entity_id, media_query, media_type, artist, album, "next", qpl_flow
+                )
+            elif action == "queue_add":
+                media_query = cmd.get("query")
+                media_type = cmd.get("media_type")
+                artist = cmd.get("artist")
+                album = cmd.get("album")
+                result = await self._queue_add(
+                    entity_id, media_query, media_type, artist, album, "add", qpl_flow
+                )
+            elif action == "queue_clear":
+                result = await self._queue_clear(entity_id, qpl_flow)
+            elif action == "queue_clear_upcoming":
+                result = await self._queue_clear_upcoming(entity_id, qpl_flow)
+            else:
+                messages.append(f"Unknown action: {action}")
+                continue
+
+            if result:
+                messages.append(result)
+
+        if messages:
+            response.async_set_speech(". ".join(messages))
+        else:
+            response.async_set_speech("No music actions performed")
+
+    def _plan_steps(self, commands: list[dict]) -> list[dict | tuple[dict, list[str]]]:
+        """Commands in order, with the same transport command on several players merged.
+
+        A merged step is (command, entity_ids) and takes the place of the first
+        of its commands. A command only joins a group if no command between
+        them touches the group's players or its own, so every player still sees
+        its commands in the requested order.
+        """
+        steps: list[dict | tuple[dict, list[str]]] = []
+        groups: dict[tuple, int] = {}  # key -> index of the group in steps
+        for cmd in commands:
+            action = cmd.get("action")
+            entity_id = cmd.get("entity_id")
+            if (
+                action not in TRANSPORT_SPEECH
+                or entity_id is None
+                or (action == "volume_set" and cmd.get("volume") is None)
+            ):
+                steps.append(cmd)
+                continue
+
+            key = (action, cmd.get("volume"), cmd.get("amount", 10))
+            index = groups.get(key)
+            if index is not None:
+                entity_ids = steps[index][1]
+                touched = {entity_id, *entity_ids}
+                if not any(
+                    _step_players(step) & touched for step in steps[index + 1 :]
+                ) and entity_id not in entity_ids:
+                    entity_ids.append(entity_id)
+                    continue
+
+            groups[key] = len(steps)
+            steps.append((cmd, [entity_id]))
+
+        # A group of one runs through the regular per-player path
+        return [
+            step[0] if isinstance(step, tuple) and len(step[1]) == 1 else step
+            for step in steps
+        ]
+
+    async def _run_transport(
+        self, cmd: dict, entity_id: str, qpl_flow: QPLFlow
+    ) -> tuple[bool, str]:
+        action = cmd["action"]
+        if action == "play":
+            return await self._play(entity_id, qpl_flow)
+        if action == "pause":
+            return await self._pause(entity_id, qpl_flow)
+        if action == "stop":
+            return await self._stop(entity_id, qpl_flow)
+        if action == "next":
+            return await self._next_track(entity_id, qpl_flow)
+        if action == "previous":
+            return await self._previous_track(entity_id, qpl_flow)
+        if action == "volume_set":
+            return await self._set_volume(entity_id, cmd.get("volume"), qpl_flow)
+        if action == "volume_up":
+            return await self._adjust_volume(entity_id, cmd.get("amount", 10), qpl_flow)
+        if action == "volume_down":
+            return await self._adjust_volume(entity_id, -cmd.get("amount", 10), qpl_flow)
+        return await self._mute(entity_id, action == "mute", qpl_flow)
+
+    async def _fan_out(
+        self, cmd: dict, entity_ids: list[str], qpl_flow: QPLFlow
+    ) -> str:
+        """Run one transport command on several players concurrently."""
+        action = cmd["action"]
+        point = qpl_flow.mark_subspan_begin("fan_out")
+        maybe(point).annotate("action", action)
+        maybe(point).annotate("entity_ids", json.dumps(entity_ids))
+        maybe(point).annotate("parallelism", len(entity_ids))
+
+        # Subspans nest, so each player records into its own forked flow
+        children = [qpl_flow.fork(entity_id) for entity_id in entity_ids]
+        outcomes = await asyncio.gather(
+            *(
+                self._fan_out_player(cmd, entity_id, child)
+                for entity_id, child in zip(entity_ids, children)
+            )
+        )
+        qpl_flow.join(children)
+        results = dict(zip(entity_ids, outcomes))
+
+        point = qpl_flow.mark_subspan_end("fan_out")
+        maybe(point).annotate("results", json.dumps(results))
+        failed = [entity_id for entity_id, result in results.items() if result != "ok"]
+        maybe(point).annotate("failed_count", len(failed))
+
+        speech = TRANSPORT_SPEECH[action]
+        if action == "volume_set":
+            speech = f"Volume set to {int(max(0, min(100, cmd['volume'])))}%"
+        if not failed:
+            return f"{speech} on {len(entity_ids)} players"
+        if len(failed) == len(entity_ids):
+            return f"Failed to {action.replace('_', ' ')} on all players"
+        names = ", ".join(self._player_name(entity_id) for entity_id in failed)
+        return f"{speech} on {len(entity_ids) - len(failed)} players, failed on {names}"
+
+    async def _fan_out_player(
+        self, cmd: dict, entity_id: str, qpl_flow: QPLFlow
+    ) -> str:
+        """Run the command on one player of a fan-out: "ok", "failed" or "timeout"."""
+        try:
+            async with asyncio.timeout(PLAYER_TIMEOUT):
+                ok, _ = await self._run_transport(cmd, entity_id, qpl_flow)
+        except TimeoutError:
+            _LOGGER.warning(f"Timed out running {cmd['action']} on {entity_id}")
+            return "timeout"
+        return "ok" if ok else "failed"
+
+    def _player_name(self, entity_id: str) -> str:
+        state = self.hass.states.get(entity_id)
+        return state.name if state else entity_id
+
+    def _player_targets(self) -> list[PlayerTarget]:
+        """Exposed media players with their area, for resolving bare transport commands."""
+        area_resolver = async_get_area_resolver(self.hass)
+        players = []
+        for state in self.hass.states.async_all("media_player"):
+            if not async_should_expose(self.hass, conversation.DOMAIN, state.entity_id):
+                continue
+            location = area_resolver.get_entity_location(state.entity_id)
+            players.append(
+                PlayerTarget(
+                    entity_id=state.entity_id,
+                    area_id=location.area_id if location else None,
+                    state=state.state,
+                )
+            )
+        return players
+
+    async def _play(
+        self, entity_id: str, qpl_flow: QPLFlow
+    ) -> tuple[bool, str]:
         point = qpl_flow.mark_subspan_begin("play")
         maybe(point).annotate("entity_id", entity_id)
 
@@ -151,14 +340,16 @@ class Music(AbstractSkill):
                 "media_player", "media_play", {"entity_id": entity_id}, blocking=True
             )
             self.last_actions.append(MusicAction("play", entity_id))
-            return "Playing"
+            return True, "Playing"
         except Exception:
             _LOGGER.warning(f"Failed to play: {traceback.format_exc()}")
-            return "Failed to play"
+            return False, "Failed to play"
         finally:
             qpl_flow.mark_subspan_end("play")
 
-    async def _pause(self, entity_id: str, qpl_flow: QPLFlow) -> str:
+    async def _pause(
+        self, entity_id: str, qpl_flow: QPLFlow
+    ) -> tuple[bool, str]:
         point = qpl_flow.mark_subspan_begin("pause")
         maybe(point).annotate("entity_id", entity_id)
 
@@ -167,14 +358,16 @@ class Music(AbstractSkill):
                 "media_player", "media_pause", {"entity_id": entity_id}, blocking=True
             )
             self.last_actions.append(MusicAction("pause", entity_id))
-            return "Paused"
+            return True, "Paused"
         except Exception:
             _LOGGER.warning(f"Failed to pause: {traceback.format_exc()}")
-            return "Failed to pause"
+            return False, "Failed to pause"
         finally:
             qpl_flow.mark_subspan_end("pause")
 
-    async def _stop(self, entity_id: str, qpl_flow: QPLFlow) -> str:
+    async def _stop(
+        self, entity_id: str, qpl_flow: QPLFlow
+    ) -> tuple[bool, str]:
         point = qpl_flow.mark_subspan_begin("stop")
         maybe(point).annotate("entity_id", entity_id)
 
@@ -183,14 +376,16 @@ class Music(AbstractSkill):
                 "media_player", "media_stop", {"entity_id": entity_id}, blocking=True
             )
             self.last_actions.append(MusicAction("stop", entity_id))
-            return "Stopped"
+            return True, "Stopped"
         except Exception:
             _LOGGER.warning(f"Failed to stop: {traceback.format_exc()}")
-            return "Failed to stop"
+            return False, "Failed to stop"
         finally:
             qpl_flow.mark_subspan_end("stop")
 
-    async def _next_track(self, entity_id: str, qpl_flow: QPLFlow) -> str:
+    async def _next_track(
+        self, entity_id: str, qpl_flow: QPLFlow
+    ) -> tuple[bool, str]:
         point = qpl_flow.mark_subspan_begin("next_track")
         maybe(point).annotate("entity_id", entity_id)
 
@@ -202,14 +397,16 @@ class Music(AbstractSkill):
                 blocking=True,
             )
             self.last_actions.append(MusicAction("next", entity_id))
-            return "Skipped to next track"
+            return True, "Skipped to next track"
         except Exception:
             _LOGGER.warning(f"Failed to skip track: {traceback.format_exc()}")
-            return "Failed to skip track"
+            return False, "Failed to skip track"
         finally:
             qpl_flow.mark_subspan_end("next_track")
 
-    async def _previous_track(self, entity_id: str, qpl_flow: QPLFlow) -> str:
+    async def _previous_track(
+        self, entity_id: str, qpl_flow: QPLFlow
+    ) -> tuple[bool, str]:
         point = qpl_flow.mark_subspan_begin("previous_track")
         maybe(point).annotate("entity_id", entity_id)
 
@@ -221,23 +418,23 @@ class Music(AbstractSkill):
                 blocking=True,
             )
             self.last_actions.append(MusicAction("previous", entity_id))
-            return "Went to previous track"
+            return True, "Went to previous track"
         except Exception:
             _LOGGER.warning(f"Failed to go to previous track: {traceback.format_exc()}")
-            return "Failed to go to previous track"
+            return False, "Failed to go to previous track"
         finally:
             qpl_flow.mark_subspan_end("previous_track")
 
     async def _set_volume(
         self, entity_id: str, volume: float | None, qpl_flow: QPLFlow
-    ) -> str:
+    ) -> tuple[bool, str]:
         point = qpl_flow.mark_subspan_begin("set_volume")
         maybe(point).annotate("entity_id", entity_id)
         maybe(point).annotate("volume", volume)
 
         try:
             if volume is None:
-                return "No volume level specified"
+                return False, "No volume level specified"
 
             # Clamp volume to 0-100 range
             volume = max(0, min(100, volume))
@@ -257,16 +454,16 @@ class Music(AbstractSkill):
             self.last_actions.append(
                 MusicAction("volume", entity_id, previous_volume=previous_volume)
             )
-            return f"Volume set to {int(volume)}%"
+            return True, f"Volume set to {int(volume)}%"
         except Exception:
             _LOGGER.warning(f"Failed to set volume: {traceback.format_exc()}")
-            return "Failed to set volume"
+            return False, "Failed to set volume"
         finally:
             qpl_flow.mark_subspan_end("set_volume")
 
     async def _adjust_volume(
         self, entity_id: str, amount: float, qpl_flow: QPLFlow
-    ) -> str:
+    ) -> tuple[bool, str]:
         point = qpl_flow.mark_subspan_begin("adjust_volume")
         maybe(point).annotate("entity_id", entity_id)
         maybe(point).annotate("amount", amount)
@@ -275,7 +472,7 @@ class Music(AbstractSkill):
             # Get current volume
             state = self.hass.states.get(entity_id)
             if state is None or "volume_level" not in state.attributes:
-                return "Cannot determine current volume"
+                return False, "Cannot determine current volume"
 
             current_volume = state.attributes["volume_level"] * 100
             new_volume = max(0, min(100, current_volume + amount))
@@ -290,14 +487,16 @@ class Music(AbstractSkill):
                 MusicAction("volume", entity_id, previous_volume=current_volume)
             )
             direction = "up" if amount > 0 else "down"
-            return f"Volume {direction} to {int(new_volume)}%"
+            return True, f"Volume {direction} to {int(new_volume)}%"
         except Exception:
             _LOGGER.warning(f"Failed to adjust volume: {traceback.format_exc()}")
-            return "Failed to adjust volume"
+            return False, "Failed to adjust volume"
         finally:
             qpl_flow.mark_subspan_end("adjust_volume")
 
-    async def _mute(self, entity_id: str, mute: bool, qpl_flow: QPLFlow) -> str:
+    async def _mute(
+        self, entity_id: str, mute: bool, qpl_flow: QPLFlow
+    ) -> tuple[bool, str]:
         action_name = "mute" if mute else "unmute"
         point = qpl_flow.mark_subspan_begin(action_name)
         maybe(point).annotate("entity_id", entity_id)
@@ -318,10 +517,10 @@ class Music(AbstractSkill):
             self.last_actions.append(
                 MusicAction(action_name, entity_id, previous_mute=previous_mute)
             )
-            return "Muted" if mute else "Unmuted"
+            return True, "Muted" if mute else "Unmuted"
         except Exception:
             _LOGGER.warning(f"Failed to {action_name}: {traceback.format_exc()}")
-            return f"Failed to {action_name}"
+            return False, f"Failed to {action_name}"
         finally:
             qpl_flow.mark_subspan_end(action_name)
 
@@ -349,21 +548,15 @@ class Music(AbstractSkill):
             config_entry = await self._get_music_assistant_config_entry()
 
             if config_entry:
-                # Try library search first
-                library_result = await self._search_library(
-                    config_entry, query, media_type, artist, album, qpl_flow
+                search_result = self._lookup_catalog(
+                    query, media_type, artist, album, qpl_flow
                 )
-
-                if library_result:
-                    return await self._play_found_media(
-                        entity_id, library_result, qpl_flow
+                if search_result is None:
+                    # Library and global (streaming services) searches run together
+                    search_result = await self._search_media(
+                        config_entry, query, media_type, artist, album, qpl_flow
                     )
 
-                # Try global search (includes streaming services)
-                search_result = await self._search_global(
-                    config_entry, query, media_type, artist, album, qpl_flow
-                )
-
                 if search_result:
                     return await self._play_found_media(entity_id, search_result, qpl_flow)
 
@@ -435,11 +628,11 @@ class Music(AbstractSkill):
 
             if config_entry:
                 # Search for the media first
-                library_result = await self._search_library(
-                    config_entry, query, media_type, artist, album, qpl_flow
+                library_result = self._lookup_catalog(
+                    query, media_type, artist, album, qpl_flow
                 )
-                if not library_result:
-                    library_result = await self._search_global(
+                if library_result is None:
+                    library_result = await self._search_media(
                         config_entry, query, media_type, artist, album, qpl_flow
                     )
 
@@ -585,7 +778,26 @@ class Music(AbstractSkill):
             return entry.entry_id
         return None
 
-    async def _search_library(
+    def _lookup_catalog(
+        self,
+        query: str,
+        media_type: str | None,
+        artist: str | None,
+        album: str | None,
+        qpl_flow: QPLFlow,
+    ) -> dict | None:
+        """Match against the local library catalog, no Music Assistant round trip."""
+        point = qpl_flow.mark_subspan_begin("catalog_lookup")
+        maybe(point).annotate("catalog_size", len(self._catalog))
+        # The catalog doesn't know which album a track is on
+        found = None if album else self._catalog.lookup(query, media_type, artist)
+        point = qpl_flow.mark_subspan_end("catalog_lookup")
+        maybe(point).annotate("catalog_hit", found is not None)
+        if found:
+            maybe(point).annotate("found_type", found["type"])
+        return found
+
+    async def _search_media(
         self,
         config_entry_id: str,
         query: str,
@@ -594,54 +806,94 @@ class Music(AbstractSkill):
         album: str | None,
         qpl_flow: QPLFlow,
     ) -> dict | None:
-        """Search in local Music Assistant library."""
-        point = qpl_flow.mark_subspan_begin("search_library")
-
-        try:
-            service_data = {
-                "config_entry_id": config_entry_id,
-                "name": query,
-                "library_only": True,
-                "limit": 5,
-            }
-            if media_type:
-                service_data["media_type"] = media_type
-            if artist:
-                service_data["artist"] = artist
-            if album:
-                service_data["album"] = album
-
-            result = await self.hass.services.async_call(
-                "music_assistant",
-                "search",
-                service_data,
-                blocking=True,
-                return_response=True,
-            )
+        """Search the library and globally at the same time, preferring the library.
 
-            maybe(point).annotate("result", str(result)[:500] if result else "None")
+        The global search (streaming services) is cancelled as soon as the
+        library has a result. If the global search finishes first, the library
+        gets LIBRARY_GRACE seconds more before the global result is used.
+        """
+        point = qpl_flow.mark_subspan_begin("search_media")
+        maybe(point).annotate("query", query)
+        started = time.monotonic()
+        timings: dict[str, float] = {}
 
-            if result and self._has_results(result):
-                return self._pick_best_result(result, media_type)
+        async def timed(name: str, library_only: bool):
+            try:
+                return await self._search(
+                    config_entry_id, query, media_type, artist, album, library_only
+                )
+            finally:
+                timings[name] = time.monotonic() - started
 
-            return None
-        except Exception:
-            _LOGGER.debug(f"Library search failed: {traceback.format_exc()}")
-            return None
+        library = asyncio.create_task(timed("library", True))
+        search_global = asyncio.create_task(timed("global", False))
+        winner = None
+        try:
+            await asyncio.wait(
+                {library, search_global}, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not library.done():
+                # Global finished first, give the library a moment to catch up
+                await asyncio.wait({library}, timeout=LIBRARY_GRACE)
+
+            if library.done() and library.result()[0] is not None:
+                winner = "library"
+            elif search_global.done() and search_global.result()[0] is not None:
+                winner = "global"
+            else:
+                # Whichever is still running is the only chance left
+                pending = library if not library.done() else search_global
+                await pending
+                if library.result()[0] is not None:
+                    winner = "library"
+                elif search_global.result()[0] is not None:
+                    winner = "global"
         finally:
-            qpl_flow.mark_subspan_end("search_library")
+            cancelled = [
+                name
+                for name, task in (("library", library), ("global", search_global))
+                if not task.done()
+            ]
+            for task in (library, search_global):
+                task.cancel()
+
+        elapsed = time.monotonic() - started
+        # Serial search took library time plus global time, unless the library hit
+        serial = timings.get("library", elapsed) + (
+            0 if winner == "library" else timings.get("global", elapsed)
+        )
+        point = qpl_flow.mark_subspan_end("search_media")
+        maybe(point).annotate("winner", winner or "none")
+        maybe(point).annotate("cancelled", json.dumps(cancelled))
+        for name, task in (("library", library), ("global", search_global)):
+            if task.done() and not task.cancelled():
+                pick, cache_status = task.result()
+                maybe(point).annotate(f"{name}_search_cache", cache_status)
+                maybe(point).annotate(f"{name}_found", pick is not None)
+            if name in timings:
+                maybe(point).annotate(f"{name}_ms", round(timings[name] * 1000))
+        maybe(point).annotate("time_saved_ms", max(0, round((serial - elapsed) * 1000)))
+
+        if winner == "library":
+            return library.result()[0]
+        if winner == "global":
+            return search_global.result()[0]
+        return None
 
-    async def _search_global(
+    async def _search(
         self,
         config_entry_id: str,
         query: str,
         media_type: str | None,
         artist: str | None,
         album: str | None,
-        qpl_flow: QPLFlow,
-    ) -> dict | None:
-        """Search globally in Music Assistant (includes streaming services)."""
-        point = qpl_flow.mark_subspan_begin("search_global")
+        library_only: bool,
+    ) -> tuple[dict | None, str]:
+        """Best Music Assistant search result and whether the search cache had it."""
+        key = search_key(query, media_type, artist, album, library_only)
+        found, pick = self._search_cache.get(key)
+        if found:
+            return pick, "hit"
 
         try:
             service_data = {
@@ -649,6 +901,8 @@ class Music(AbstractSkill):
                 "name": query,
                 "limit": 5,
             }
+            if library_only:
+                service_data["library_only"] = True
             if media_type:
                 service_data["media_type"] = media_type
             if artist:
@@ -664,17 +918,15 @@ class Music(AbstractSkill):
                 return_response=True,
             )
 
-            maybe(point).annotate("result", str(result)[:500] if result else "None")
-
+            pick = None
             if result and self._has_results(result):
-                return self._pick_best_result(result, media_type)
-
-            return None
+                pick = self._pick_best_result(result, media_type)
+            self._search_cache.set(key, pick)
+            return pick, "miss"
         except Exception:
-            _LOGGER.debug(f"Global search failed: {traceback.format_exc()}")
-            return None
-        finally:
-            qpl_flow.mark_subspan_end("search_global")
+            scope = "Library" if library_only else "Global"
+            _LOGGER.debug(f"{scope} search failed: {traceback.format_exc()}")
+            return None, "miss"
 
     def _has_results(self, result: dict) -> bool:
         """Check if search result contains any items."""
@@ -878,18 +1130,10 @@ class Music(AbstractSkill):
             qpl_flow.mark_subspan_begin("querying_players_from_ha")
 
             players = []
-            er = entity_registry.async_get(self.hass)
-            dr = device_registry.async_get(self.hass)
-            ar = area_registry.async_get(self.hass)
-            user_location = None
+            area_resolver = async_get_area_resolver(self.hass)
 
             # Determine user's location from the device they're using (e.g., voice assistant)
-            if request.device_id:
-                user_device = dr.async_get(request.device_id)
-                if user_device and user_device.area_id:
-                    user_area = ar.async_get_area(user_device.area_id)
-                    if user_area:
-                        user_location = user_area.name
+            user_location = area_resolver.get_device_area(request.device_id)
 
             for state in self.hass.states.async_all():
                 if not state.entity_id.startswith("media_player."):
@@ -918,39 +1162,40 @@ class Music(AbstractSkill):
                         entry["artist"] = state.attributes["media_artist"]
 
                 # Get area info
-                entity = er.async_get(state.entity_id)
-                if entity:
-                    device = None
-                    if entity.device_id:
-                        device = dr.async_get(entity.device_id)
-
-                    area_id = entity.area_id
-                    if device and device.area_id:
-                        area_id = device.area_id
-
-                    if area_id:
-                        area = ar.async_get_area(area_id)
-                        if area:
-                            entry["area"] = area.name
+                area = area_resolver.get_entity_area(state.entity_id)
+                if area:
+                    entry["area"] = area
 
                 players.append(entry)
 
             point = qpl_flow.mark_subspan_end("querying_players_from_ha")
-            player_list = json.dumps(players)
-            maybe(point).annotate("player_list", player_list)
+            maybe(point).annotate("player_list", json.dumps(players))
 
             qpl_flow.mark_subspan_begin("render_prompt")
             prompt_key = os.path.join(os.path.dirname(__file__), "music.md")
-            prompt_template = await self.prompt_cache.get(prompt_key, request.conversation_id)
-            template = Template(prompt_template, trim_blocks=True)
+            template = await self.prompt_cache.get(prompt_key)
+
+            # Players in the user's area are the last to be trimmed from the snapshot
+            players.sort(key=lambda p: p.get("area") != user_location)
+            budget = self.client.token_budgeter.create_budget()
+            budget.reserve(
+                "static_instructions",
+                template.render(user_prompt=request.text, user_location=user_location),
+            )
+            player_list = json.dumps(budget.fit_items("snapshot", players))
+            conversation_history = self.prompt_cache.get_history(
+                request.conversation_id, budget
+            )
 
             output = template.render(
                 player_list=player_list,
                 user_prompt=request.text,
+                conversation_history=conversation_history,
                 user_location=user_location,
             )
             point = qpl_flow.mark_subspan_end("render_prompt")
             maybe(point).annotate("prompt", output)
+            budget.annotate(point)
             return output
         finally:
             qpl_flow.mark_subspan_end("build_prompt")
@@ -0,0 +1,105 @@
+"""Local grammar for transport controls, so "pause" or "volume up" don't need the LLM."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import re
+
+_AMOUNT = r"(?: (?:by )?(?P<amount>\d+)(?: percent)?)?"
+_TARGET = r"(?: (?:the|this))?(?: (?:music|song|track|playback|sound|audio|it))?"
+
+COMMAND_RES = [
+    ("pause", re.compile(rf"^pause{_TARGET}$")),
+    (
+        "next",
+        re.compile(r"^(?:(?:play )?(?:the )?next|skip)(?: (?:this|the))?(?: (?:song|track|one))?$"),
+    ),
+    ("previous", re.compile(r"^(?:play )?(?:the )?previous(?: (?:song|track|one))?$")),
+    ("mute", re.compile(rf"^mute{_TARGET}$")),
+    ("unmute", re.compile(rf"^unmute{_TARGET}$")),
+    (
+        "volume",
+        re.compile(
+            rf"^(?:turn )?(?:the )?(?:volume|music|sound) (?P<direction>up|down){_AMOUNT}$"
+        ),
+    ),
+    (
+        "volume",
+        re.compile(
+            rf"^turn (?:it (?P<direction_it>up|down)|(?P<direction_pre>up|down)"
+            rf" (?:the )?(?:volume|music|sound)){_AMOUNT}$"
+        ),
+    ),
+    ("volume", re.compile(r"^(?:make it )?(?:a (?:bit|little) )?(?P<direction>louder|quieter|softer)$")),
+]
+DIRECTIONS = {"up": 1, "louder": 1, "down": -1, "quieter": -1, "softer": -1}
+DEFAULT_VOLUME_STEP = 10
+PLAYING_STATE = "playing"
+
+
+@dataclass
+class PlayerTarget:
+    entity_id: str
+    area_id: str | None
+    state: str
+
+
+def parse_music_command(text: str) -> dict | None:
+    """Parse a transport command into the command dict the LLM would produce.
+
+    The entity_id is left unset, see resolve_player. Returns None if the text
+    isn't a bare transport command, e.g. when it names a player or media.
+    """
+    text = _normalize(text)
+
+    for action, regex in COMMAND_RES:
+        match = regex.match(text)
+        if match is None:
+            continue
+        if action != "volume":
+            return {"action": action, "entity_id": None}
+
+        groups = match.groupdict()
+        direction = next(
+            groups[name]
+            for name in ("direction", "direction_it", "direction_pre")
+            if groups.get(name)
+        )
+        amount = int(groups["amount"]) if groups.get("amount") else DEFAULT_VOLUME_STEP
+        if not 0 < amount <= 100:
+            return None
+        return {
+            "action": "volume_up" if DIRECTIONS[direction] > 0 else "volume_down",
+            "entity_id": None,
+            "amount": amount,
+        }
+
+    return None
+
+
+def resolve_player(players: list[PlayerTarget], area_id: str | None) -> str | None:
+    """The player a bare transport command is meant for, or None if ambiguous.
+
+    Whatever plays in the requesting satellite's area wins, then whatever plays
+    anywhere, then the only player in the area.
+    """
+    in_area = [p for p in players if area_id is not None and p.area_id == area_id]
+    playing_in_area = [p for p in in_area if p.state == PLAYING_STATE]
+    if playing_in_area:
+        return playing_in_area[0].entity_id if len(playing_in_area) == 1 else None
+
+    playing = [p for p in players if p.state == PLAYING_STATE]
+    if playing:
+        return playing[0].entity_id if len(playing) == 1 else None
+
+    if len(in_area) == 1:
+        return in_area[0].entity_id
+    return None
+
+
+def _normalize(text: str) -> str:
+    text = text.lower().replace("'", "")
+    text = re.sub(r"[^\w\s]", " ", text)
+    text = re.sub(r"\s+", " ", text).strip()
+    text = re.sub(r"^(?:please )|(?: please)$", "", text)
+    return text.strip()
@@ -0,0 +1,123 @@
+"""LRU cache of Music Assistant search picks, so repeat requests skip the search."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+import logging
+import time
+from typing import Any, Callable
+
+from homeassistant.core import HomeAssistant, callback
+from custom_components.yury_smarthome.const import DATA_MUSIC_SEARCH_CACHE
+
+_LOGGER = logging.getLogger(__name__)
+
+MUSIC_ASSISTANT_DOMAIN = "music_assistant"
+MAX_ENTRIES = 256
+# Picked items keep their URI, so hits stay valid for long
+HIT_TTL = 6 * 3600  # seconds
+# Misses are retried sooner, the item may show up in a provider later
+MISS_TTL = 600  # seconds
+# Music Assistant events that change what a search returns
+LIBRARY_EVENTS = ("media_item_added", "media_item_updated", "media_item_deleted")
+
+SearchKey = tuple[str, str | None, str | None, str | None, bool]
+
+
+def search_key(
+    query: str,
+    media_type: str | None,
+    artist: str | None,
+    album: str | None,
+    library_only: bool,
+) -> SearchKey:
+    return (_normalize(query), media_type, _normalize(artist), _normalize(album), library_only)
+
+
+def _normalize(value: str | None) -> str | None:
+    return " ".join(value.lower().split()) if value else None
+
+
+class MusicSearchCache:
+    """Best pick per search, or None for a search that found nothing.
+
+    The whole cache is dropped when Music Assistant reports a library change
+    or when its config entry is reloaded and a new client appears.
+    """
+
+    hass: HomeAssistant
+    _entries: OrderedDict[SearchKey, tuple[float, dict | None]]  # key -> (expires, pick)
+
+    def __init__(self, hass: HomeAssistant):
+        self.hass = hass
+        self._entries = OrderedDict()
+        self._mass: Any = None
+        self._unsubscribe: Callable[[], None] | None = None
+
+    @callback
+    def async_shutdown(self):
+        """Unsubscribe from Music Assistant and drop the shared instance."""
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+        self._mass = None
+        self._entries.clear()
+        if self.hass.data.get(DATA_MUSIC_SEARCH_CACHE) is self:
+            del self.hass.data[DATA_MUSIC_SEARCH_CACHE]
+
+    def get(self, key: SearchKey) -> tuple[bool, dict | None]:
+        """(found, pick); pick is None for a cached miss."""
+        self._ensure_subscribed()
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires, pick = entry
+        if expires < time.monotonic():
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, pick
+
+    def set(self, key: SearchKey, pick: dict | None):
+        ttl = HIT_TTL if pick is not None else MISS_TTL
+        self._entries[key] = (time.monotonic() + ttl, pick)
+        self._entries.move_to_end(key)
+        while len(self._entries) > MAX_ENTRIES:
+            self._entries.popitem(last=False)
+
+    @callback
+    def async_invalidate(self, *_args):
+        if self._entries:
+            _LOGGER.debug("Music search cache cleared (%d entries)", len(self._entries))
+        self._entries.clear()
+
+    def _ensure_subscribed(self):
+        """Follow the current Music Assistant client, clearing on a new one."""
+        entries = self.hass.config_entries.async_entries(MUSIC_ASSISTANT_DOMAIN)
+        runtime_data = getattr(entries[0], "runtime_data", None) if entries else None
+        mass = getattr(runtime_data, "mass", None)
+        if mass is self._mass:
+            return
+
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+        self._mass = mass
+        self.async_invalidate()
+        if mass is None:
+            return
+        try:
+            self._unsubscribe = mass.subscribe(self.async_invalidate, LIBRARY_EVENTS)
+        except Exception as e:
+            # Older clients: rely on the TTLs alone
+            _LOGGER.debug(f"Cannot subscribe to Music Assistant library events: {e}")
+
+
+@callback
+def async_get_music_search_cache(hass: HomeAssistant) -> MusicSearchCache:
+    """Get the shared MusicSearchCache, creating it on first use."""
+    cache = hass.data.get(DATA_MUSIC_SEARCH_CACHE)
+    if cache is None:
+        cache = MusicSearchCache(hass)
+        hass.data[DATA_MUSIC_SEARCH_CACHE] = cache
+    return cache
@@ -1,11 +1,13 @@
 from .abstract_skill import AbstractSkill
 import os
-from jinja2 import Template
 from homeassistant.helpers import intent
 from homeassistant.components.conversation import ConversationInput
 from custom_components.yury_smarthome.qpl import QPLFlow
 from custom_components.yury_smarthome.maybe import maybe
 
+# General answers are free-form text, so leave more room than for JSON commands
+OTHER_RESPONSE_TOKENS = 1024
+
 
 class Other(AbstractSkill):
     def name(self) -> str:
@@ -24,7 +26,7 @@ class Other(AbstractSkill):
             # Send to LLM
             point = qpl_flow.mark_subspan_begin("sending_prompt_to_llm")
             maybe(point).annotate("prompt", prompt)
-            llm_response = await self.client.send_message(prompt)
+            llm_response = await self.client.send_message(prompt, qpl_flow)
             point = qpl_flow.mark_subspan_end("sending_prompt_to_llm")
             maybe(point).annotate("llm_response", llm_response)
 
@@ -42,12 +44,21 @@ class Other(AbstractSkill):
         qpl_flow.mark_subspan_begin("build_prompt")
 
         prompt_key = os.path.join(os.path.dirname(__file__), "other.md")
-        prompt_template = await self.prompt_cache.get(prompt_key, request.conversation_id)
-        template = Template(prompt_template, trim_blocks=True)
+        template = await self.prompt_cache.get(prompt_key)
+
+        budget = self.client.token_budgeter.create_budget(OTHER_RESPONSE_TOKENS)
+        budget.reserve("static_instructions", template.render(user_prompt=request.text))
+        conversation_history = self.prompt_cache.get_history(
+            request.conversation_id, budget
+        )
 
-        output = template.render(user_prompt=request.text)
+        output = template.render(
+            user_prompt=request.text,
+            conversation_history=conversation_history,
+        )
         point = qpl_flow.mark_subspan_end("build_prompt")
         maybe(point).annotate("prompt", output)
+        budget.annotate(point)
         return output
 
     async def undo(self, response: intent.IntentResponse, qpl_flow: QPLFlow):
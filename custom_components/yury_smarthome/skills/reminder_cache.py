@@ -0,0 +1,301 @@
+"""Per-calendar cache of upcoming reminders, kept current without blocking requests."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+import logging
+import time
+from typing import Callable
+
+from homeassistant.components.calendar import CalendarEntity
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.event import (
+    TrackStates,
+    async_track_state_change_filtered,
+)
+from homeassistant.util import dt as dt_util
+from custom_components.yury_smarthome.const import DATA_REMINDER_CACHE
+from .reminder_index import ReminderIndex
+from .reminder_occurrences import OccurrenceEngine
+
+_LOGGER = logging.getLogger(__name__)
+
+CALENDAR_DOMAIN = "calendar"
+# How far ahead reminders are loaded
+WINDOW = timedelta(days=30)
+# Cached reminders older than this are served once more while being refreshed
+MAX_AGE = 600  # seconds
+
+
+@dataclass
+class CalendarReminders:
+    reminders: list[dict] = field(default_factory=list)
+    fetched_at: float = 0.0
+    fetched_until: datetime | None = None  # End of the window the calendar was asked for
+    stale: bool = False
+    index: ReminderIndex | None = None  # Built on first lookup after a change
+
+
+class ReminderCache:
+    """Upcoming reminders per calendar with timezone-aware start/end datetimes.
+
+    The first request for a calendar loads it; later requests are served from
+    memory. The skill patches the cache in place after its own writes, and any
+    other calendar change triggers a background reload, so requests don't wait
+    for calendar I/O.
+    """
+
+    hass: HomeAssistant
+    _calendars: dict[str, CalendarReminders]
+
+    def __init__(self, hass: HomeAssistant):
+        self.hass = hass
+        self._calendars = {}
+        self._engine = OccurrenceEngine()
+        self._loads: dict[str, asyncio.Task] = {}
+        self._rerun: set[str] = set()  # Changed while a reload was in flight
+        # The skill's own writes during a reload, applied again on its result
+        self._patches: dict[str, list[Callable[[CalendarReminders], None]]] = {}
+        self._tracker = None
+        self._get_calendar_entity: Callable[[str], CalendarEntity | None] | None = None
+
+    @callback
+    def async_setup(self):
+        """Subscribe to calendar state changes."""
+        self._tracker = async_track_state_change_filtered(
+            self.hass,
+            TrackStates(False, set(), {CALENDAR_DOMAIN}),
+            self._async_calendar_changed,
+        )
+
+    @callback
+    def async_shutdown(self):
+        """Unsubscribe and drop the shared instance."""
+        if self._tracker is not None:
+            self._tracker.async_remove()
+            self._tracker = None
+        self._calendars = {}
+        self._engine.clear()
+        if self.hass.data.get(DATA_REMINDER_CACHE) is self:
+            del self.hass.data[DATA_REMINDER_CACHE]
+
+    @callback
+    def async_configure(self, get_calendar_entity: Callable[[str], CalendarEntity | None]):
+        self._get_calendar_entity = get_calendar_entity
+
+    @callback
+    def _async_calendar_changed(self, event: Event):
+        entity_id = event.data["entity_id"]
+        if event.data.get("new_state") is None:
+            self._calendars.pop(entity_id, None)
+            return
+        cached = self._calendars.get(entity_id)
+        if cached is not None:
+            cached.stale = True
+            self._async_refresh_in_background(entity_id)
+
+    async def async_get_reminders(self, calendar_id: str) -> tuple[list[dict], str]:
+        """Upcoming reminders, soonest first, and how they were served."""
+        cached = self._calendars.get(calendar_id)
+        if cached is None:
+            await self._async_wait_loaded(calendar_id)
+            cached = self._calendars.get(calendar_id)
+            return self._upcoming(cached), "miss"
+
+        if cached.stale or time.monotonic() - cached.fetched_at > MAX_AGE:
+            self._async_refresh_in_background(calendar_id)
+            return self._upcoming(cached), "stale"
+        return self._upcoming(cached), "hit"
+
+    async def async_get_occurrences(
+        self, calendar_id: str, start: datetime, end: datetime
+    ) -> list[dict] | None:
+        """Reminder occurrences starting in [start, end), soonest first.
+
+        Within the fetched window the calendar's own occurrences are used, so
+        edited or skipped instances stay correct; recurring reminders are
+        expanded locally beyond it. Unlike async_get_reminders this waits for
+        outdated data to be reloaded. None if the calendar couldn't be read.
+        """
+        cached = self._calendars.get(calendar_id)
+        if cached is None or cached.stale or time.monotonic() - cached.fetched_at > MAX_AGE:
+            await self._async_wait_loaded(calendar_id)
+            cached = self._calendars.get(calendar_id)
+            if cached is None:
+                return None
+
+        occurrences = {
+            (r.get("uid"), r["start"]): r
+            for r in cached.reminders
+            if start <= r["start"] < end
+        }
+        fetched_until = cached.fetched_until or end
+        if end > fetched_until:
+            series = {}
+            for reminder in cached.reminders:
+                rrule = reminder.get("rrule")
+                # With COUNT the anchor isn't the real DTSTART, so the tail is unknown
+                if rrule and "COUNT=" not in rrule.upper():
+                    series.setdefault(reminder.get("uid"), reminder)
+            for uid, first in series.items():
+                duration = first["end"] - first["start"] if first.get("end") else None
+                for occurrence_start in self._engine.expand(
+                    uid, first["rrule"], first["start"], max(start, fetched_until), end
+                ):
+                    occurrences.setdefault(
+                        (uid, occurrence_start),
+                        {
+                            **first,
+                            "start": occurrence_start,
+                            "end": occurrence_start + duration if duration else None,
+                        },
+                    )
+
+        return sorted(occurrences.values(), key=lambda r: r["start"])
+
+    def get_index(self, calendar_id: str) -> ReminderIndex | None:
+        """Match index over the cached reminders, None if the calendar isn't cached."""
+        cached = self._calendars.get(calendar_id)
+        if cached is None:
+            return None
+        if cached.index is None:
+            cached.index = ReminderIndex(cached.reminders)
+        return cached.index
+
+    def _upcoming(self, cached: CalendarReminders | None) -> list[dict]:
+        """Reminders that haven't ended yet."""
+        if cached is None:
+            return []
+        now = dt_util.now()
+        return [r for r in cached.reminders if r.get("end") is None or r["end"] >= now]
+
+    @callback
+    def async_add(self, calendar_id: str, reminder: dict):
+        """Add a reminder the skill just created."""
+        reminder = self._normalize(reminder)
+
+        def patch(cached: CalendarReminders):
+            key = (reminder.get("uid"), reminder["start"], reminder.get("summary"))
+            if any((r.get("uid"), r["start"], r.get("summary")) == key for r in cached.reminders):
+                return
+            cached.reminders.append(reminder)
+            cached.reminders.sort(key=lambda r: r["start"])
+            cached.index = None
+
+        self._async_patch(calendar_id, patch)
+        if reminder.get("rrule"):
+            # Later occurrences of the series come from the calendar itself
+            self._async_refresh_in_background(calendar_id)
+
+    @callback
+    def async_remove(self, calendar_id: str, uid: str):
+        """Remove all occurrences of a reminder the skill just deleted."""
+
+        def patch(cached: CalendarReminders):
+            cached.reminders = [r for r in cached.reminders if r.get("uid") != uid]
+            cached.index = None
+
+        self._async_patch(calendar_id, patch)
+
+    @callback
+    def _async_patch(
+        self, calendar_id: str, patch: Callable[[CalendarReminders], None]
+    ):
+        """Apply a write to the cache, and again to an in-flight load's result.
+
+        That load may have read the calendar before the write; the follow-up
+        reload then picks the write up from the calendar itself.
+        """
+        if calendar_id in self._loads:
+            self._patches.setdefault(calendar_id, []).append(patch)
+            self._rerun.add(calendar_id)
+        cached = self._calendars.get(calendar_id)
+        if cached is not None:
+            patch(cached)
+
+    def _async_refresh_in_background(self, calendar_id: str) -> asyncio.Task:
+        task = self._loads.get(calendar_id)
+        if task is not None:
+            self._rerun.add(calendar_id)
+            return task
+        task = self.hass.async_create_background_task(
+            self._async_load(calendar_id), f"yury_smarthome reminder cache {calendar_id}"
+        )
+        # Eagerly started tasks may already be finished here
+        if not task.done():
+            self._loads[calendar_id] = task
+        return task
+
+    async def _async_wait_loaded(self, calendar_id: str):
+        """Wait for the in-flight load of the calendar, starting one if needed."""
+        task = self._loads.get(calendar_id) or self._async_refresh_in_background(
+            calendar_id
+        )
+        # A cancelled request must not cancel the shared load
+        await asyncio.shield(task)
+
+    async def _async_load(self, calendar_id: str):
+        try:
+            calendar_entity = (
+                self._get_calendar_entity(calendar_id)
+                if self._get_calendar_entity
+                else None
+            )
+            if calendar_entity is None:
+                return
+
+            now = dt_util.now()
+            fetched_until = now + WINDOW
+            events = await calendar_entity.async_get_events(self.hass, now, fetched_until)
+            reminders = [
+                self._normalize(
+                    {
+                        "summary": event.summary or "",
+                        "start": event.start_datetime_local,
+                        "end": event.end_datetime_local,
+                        "uid": event.uid,
+                        "description": event.description or "",
+                        "rrule": getattr(event, "rrule", None),
+                    }
+                )
+                for event in events
+            ]
+            reminders.sort(key=lambda r: r["start"])
+            cached = CalendarReminders(
+                reminders=reminders,
+                fetched_at=time.monotonic(),
+                fetched_until=fetched_until,
+            )
+            for patch in self._patches.get(calendar_id, []):
+                patch(cached)
+            self._calendars[calendar_id] = cached
+            _LOGGER.debug("Cached %d reminders for %s", len(reminders), calendar_id)
+        except Exception as e:
+            _LOGGER.debug(f"Error loading reminders from {calendar_id}: {e}")
+        finally:
+            self._loads.pop(calendar_id, None)
+            self._patches.pop(calendar_id, None)
+            if calendar_id in self._rerun:
+                self._rerun.discard(calendar_id)
+                self._async_refresh_in_background(calendar_id)
+
+    def _normalize(self, reminder: dict) -> dict:
+        reminder = dict(reminder)
+        for key in ("start", "end"):
+            value = reminder.get(key)
+            if isinstance(value, datetime):
+                reminder[key] = dt_util.as_local(value)
+        return reminder
+
+
+@callback
+def async_get_reminder_cache(hass: HomeAssistant) -> ReminderCache:
+    """Get the shared ReminderCache, creating it on first use."""
+    cache = hass.data.get(DATA_REMINDER_CACHE)
+    if cache is None:
+        cache = ReminderCache(hass)
+        cache.async_setup()
+        hass.data[DATA_REMINDER_CACHE] = cache
+    return cache
@@ -0,0 +1,86 @@
+"""Persistent record of reminder occurrences that were already delivered."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import heapq
+import logging
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+from custom_components.yury_smarthome.const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_KEY = f"{DOMAIN}.notified_reminders"
+STORAGE_VERSION = 1
+SAVE_DELAY = 5
+# Occurrences are remembered this long after their start time
+RETENTION = timedelta(days=1)
+# Hard cap, the oldest occurrences by event time are evicted first
+MAX_ENTRIES = 1000
+
+
+class NotifiedReminders:
+    """Dedupe set keyed by calendar, uid and occurrence start, ordered by event time.
+
+    Lookups are O(1) through a dict; a min-heap on the occurrence start expires
+    entries in event-time order, so the oldest reminders are always forgotten
+    first regardless of when they were delivered.
+    """
+
+    hass: HomeAssistant
+    _entries: dict[str, float]  # key -> occurrence start timestamp
+    _heap: list[tuple[float, str]]
+
+    def __init__(self, hass: HomeAssistant):
+        self.hass = hass
+        self._entries = {}
+        self._heap = []
+        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+
+    async def async_load(self):
+        data = await self._store.async_load()
+        if not data:
+            return
+        for key, start in data.get("notified", {}).items():
+            self._entries[key] = start
+            self._heap.append((start, key))
+        heapq.heapify(self._heap)
+        self.expire()
+        _LOGGER.debug("Loaded %d notified reminders", len(self._entries))
+
+    async def async_save(self):
+        await self._store.async_save(self._data_to_save())
+
+    def _data_to_save(self) -> dict:
+        return {"notified": self._entries}
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, key: str, start: datetime):
+        if key in self._entries:
+            return
+        timestamp = start.timestamp()
+        self._entries[key] = timestamp
+        heapq.heappush(self._heap, (timestamp, key))
+        while len(self._entries) > MAX_ENTRIES:
+            _, oldest = heapq.heappop(self._heap)
+            self._entries.pop(oldest, None)
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def expire(self, now: datetime | None = None):
+        """Forget occurrences that started more than RETENTION ago."""
+        cutoff = ((now or dt_util.now()) - RETENTION).timestamp()
+        expired = False
+        while self._heap and self._heap[0][0] < cutoff:
+            _, key = heapq.heappop(self._heap)
+            self._entries.pop(key, None)
+            expired = True
+        if expired:
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
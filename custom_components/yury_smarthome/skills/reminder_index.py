@@ -0,0 +1,92 @@
+"""Token and start-date index over cached reminders, used to find what to edit or delete."""
+
+from __future__ import annotations
+
+from datetime import date, datetime
+import re
+
+# Words that don't identify a reminder
+STOPWORDS = {"a", "an", "the", "to", "my", "about", "for", "reminder", "reminders"}
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def summary_tokens(text: str | None) -> frozenset[str]:
+    """Normalized tokens of a reminder summary or a user's description of one."""
+    if not text:
+        return frozenset()
+    return frozenset(
+        token for token in _TOKEN_RE.findall(text.lower()) if token not in STOPWORDS
+    )
+
+
+class ReminderIndex:
+    """Looks up reminders by summary tokens and start date without scanning them all.
+
+    A reminder matches a summary when all query tokens appear in the reminder's
+    summary or, for short summaries, the other way round. Results keep the
+    order of the indexed list, which is sorted by start time.
+    """
+
+    _reminders: list[dict]
+    _tokens: list[frozenset[str]]
+    _by_token: dict[str, list[int]]
+    _by_date: dict[date, list[int]]
+
+    def __init__(self, reminders: list[dict]):
+        self._reminders = reminders
+        self._tokens = []
+        self._by_token = {}
+        self._by_date = {}
+        for position, reminder in enumerate(reminders):
+            tokens = summary_tokens(reminder.get("summary"))
+            self._tokens.append(tokens)
+            for token in tokens:
+                self._by_token.setdefault(token, []).append(position)
+            start = reminder.get("start")
+            if isinstance(start, datetime):
+                self._by_date.setdefault(start.date(), []).append(position)
+
+    def __len__(self) -> int:
+        return len(self._reminders)
+
+    def match(
+        self,
+        summary: str | None = None,
+        day: date | None = None,
+        now: datetime | None = None,
+    ) -> list[dict]:
+        """Reminders matching the summary and/or starting on the given day.
+
+        Reminders that ended before `now` are skipped.
+        """
+        positions: set[int] | None = None
+        if day is not None:
+            positions = set(self._by_date.get(day, []))
+
+        query = summary_tokens(summary)
+        if summary is not None:
+            if not query:
+                return []
+            # Every candidate shares at least one token with the query
+            candidates = set()
+            for token in query:
+                candidates.update(self._by_token.get(token, []))
+            candidates = {
+                position
+                for position in candidates
+                if query <= self._tokens[position] or self._tokens[position] <= query
+            }
+            positions = candidates if positions is None else positions & candidates
+
+        if positions is None:
+            positions = set(range(len(self._reminders)))
+
+        matches = []
+        for position in sorted(positions):
+            reminder = self._reminders[position]
+            end = reminder.get("end")
+            if now is not None and end is not None and end < now:
+                continue
+            matches.append(reminder)
+        return matches
@@ -0,0 +1,92 @@
+"""Local expansion of recurring reminders, so listing and scheduling don't query the calendar."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from datetime import datetime, time, timedelta, timezone
+import logging
+import re
+
+from dateutil.rrule import rrulestr
+
+_LOGGER = logging.getLogger(__name__)
+
+# Expansions remembered, least recently used are dropped first
+MAX_ENTRIES = 256
+
+UTC_UNTIL_RE = re.compile(r"UNTIL=(\d{8}T\d{6})Z", re.IGNORECASE)
+
+
+class OccurrenceEngine:
+    """Expands RRULEs with dateutil, memoized per series and window.
+
+    Windows are widened to whole days before expanding, so lookups with
+    slightly different bounds (e.g. a rolling "now") share one expansion.
+    Rules are expanded in the anchor's wall-clock time, matching how the
+    calendar treats local DTSTART/UNTIL values across DST changes; a UTC
+    UNTIL is converted to that wall-clock time first.
+    """
+
+    _memo: OrderedDict[tuple, list[datetime]]
+
+    def __init__(self):
+        self._memo = OrderedDict()
+
+    def expand(
+        self,
+        uid: str,
+        rrule: str,
+        anchor: datetime,
+        start: datetime,
+        end: datetime,
+    ) -> list[datetime]:
+        """Occurrence starts of the series in [start, end)."""
+        window_start = datetime.combine(start.date(), time.min, start.tzinfo)
+        window_end = datetime.combine(end.date() + timedelta(days=1), time.min, end.tzinfo)
+        key = (uid, rrule, anchor, window_start, window_end)
+
+        starts = self._memo.get(key)
+        if starts is None:
+            starts = self._expand(rrule, anchor, window_start, window_end)
+            self._memo[key] = starts
+            while len(self._memo) > MAX_ENTRIES:
+                self._memo.popitem(last=False)
+        else:
+            self._memo.move_to_end(key)
+
+        return [s for s in starts if start <= s < end]
+
+    def clear(self):
+        self._memo.clear()
+
+    def _expand(
+        self, rrule: str, anchor: datetime, start: datetime, end: datetime
+    ) -> list[datetime]:
+        tz = anchor.tzinfo
+        try:
+            rule = rrulestr(_local_until(rrule, tz), dtstart=_wall_clock(anchor, tz))
+            starts = rule.between(_wall_clock(start, tz), _wall_clock(end, tz), inc=True)
+        except (ValueError, TypeError) as e:
+            _LOGGER.debug(f"Cannot expand rrule {rrule}: {e}")
+            return []
+        return [s.replace(tzinfo=tz) for s in starts]
+
+
+def _wall_clock(dt: datetime, tz) -> datetime:
+    """Naive local time in the series' timezone."""
+    if tz is None or dt.tzinfo is None:
+        return dt.replace(tzinfo=None)
+    return dt.astimezone(tz).replace(tzinfo=None)
+
+
+def _local_until(rrule: str, tz) -> str:
+    """The rule with a UTC UNTIL as naive local time, for the naive DTSTART."""
+
+    def _convert(match: re.Match) -> str:
+        until = datetime.strptime(match.group(1), "%Y%m%dT%H%M%S").replace(
+            tzinfo=timezone.utc
+        )
+        local = until.astimezone(tz) if tz is not None else until.astimezone()
+        return f"UNTIL={local.strftime('%Y%m%dT%H%M%S')}"
+
+    return UTC_UNTIL_RE.sub(_convert, rrule)
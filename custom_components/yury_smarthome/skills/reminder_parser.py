@@ -0,0 +1,280 @@
+"""Local grammar for common reminder phrasings, so they don't need the LLM."""
+
+from __future__ import annotations
+
+import re
+
+WEEKDAYS = {
+    "monday": "MO",
+    "tuesday": "TU",
+    "wednesday": "WE",
+    "thursday": "TH",
+    "friday": "FR",
+    "saturday": "SA",
+    "sunday": "SU",
+}
+NUMBER_WORDS = {
+    "a": 1,
+    "an": 1,
+    "one": 1,
+    "two": 2,
+    "three": 3,
+    "four": 4,
+    "five": 5,
+    "six": 6,
+    "seven": 7,
+    "eight": 8,
+    "nine": 9,
+    "ten": 10,
+    "eleven": 11,
+    "twelve": 12,
+    "fifteen": 15,
+    "twenty": 20,
+    "thirty": 30,
+    "forty five": 45,
+}
+# Who "remind ..." refers to -> target understood by Reminders
+TARGETS = {
+    "me": "yury",
+    "us": "both",
+    "us both": "both",
+    "both of us": "both",
+    "her": "eugenia",
+    "my wife": "eugenia",
+    "eugenia": "eugenia",
+    "zhenya": "eugenia",
+}
+# Default time of day for parts of the day
+DAY_PARTS = {
+    "morning": "09:00",
+    "afternoon": "14:00",
+    "evening": "18:00",
+    "tonight": "20:00",
+}
+DEFAULT_TIME = "09:00"
+# A bare hour in these parts of the day is in the afternoon or evening
+PM_DAY_PARTS = {"afternoon", "evening", "tonight"}
+# Other bare hours from this one up to 11 are read as morning hours
+FIRST_AM_HOUR = 7
+
+_NUMBER = r"\d+|" + "|".join(
+    sorted((re.escape(word) for word in NUMBER_WORDS), key=len, reverse=True)
+)
+_WEEKDAY = "|".join(WEEKDAYS)
+_DAY_PART = "|".join(DAY_PARTS)
+
+PREFIX_RE = re.compile(
+    r"^(?:please )?(?:remind|set a reminder for) (?P<who>"
+    + "|".join(sorted(TARGETS, key=len, reverse=True))
+    + r")\b ?(?P<rest>.*)$"
+)
+RELATIVE_RE = re.compile(
+    rf"\bin (?:(?P<half>half an hour)|(?P<amount>{_NUMBER}) (?P<unit>minute|min|hour|day|week|month)s?"
+    rf"(?: and (?P<amount2>{_NUMBER}) (?P<unit2>minute|min)s?)?)\b"
+)
+EVERY_RE = re.compile(rf"\bevery (?P<every>day|morning|evening|week|month|{_WEEKDAY})s?\b")
+DAY_RE = re.compile(
+    r"\b(?:(?:this|tomorrow) (?P<part>morning|afternoon|evening)"
+    rf"|(?:on |next |this )?(?P<weekday>{_WEEKDAY})(?: (?P<wpart>morning|afternoon|evening))?"
+    r"|(?P<day>today|tomorrow|tonight))\b"
+)
+TIME_RE = re.compile(
+    r"\bat (?:(?P<hour>\d{1,2})(?::(?P<minute>\d{2}))?(?: ?(?P<ampm>am|pm))?|(?P<named>noon|midnight))\b"
+)
+LIST_RE = re.compile(
+    r"^(?:what|which|any|do i have any|list(?: my)?|show(?: me)?(?: my)?) ?"
+    r"(?:reminders|reminder)(?: do i| do we| have i| have we)?(?: have| got)?(?: set)?(?: for)? "
+    r"(?P<range>today|tomorrow|this week|next week|this month|next month)$"
+)
+SUMMARY_RE = re.compile(r"^(?:to|about|that) (?P<summary>.+)$")
+# Leftovers that mean the utterance had time information we didn't understand
+LEFTOVER_TIME_RE = re.compile(
+    rf"\b(?:at|on|in|every|next|until|from|after|before|\d+|{_WEEKDAY}|{_DAY_PART}|am|pm|oclock)\b"
+)
+
+UNIT_KEYS = {
+    "minute": "minutes",
+    "min": "minutes",
+    "hour": "hours",
+    "day": "days",
+    "week": "weeks",
+    "month": "months",
+}
+
+
+def parse_reminder_request(text: str) -> dict | None:
+    """Parse a reminder request into the create or list action the LLM would produce.
+
+    Returns None unless the text is an unambiguous "remind ... <time> ... to ..."
+    or "what reminders do I have <range>" request; everything else (updates,
+    deletes, vague times) goes to the LLM.
+    """
+    text = _normalize(text)
+    list_match = LIST_RE.match(text)
+    if list_match:
+        return {"action": "list", "range": list_match.group("range").replace(" ", "_")}
+
+    match = PREFIX_RE.match(text)
+    if not match:
+        return None
+    target = TARGETS[match.group("who")]
+    rest = match.group("rest")
+
+    found = {}
+    for name, regex in (
+        ("relative", RELATIVE_RE),
+        ("every", EVERY_RE),
+        ("day", DAY_RE),
+        ("time", TIME_RE),
+    ):
+        matches = list(regex.finditer(rest))
+        if len(matches) > 1:
+            return None
+        if matches:
+            found[name] = matches[0]
+            rest = rest[: matches[0].start()] + " " + rest[matches[0].end() :]
+
+    if not found:
+        # No time at all, the LLM decides whether this is a todo
+        return None
+    if "relative" in found and len(found) > 1:
+        return None
+
+    # Whatever is left must be the reminder text
+    rest = re.sub(r"\s+", " ", rest).strip()
+    summary_match = SUMMARY_RE.match(rest)
+    if not summary_match:
+        return None
+    summary = summary_match.group("summary").strip()
+    if not summary or LEFTOVER_TIME_RE.search(summary):
+        return None
+
+    if "relative" in found:
+        time_spec = _relative_time_spec(found["relative"])
+        recurrence = None
+    else:
+        parsed = _absolute_time_spec(found.get("day"), found.get("time"), found.get("every"))
+        if parsed is None:
+            return None
+        time_spec, recurrence = parsed
+
+    return {
+        "action": "create",
+        "summary": summary,
+        "target": target,
+        "time_spec": time_spec,
+        "recurrence": recurrence,
+    }
+
+
+def _normalize(text: str) -> str:
+    text = text.lower().replace("a.m.", "am").replace("p.m.", "pm").replace("'", "")
+    text = re.sub(r"[^\w\s:]", " ", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def _amount(value: str) -> int:
+    return NUMBER_WORDS[value] if value in NUMBER_WORDS else int(value)
+
+
+def _relative_time_spec(match: re.Match) -> dict:
+    if match.group("half"):
+        return {"type": "relative", "value": {"minutes": 30}}
+    value = {UNIT_KEYS[match.group("unit")]: _amount(match.group("amount"))}
+    if match.group("amount2"):
+        value["minutes"] = value.get("minutes", 0) + _amount(match.group("amount2"))
+    return {"type": "relative", "value": value}
+
+
+def _absolute_time_spec(
+    day: re.Match | None, time: re.Match | None, every: re.Match | None
+) -> tuple[dict, dict | None] | None:
+    day_value = "today"
+    default_time = DEFAULT_TIME
+    part = None  # Part of the day, tells which half of the clock a bare hour is in
+    recurrence = None
+
+    if day is not None:
+        if day.group("weekday"):
+            day_value = f"next_{day.group('weekday')}"
+            if day.group("wpart"):
+                part = day.group("wpart")
+                default_time = DAY_PARTS[part]
+        elif day.group("part"):
+            day_value = "tomorrow" if day.group(0).startswith("tomorrow") else "today"
+            part = day.group("part")
+            default_time = DAY_PARTS[part]
+        elif day.group("day") == "tonight":
+            part = "tonight"
+            default_time = DAY_PARTS[part]
+        else:
+            day_value = day.group("day")
+
+    if every is not None:
+        if day is not None:
+            # "every Monday ... tomorrow" and similar mixes go to the LLM
+            return None
+        period = every.group("every")
+        if period in WEEKDAYS:
+            day_value = f"next_{period}"
+            recurrence = _recurrence("weekly", [WEEKDAYS[period]])
+        elif period == "week":
+            recurrence = _recurrence("weekly")
+        elif period == "month":
+            recurrence = _recurrence("monthly")
+        else:
+            if period in DAY_PARTS:
+                part = period
+                default_time = DAY_PARTS[period]
+            recurrence = _recurrence("daily")
+
+    if day_value == "today" and time is None and part is None and recurrence is None:
+        # "today" at the default time may be over already, the LLM decides
+        return None
+
+    time_value = default_time
+    if time is not None:
+        time_value = _time_of_day(time, part, day is not None or every is not None)
+        if time_value is None:
+            return None
+
+    return {"type": "absolute", "value": {"day": day_value, "time": time_value}}, recurrence
+
+
+def _time_of_day(match: re.Match, part: str | None, dated: bool) -> str | None:
+    named = match.group("named")
+    if named:
+        return "12:00" if named == "noon" else "00:00"
+
+    hour = int(match.group("hour"))
+    minute = int(match.group("minute") or 0)
+    ampm = match.group("ampm")
+    if minute > 59:
+        return None
+    if ampm:
+        if hour < 1 or hour > 12:
+            return None
+        hour = hour % 12 + (12 if ampm == "pm" else 0)
+    elif 1 <= hour <= 11 and part in PM_DAY_PARTS:
+        hour += 12
+    elif 1 <= hour <= 11 and part == "morning":
+        pass
+    elif FIRST_AM_HOUR <= hour <= 12 and dated and part not in PM_DAY_PARTS:
+        # "tomorrow at 9" is a morning, "today at 12" is noon. A bare "at 7"
+        # may already be past this morning, so without a day the LLM decides
+        pass
+    elif hour < 13 or hour > 23:
+        # "at 3" could be at night or in the afternoon, the LLM decides
+        return None
+    return f"{hour:02d}:{minute:02d}"
+
+
+def _recurrence(frequency: str, byday: list[str] | None = None) -> dict:
+    return {
+        "frequency": frequency,
+        "interval": 1,
+        "count": None,
+        "until": None,
+        "byday": byday,
+        "bymonthday": None,
+    }
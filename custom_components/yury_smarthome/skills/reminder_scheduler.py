@@ -0,0 +1,357 @@
+"""Fires reminder notifications at the moment each tagged calendar event is due."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import logging
+from typing import Awaitable, Callable
+
+from homeassistant.components.calendar import CalendarEntity
+from homeassistant.core import Event, HomeAssistant, State, callback
+from homeassistant.helpers.event import (
+    TrackStates,
+    async_call_later,
+    async_track_point_in_time,
+    async_track_state_change_filtered,
+    async_track_time_interval,
+)
+from homeassistant.util import dt as dt_util
+from custom_components.yury_smarthome.const import (
+    CALENDAR_KEYWORDS,
+    CONF_REMINDER_CALENDAR,
+    DATA_REMINDER_SCHEDULER,
+    DOMAIN,
+    REMINDER_HASHTAG_PREFIX,
+)
+from custom_components.yury_smarthome.selection_cache import get_selection_cache
+from .reminder_cache import async_get_reminder_cache
+from .reminder_dedupe import NotifiedReminders
+
+_LOGGER = logging.getLogger(__name__)
+
+CALENDAR_DOMAIN = "calendar"
+# How far ahead occurrences are indexed and armed
+HORIZON = timedelta(hours=6)
+# How often the horizon is rolled forward
+REFRESH_INTERVAL = timedelta(hours=1)
+# Reminders that became due this recently are still delivered, e.g. after a restart
+GRACE = timedelta(minutes=1)
+# Calendar changes often come in bursts, so refreshes are batched
+REFRESH_DELAY = 2
+# Reminders becoming due this close together are delivered as one batch
+COALESCE_WINDOW = 5  # seconds
+
+
+@dataclass(frozen=True)
+class ReminderOccurrence:
+    calendar_id: str
+    uid: str | None
+    start: datetime
+    summary: str
+    description: str
+
+    @property
+    def key(self) -> str:
+        """Identifies a single occurrence of a possibly recurring reminder."""
+        return f"{self.calendar_id}:{self.uid}:{self.start.isoformat()}"
+
+
+class ReminderScheduler:
+    """Index of upcoming #remind: occurrences with a point-in-time trigger each.
+
+    The index covers a rolling horizon. It is refreshed per calendar when the
+    calendar's state changes or the Reminders skill edits it, and for all
+    calendars once per REFRESH_INTERVAL, instead of polling every minute.
+    """
+
+    hass: HomeAssistant
+    _occurrences: dict[str, ReminderOccurrence]
+    _triggers: dict[str, Callable[[], None]]
+    _fired: NotifiedReminders
+
+    def __init__(self, hass: HomeAssistant):
+        self.hass = hass
+        self._occurrences = {}
+        self._triggers = {}
+        self._fired = NotifiedReminders(hass)
+        self._loaded = False
+        self._pending: set[str] = set()
+        # Calendars the Reminders skill wrote to, whatever their name
+        self._written: set[str] = set()
+        self._refresh_all_pending = False
+        self._cancel_refresh: Callable[[], None] | None = None
+        self._due_batch: list[ReminderOccurrence] = []
+        self._cancel_flush: Callable[[], None] | None = None
+        self._unsubscribers: list[Callable[[], None]] = []
+        self._tracker = None
+        self._get_calendar_entity: Callable[[str], CalendarEntity | None] | None = None
+        self._on_due: Callable[[list[ReminderOccurrence]], Awaitable[set[str]]] | None = None
+
+    @callback
+    def async_setup(self):
+        """Subscribe to calendar state changes and the periodic horizon roll."""
+        self._tracker = async_track_state_change_filtered(
+            self.hass,
+            TrackStates(False, set(), {CALENDAR_DOMAIN}),
+            self._async_calendar_changed,
+        )
+        self._unsubscribers.append(
+            async_track_time_interval(
+                self.hass, self._async_roll_horizon, REFRESH_INTERVAL
+            )
+        )
+
+    async def async_load(self):
+        """Load the record of already delivered reminders, once per instance."""
+        if self._loaded:
+            return
+        self._loaded = True
+        await self._fired.async_load()
+
+    @callback
+    def async_shutdown(self):
+        """Cancel all triggers and subscriptions and drop the shared instance."""
+        if self._tracker is not None:
+            self._tracker.async_remove()
+            self._tracker = None
+        for unsubscribe in self._unsubscribers:
+            unsubscribe()
+        self._unsubscribers = []
+        if self._cancel_refresh is not None:
+            self._cancel_refresh()
+            self._cancel_refresh = None
+        if self._cancel_flush is not None:
+            self._cancel_flush()
+            self._cancel_flush = None
+        # Not recorded as delivered, so the refresh after a reload still finds
+        # them within GRACE and delivers them then
+        self._due_batch = []
+        for cancel in self._triggers.values():
+            cancel()
+        self._triggers = {}
+        self._occurrences = {}
+        if self.hass.data.get(DATA_REMINDER_SCHEDULER) is self:
+            del self.hass.data[DATA_REMINDER_SCHEDULER]
+
+    @callback
+    def async_configure(
+        self,
+        get_calendar_entity: Callable[[str], CalendarEntity | None],
+        on_due: Callable[[list[ReminderOccurrence]], Awaitable[set[str]]],
+    ):
+        """Set how calendars are resolved and who delivers due reminders.
+
+        The latest Reminders skill wins, so each reminder is delivered once.
+        Reminders that become due within COALESCE_WINDOW of each other are
+        handed over together; on_due returns the keys of those it delivered.
+        """
+        first = self._on_due is None
+        self._get_calendar_entity = get_calendar_entity
+        self._on_due = on_due
+        if first:
+            self.async_request_refresh()
+
+    @callback
+    def async_request_refresh(self, calendar_id: str | None = None):
+        """Re-read one calendar, or all reminder calendars, shortly."""
+        if calendar_id is None:
+            self._refresh_all_pending = True
+        else:
+            self._pending.add(calendar_id)
+            self._written.add(calendar_id)
+        if self._cancel_refresh is None:
+            self._cancel_refresh = async_call_later(
+                self.hass, REFRESH_DELAY, self._async_run_refresh
+            )
+
+    @property
+    def occurrences(self) -> list[ReminderOccurrence]:
+        return sorted(self._occurrences.values(), key=lambda o: o.start)
+
+    def _reminder_calendar_ids(self) -> set[str]:
+        """Calendars holding reminders even if their name has no CALENDAR_KEYWORDS.
+
+        Pinned in an agent's options, picked by the LLM, or written to since start.
+        """
+        calendar_ids = set(self._written)
+        for entry in self.hass.config_entries.async_entries(DOMAIN):
+            for data in (entry.data, *(sub.data for sub in entry.subentries.values())):
+                if data.get(CONF_REMINDER_CALENDAR):
+                    calendar_ids.add(data[CONF_REMINDER_CALENDAR])
+        selection_cache = get_selection_cache(self.hass)
+        if selection_cache is not None and selection_cache.last("reminder_calendar"):
+            calendar_ids.add(selection_cache.last("reminder_calendar"))
+        return calendar_ids
+
+    def _is_reminder_calendar(
+        self, state: State, calendar_ids: set[str] | None = None
+    ) -> bool:
+        if state.entity_id in (
+            calendar_ids if calendar_ids is not None else self._reminder_calendar_ids()
+        ):
+            return True
+        entity_lower = state.entity_id.lower()
+        name_lower = state.name.lower() if state.name else ""
+        return any(
+            kw.lower() in entity_lower or kw.lower() in name_lower
+            for kw in CALENDAR_KEYWORDS
+        )
+
+    @callback
+    def _async_calendar_changed(self, event: Event):
+        new_state = event.data.get("new_state")
+        if new_state is None:
+            self._written.discard(event.data["entity_id"])
+            self._drop_calendar(event.data["entity_id"])
+        elif self._is_reminder_calendar(new_state):
+            self.async_request_refresh(new_state.entity_id)
+
+    @callback
+    def _async_roll_horizon(self, now: datetime):
+        self.async_request_refresh()
+
+    async def _async_run_refresh(self, _now: datetime):
+        self._cancel_refresh = None
+        if self._refresh_all_pending:
+            reminder_calendar_ids = self._reminder_calendar_ids()
+            calendar_ids = {
+                state.entity_id
+                for state in self.hass.states.async_all(CALENDAR_DOMAIN)
+                if self._is_reminder_calendar(state, reminder_calendar_ids)
+            }
+        else:
+            calendar_ids = set(self._pending)
+        self._pending = set()
+        self._refresh_all_pending = False
+
+        self._fired.expire()
+        for calendar_id in calendar_ids:
+            await self._async_refresh_calendar(calendar_id)
+
+    async def _async_refresh_calendar(self, calendar_id: str):
+        if self._get_calendar_entity is None:
+            return
+        calendar_entity = self._get_calendar_entity(calendar_id)
+        if calendar_entity is None:
+            self._drop_calendar(calendar_id)
+            return
+
+        # Occurrences come from the shared reminder cache, which expands
+        # recurring reminders locally instead of querying the calendar again
+        now = dt_util.now()
+        reminders = await async_get_reminder_cache(self.hass).async_get_occurrences(
+            calendar_id, now - GRACE, now + HORIZON
+        )
+        if reminders is None:
+            _LOGGER.debug(f"Error reading calendar {calendar_id}")
+            return
+
+        batched = {occurrence.key for occurrence in self._due_batch}
+        occurrences = {}
+        for reminder in reminders:
+            description = reminder.get("description") or ""
+            if REMINDER_HASHTAG_PREFIX not in description:
+                continue
+            occurrence = ReminderOccurrence(
+                calendar_id=calendar_id,
+                uid=reminder.get("uid"),
+                start=reminder["start"],
+                summary=reminder.get("summary") or "Reminder",
+                description=description,
+            )
+            if occurrence.key not in self._fired and occurrence.key not in batched:
+                occurrences[occurrence.key] = occurrence
+
+        # Diff against the current index, so unchanged occurrences keep their trigger.
+        # In-place edits keep the key, so changed text or targets re-arm it
+        for key in [
+            key
+            for key, occurrence in self._occurrences.items()
+            if occurrence.calendar_id == calendar_id and key not in occurrences
+        ]:
+            self._disarm(key)
+        for key, occurrence in occurrences.items():
+            if self._occurrences.get(key) != occurrence:
+                self._disarm(key)
+                self._arm(occurrence)
+
+        _LOGGER.debug(
+            "Reminder scheduler indexed %d occurrences for %s", len(occurrences), calendar_id
+        )
+
+    def _arm(self, occurrence: ReminderOccurrence):
+        key = occurrence.key
+
+        @callback
+        def _async_due(_now: datetime):
+            self._triggers.pop(key, None)
+            due = self._occurrences.pop(key, None)
+            if due is None or key in self._fired:
+                return
+            # Recorded as delivered once on_due reports it sent
+            self._due_batch.append(due)
+            if self._cancel_flush is None:
+                self._cancel_flush = async_call_later(
+                    self.hass, COALESCE_WINDOW, self._async_flush_due
+                )
+
+        self._occurrences[key] = occurrence
+        self._triggers[key] = async_track_point_in_time(
+            self.hass, _async_due, occurrence.start
+        )
+
+    @callback
+    def _async_flush_due(self, _now: datetime):
+        self._cancel_flush = None
+        batch, self._due_batch = self._due_batch, []
+        if not batch or self._on_due is None:
+            return
+        self.hass.async_create_task(self._async_deliver(self._on_due, batch))
+
+    async def _async_deliver(
+        self,
+        on_due: Callable[[list[ReminderOccurrence]], Awaitable[set[str]]],
+        batch: list[ReminderOccurrence],
+    ):
+        try:
+            delivered = await on_due(batch)
+        except Exception:
+            _LOGGER.exception("Failed to deliver due reminders")
+            delivered = set()
+
+        failed_calendars = set()
+        for occurrence in batch:
+            if occurrence.key in delivered:
+                self._fired.add(occurrence.key, occurrence.start)
+            else:
+                failed_calendars.add(occurrence.calendar_id)
+        # Undelivered reminders are armed again while they are within GRACE
+        if self._tracker is not None:
+            for calendar_id in failed_calendars:
+                self.async_request_refresh(calendar_id)
+
+    def _disarm(self, key: str):
+        self._occurrences.pop(key, None)
+        cancel = self._triggers.pop(key, None)
+        if cancel is not None:
+            cancel()
+
+    def _drop_calendar(self, calendar_id: str):
+        for key in [
+            key
+            for key, occurrence in self._occurrences.items()
+            if occurrence.calendar_id == calendar_id
+        ]:
+            self._disarm(key)
+
+
+@callback
+def async_get_reminder_scheduler(hass: HomeAssistant) -> ReminderScheduler:
+    """Get the shared ReminderScheduler, creating it on first use."""
+    scheduler = hass.data.get(DATA_REMINDER_SCHEDULER)
+    if scheduler is None:
+        scheduler = ReminderScheduler(hass)
+        scheduler.async_setup()
+        hass.data[DATA_REMINDER_SCHEDULER] = scheduler
+    return scheduler
@@ -1,4 +1,5 @@
 from .abstract_skill import AbstractSkill
+import asyncio
 import json
 import os
 import logging
@@ -8,31 +9,39 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 from dateutil.relativedelta import relativedelta
-from jinja2 import Template
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import intent
 from homeassistant.components.conversation import ConversationInput
-from homeassistant.components.calendar import CalendarEntity
+from homeassistant.components.calendar import CalendarEntity, CalendarEntityFeature
 from homeassistant.components.todo.intent import INTENT_LIST_ADD_ITEM
 from custom_components.yury_smarthome.entity import LocalLLMEntity
 from custom_components.yury_smarthome.prompt_cache import PromptCache
 from custom_components.yury_smarthome.qpl import QPL, QPLFlow
 from custom_components.yury_smarthome.maybe import maybe
+from custom_components.yury_smarthome.const import (
+    CALENDAR_KEYWORDS,
+    CONF_REMINDER_CALENDAR,
+    NOTIFICATION_TARGETS,
+    REMINDER_HASHTAG_PREFIX,
+)
+from custom_components.yury_smarthome.notify_targets import (
+    RESULT_SENT,
+    async_get_notify_target_index,
+)
+from custom_components.yury_smarthome.selection_cache import get_selection_cache
+from .calendar_entities import async_get_calendar_entity_cache
+from .reminder_cache import async_get_reminder_cache
+from .reminder_index import ReminderIndex
+from .reminder_parser import parse_reminder_request
+from .reminder_scheduler import ReminderOccurrence, async_get_reminder_scheduler
 import traceback
 
 _LOGGER = logging.getLogger(__name__)
 
-# Keywords to match notification targets by person
-NOTIFICATION_TARGETS = {
-    "yury": ["yury_dymov", "delorean"],
-    "eugenia": ["eugenia", "zhenya"],
-}
-
-# Keywords to match preferred calendar
-CALENDAR_KEYWORDS = ["yury", "local"]
-
-# Hashtag prefix for reminder notifications
-REMINDER_HASHTAG_PREFIX = "#remind:"
+# Calendar deletes running at once during bulk delete and undo
+DELETE_PARALLELISM = 4
+# Reminders read out when listing, the rest are only counted
+LIST_SPOKEN_LIMIT = 5
 
 
 @dataclass
@@ -47,7 +56,6 @@ class Reminders(AbstractSkill):
     last_calendar_id: str | None
     inbox_tasks_skill: "AbstractSkill | None"
     qpl_provider: QPL
-    _listener_registered: bool = False
 
     def __init__(
         self,
@@ -61,81 +69,48 @@ class Reminders(AbstractSkill):
         self.last_calendar_id = None
         self.inbox_tasks_skill = None
         self.qpl_provider = qpl_provider
+        # Reminder requests seen and how many of them skipped the LLM
+        self._requests_seen = 0
+        self._fast_path_hits = 0
         self._register_calendar_listener()
 
     def _register_calendar_listener(self):
-        """Register periodic check for reminder notifications."""
-        if Reminders._listener_registered:
-            return
-
-        # Track which events we've already notified to avoid duplicates
-        notified_events: set[str] = set()
-
-        async def _check_upcoming_reminders(*args):
-            """Check calendars for upcoming reminders with our hashtag."""
-            now = self._get_current_time()
-            check_window_start = now - timedelta(minutes=1)
-            check_window_end = now + timedelta(minutes=2)
-
-            # Find calendars matching our keywords
-            for state in self.hass.states.async_all():
-                if not state.entity_id.startswith("calendar."):
-                    continue
-
-                entity_lower = state.entity_id.lower()
-                name_lower = state.name.lower() if state.name else ""
-
-                # Only check calendars matching our keywords
-                matches_keyword = any(
-                    kw.lower() in entity_lower or kw.lower() in name_lower
-                    for kw in CALENDAR_KEYWORDS
-                )
-                if not matches_keyword:
-                    continue
-
-                try:
-                    calendar_entity = self._get_calendar_entity(state.entity_id)
-                    if calendar_entity is None:
-                        continue
-
-                    events = await calendar_entity.async_get_events(
-                        self.hass, check_window_start, check_window_end
-                    )
-
-                    for event in events:
-                        # Create unique key for this event instance
-                        event_key = f"{state.entity_id}:{event.uid}:{event.start}"
-
-                        # Skip if already notified
-                        if event_key in notified_events:
-                            continue
-
-                        # Check if event has our hashtag in description
-                        description = event.description or ""
-                        targets = self._decode_reminder_hashtag(description)
-
-                        if targets:
-                            summary = event.summary or "Reminder"
-                            _LOGGER.info(f"Reminder due: {summary}, targets: {targets}")
-                            await self._send_reminder_notification(summary, targets)
-                            notified_events.add(event_key)
-
-                            # Clean up old entries (keep last 100)
-                            if len(notified_events) > 100:
-                                # Remove oldest entries
-                                to_remove = list(notified_events)[:50]
-                                for key in to_remove:
-                                    notified_events.discard(key)
-
-                except Exception as e:
-                    _LOGGER.debug(f"Error checking calendar {state.entity_id}: {e}")
+        """Hand due reminder occurrences from the shared scheduler to this skill."""
+        self._calendar_entities = async_get_calendar_entity_cache(self.hass)
+        self._scheduler = async_get_reminder_scheduler(self.hass)
+        self._scheduler.async_configure(
+            self._get_calendar_entity, self._on_reminders_due
+        )
+        self._reminder_cache = async_get_reminder_cache(self.hass)
+        self._reminder_cache.async_configure(self._get_calendar_entity)
+        _LOGGER.debug("Reminder scheduler configured")
 
-        # Check every minute
-        from homeassistant.helpers.event import async_track_time_interval
+    async def _on_reminders_due(self, occurrences: list[ReminderOccurrence]) -> set[str]:
+        """Notify the targets encoded in reminders that are due now.
 
-        async_track_time_interval(self.hass, _check_upcoming_reminders, timedelta(minutes=1))
-        Reminders._listener_registered = True
-        _LOGGER.debug("Reminder check scheduler registered")
+        Each target gets one notification listing all of its due reminders.
+        Returns the keys of the occurrences that reached at least one target,
+        or that have no target to notify.
+        """
+        summaries_by_target: dict[str, list[str]] = {}
+        targets_by_key: dict[str, list[str]] = {}
+        for occurrence in occurrences:
+            targets = self._decode_reminder_hashtag(occurrence.description)
+            targets_by_key[occurrence.key] = targets or []
+            if not targets:
+                continue
+            _LOGGER.info(f"Reminder due: {occurrence.summary}, targets: {targets}")
+            for target in targets:
+                summaries_by_target.setdefault(target, []).append(occurrence.summary)
+
+        sent = set()
+        if summaries_by_target:
+            sent = await self._send_reminder_notifications(summaries_by_target)
+        return {
+            key
+            for key, targets in targets_by_key.items()
+            if not targets or any(target in sent for target in targets)
+        }
 
     def _encode_reminder_hashtag(self, targets: list[str]) -> str:
         """Encode notification targets as a hashtag suffix.
@@ -183,146 +158,113 @@ class Reminders(AbstractSkill):
         if "both" in target_persons:
             target_persons = ["yury", "eugenia"]
 
-        # Collect keywords for all specified persons
-        keywords = []
-        for person in target_persons:
-            person_lower = person.lower()
-            if person_lower in NOTIFICATION_TARGETS:
-                keywords.extend(NOTIFICATION_TARGETS[person_lower])
-
-        if not keywords:
+        persons = [p.lower() for p in target_persons if p.lower() in NOTIFICATION_TARGETS]
+        if not persons:
             # Fallback to Yury if no valid persons specified
-            keywords = NOTIFICATION_TARGETS["yury"]
-
-        targets = []
-
-        # Get all available services
-        services = self.hass.services.async_services()
-        notify_services = services.get("notify", {})
-
-        for service_name in notify_services:
-            service_lower = service_name.lower()
-            for keyword in keywords:
-                if keyword.lower() in service_lower:
-                    targets.append(f"notify.{service_name}")
-                    break
+            persons = ["yury"]
 
+        targets = async_get_notify_target_index(self.hass).get_targets(persons)
         if targets:
-            _LOGGER.debug(f"Found notification targets for {target_persons}: {targets}")
+            _LOGGER.debug(f"Found notification targets for {persons}: {targets}")
         else:
-            _LOGGER.warning(
-                f"No notification targets found matching keywords: {keywords}"
-            )
+            _LOGGER.warning(f"No notification targets found for: {persons}")
 
         return targets
 
-    async def _send_reminder_notification(self, summary: str, targets: list[str]):
-        """Send notification for a triggered reminder."""
+    async def _send_reminder_notifications(
+        self, summaries_by_target: dict[str, list[str]]
+    ) -> set[str]:
+        """Send one notification per target for its triggered reminders.
+
+        Returns the targets that were notified.
+        """
         qpl_flow = self.qpl_provider.create_flow("reminder_notification")
         point = qpl_flow.mark_subspan_begin("send_reminder_notification")
-        maybe(point).annotate("summary", summary)
-        maybe(point).annotate("targets", str(targets))
+        maybe(point).annotate("summaries_by_target", json.dumps(summaries_by_target))
 
-        message = f"Reminder: {summary}"
-        did_sent_at_least_once = False
-        yury_was_notified = False
+        messages = {}
+        for target, summaries in summaries_by_target.items():
+            if len(summaries) == 1:
+                messages[target] = {"message": f"Reminder: {summaries[0]}", "title": "Reminder"}
+            else:
+                messages[target] = {
+                    "message": "Reminders: " + ", ".join(summaries),
+                    "title": f"{len(summaries)} reminders",
+                }
 
-        for target in targets:
-            try:
-                point = qpl_flow.mark_subspan_begin("send_to_target")
-                # Extract service name (notify.xxx -> xxx)
-                service_name = target.replace("notify.", "")
-                maybe(point).annotate("service_name", service_name)
-                maybe(point).annotate("message", message)
-                await self.hass.services.async_call(
-                    "notify",
-                    service_name,
-                    {
-                        "message": message,
-                        "title": "Reminder",
-                    },
-                    blocking=False,
-                )
-                did_sent_at_least_once = True
-                qpl_flow.mark_subspan_end("send_to_target")
-                _LOGGER.info(f"Reminder notification sent to {target}: {message}")
-
-                # Check if this target is Yury
-                target_lower = target.lower()
-                for yury_keyword in NOTIFICATION_TARGETS.get("yury", []):
-                    if yury_keyword.lower() in target_lower:
-                        yury_was_notified = True
-                        break
-            except Exception as e:
-                point = qpl_flow.mark_subspan_end("send_to_target")
-                err = f"Failed to send notification to {target}: {e}"
-                maybe(point).annotate("error", err)
-                _LOGGER.warning(err)
-
-        # Add to todo list if Yury was notified
-        if yury_was_notified:
-            await self._add_reminder_to_todo(summary, qpl_flow)
-
-        qpl_flow.mark_subspan_end("send_reminder_notification")
-        if did_sent_at_least_once:
+        index = async_get_notify_target_index(self.hass)
+        results = await index.async_send(messages, qpl_flow)
+        sent = [target for target, result in results.items() if result == RESULT_SENT]
+
+        # Add to todo list what Yury was notified about
+        todo_summaries = list(
+            dict.fromkeys(
+                summary
+                for target in sent
+                if index.person_for(target) == "yury"
+                for summary in summaries_by_target[target]
+            )
+        )
+        if todo_summaries:
+            await self._add_reminders_to_todo(todo_summaries, qpl_flow)
+
+        point = qpl_flow.mark_subspan_end("send_reminder_notification")
+        maybe(point).annotate("sent_count", len(sent))
+        if sent:
             qpl_flow.mark_success()
         else:
             qpl_flow.mark_failed("failed to notify")
+        return set(sent)
 
-    async def _add_reminder_to_todo(self, summary: str, qpl_flow: QPLFlow):
-        """Add a fired reminder to the todo list."""
+    async def _add_reminders_to_todo(self, summaries: list[str], qpl_flow: QPLFlow):
+        """Add fired reminders to the todo list, resolving the list once."""
         point = qpl_flow.mark_subspan_begin("add_reminder_to_todo")
-        maybe(point).annotate("summary", summary)
-
-        try:
-            # Find a todo list (prefer one with "inbox" or "tasks" in the name)
-            todo_entity_id = None
-            for state in self.hass.states.async_all():
-                if not state.entity_id.startswith("todo."):
-                    continue
-                entity_lower = state.entity_id.lower()
-                name_lower = (state.name or "").lower()
-                if "inbox" in entity_lower or "inbox" in name_lower:
-                    todo_entity_id = state.entity_id
-                    break
-                if "task" in entity_lower or "task" in name_lower:
-                    todo_entity_id = state.entity_id
-                    # Don't break, keep looking for "inbox"
-
-            if not todo_entity_id:
-                # Just use the first todo list
-                for state in self.hass.states.async_all():
-                    if state.entity_id.startswith("todo."):
-                        todo_entity_id = state.entity_id
-                        break
-
-            if not todo_entity_id:
-                _LOGGER.warning("No todo list found for adding reminder")
-                qpl_flow.mark_subspan_end("add_reminder_to_todo")
-                return
-
-            maybe(point).annotate("todo_entity_id", todo_entity_id)
-
-            # Use the intent system to add the item
-            intent_item = intent.Intent(
-                self.hass,
-                "yury",
-                INTENT_LIST_ADD_ITEM,
-                {"name": {"value": todo_entity_id}, "item": {"value": summary}},
-                None,
-                intent.Context(),
-                "en",
+        maybe(point).annotate("summaries", json.dumps(summaries))
+
+        # Find a todo list (prefer one with "inbox" or "tasks" in the name)
+        todo_entity_id = None
+        for state in self.hass.states.async_all("todo"):
+            entity_lower = state.entity_id.lower()
+            name_lower = (state.name or "").lower()
+            if "inbox" in entity_lower or "inbox" in name_lower:
+                todo_entity_id = state.entity_id
+                break
+            if todo_entity_id is None and ("task" in entity_lower or "task" in name_lower):
+                todo_entity_id = state.entity_id
+                # Don't break, keep looking for "inbox"
+
+        if not todo_entity_id:
+            # Just use the first todo list
+            todo_entity_id = next(
+                (state.entity_id for state in self.hass.states.async_all("todo")), None
             )
 
-            handler = self.hass.data.get(intent.DATA_KEY, {}).get(INTENT_LIST_ADD_ITEM)
-            if handler:
-                await handler.async_handle(intent_item)
-                _LOGGER.info(f"Added reminder to todo list: {summary}")
-            else:
-                _LOGGER.warning("No handler found for INTENT_LIST_ADD_ITEM")
-
-        except Exception as e:
-            _LOGGER.warning(f"Failed to add reminder to todo list: {e}")
+        handler = self.hass.data.get(intent.DATA_KEY, {}).get(INTENT_LIST_ADD_ITEM)
+        if not todo_entity_id:
+            _LOGGER.warning("No todo list found for adding reminder")
+        elif not handler:
+            _LOGGER.warning("No handler found for INTENT_LIST_ADD_ITEM")
+        else:
+            maybe(point).annotate("todo_entity_id", todo_entity_id)
+            added = 0
+            for summary in summaries:
+                # Use the intent system to add the item
+                intent_item = intent.Intent(
+                    self.hass,
+                    "yury",
+                    INTENT_LIST_ADD_ITEM,
+                    {"name": {"value": todo_entity_id}, "item": {"value": summary}},
+                    None,
+                    intent.Context(),
+                    "en",
+                )
+                try:
+                    await handler.async_handle(intent_item)
+                    added += 1
+                    _LOGGER.info(f"Added reminder to todo list: {summary}")
+                except Exception as e:
+                    _LOGGER.warning(f"Failed to add reminder to todo list: {e}")
+            maybe(point).annotate("added_count", added)
 
         qpl_flow.mark_subspan_end("add_reminder_to_todo")
 
@@ -333,6 +275,72 @@ class Reminders(AbstractSkill):
     def name(self) -> str:
         return "Reminders"
 
+    async def try_fast_path(
+        self,
+        request: ConversationInput,
+        response: intent.IntentResponse,
+        qpl_flow: QPLFlow,
+    ) -> bool:
+        json_data = self._parse_locally(request, qpl_flow)
+        if json_data is None:
+            return False
+
+        self._record_fast_path(True, qpl_flow)
+        self.created_reminders = []
+        self.last_calendar_id = None
+        try:
+            calendar_id = await self._select_calendar(qpl_flow)
+            if calendar_id is None:
+                err = "No calendar was found for reminders"
+                qpl_flow.mark_failed(err)
+                response.async_set_speech(err)
+                return True
+
+            self.last_calendar_id = calendar_id
+            await self._run_local_action(calendar_id, json_data, response, qpl_flow)
+        except Exception:
+            qpl_flow.mark_failed(traceback.format_exc())
+            response.async_set_speech("Failed")
+        return True
+
+    def _parse_locally(
+        self, request: ConversationInput, qpl_flow: QPLFlow
+    ) -> dict | None:
+        """Create or list action for common phrasings, None when the LLM should decide."""
+        qpl_flow.mark_subspan_begin("reminder_fast_path")
+        json_data = parse_reminder_request(request.text)
+        point = qpl_flow.mark_subspan_end("reminder_fast_path")
+        maybe(point).annotate("hit", json_data is not None)
+        if json_data is not None:
+            maybe(point).annotate("action", json.dumps(json_data))
+        return json_data
+
+    async def _run_local_action(
+        self,
+        calendar_id: str,
+        json_data: dict,
+        response: intent.IntentResponse,
+        qpl_flow: QPLFlow,
+    ):
+        if json_data.get("action") == "list":
+            await self._list_reminders(calendar_id, json_data, response, qpl_flow)
+        else:
+            await self._create_reminder(calendar_id, json_data, response, qpl_flow)
+
+    def _record_fast_path(self, hit: bool, qpl_flow: QPLFlow):
+        self._requests_seen += 1
+        if hit:
+            self._fast_path_hits += 1
+        hit_rate = self._fast_path_hits / self._requests_seen
+        qpl_flow.annotate("reminder_fast_path_hit", hit)
+        qpl_flow.annotate("reminder_fast_path_hit_rate", f"{hit_rate:.2f}")
+        _LOGGER.debug(
+            "Reminder fast path %s, hit rate %d/%d",
+            "hit" if hit else "miss",
+            self._fast_path_hits,
+            self._requests_seen,
+        )
+
     async def process_user_request(
         self,
         request: ConversationInput,
@@ -353,6 +361,9 @@ class Reminders(AbstractSkill):
 
             self.last_calendar_id = calendar_id
 
+            # try_fast_path already turned down the local grammar
+            self._record_fast_path(False, qpl_flow)
+
             # Step 2: Get existing reminders for context
             existing_reminders = await self._get_existing_reminders(
                 calendar_id, qpl_flow
@@ -364,7 +375,7 @@ class Reminders(AbstractSkill):
             )
             point = qpl_flow.mark_subspan_begin("sending_action_prompt_to_llm")
             maybe(point).annotate("prompt", action_prompt)
-            llm_response = await self.client.send_message(action_prompt)
+            llm_response = await self.client.send_message(action_prompt, qpl_flow)
             point = qpl_flow.mark_subspan_end("sending_action_prompt_to_llm")
             llm_response = llm_response.replace("```json", "")
             llm_response = llm_response.replace("```", "")
@@ -398,6 +409,8 @@ class Reminders(AbstractSkill):
                 await self._delete_reminder(
                     calendar_id, json_data, existing_reminders, response, qpl_flow
                 )
+            elif action == "list":
+                await self._list_reminders(calendar_id, json_data, response, qpl_flow)
             else:
                 err = "Unknown action"
                 qpl_flow.mark_failed(err)
@@ -524,6 +537,10 @@ class Reminders(AbstractSkill):
             event_data["uid"] = uid
 
             await calendar_entity.async_create_event(**event_data)
+            self._scheduler.async_request_refresh(calendar_id)
+            self._reminder_cache.async_add(
+                calendar_id, self._cached_reminder(event_data)
+            )
 
             # Track for undo (store clean summary for user display)
             self.created_reminders.append(
@@ -552,6 +569,71 @@ class Reminders(AbstractSkill):
             response.async_set_speech("Failed to create reminder")
             qpl_flow.mark_subspan_end("create_reminder")
 
+    async def _list_reminders(
+        self,
+        calendar_id: str,
+        data: dict,
+        response: intent.IntentResponse,
+        qpl_flow: QPLFlow,
+    ):
+        """Tell the user which reminders fall in a range like "this_week"."""
+        point = qpl_flow.mark_subspan_begin("list_reminders")
+        range_name = data.get("range") or "today"
+        maybe(point).annotate("range", range_name)
+
+        window = self._list_window(range_name)
+        if window is None:
+            err = f"Unknown range: {range_name}"
+            qpl_flow.mark_failed(err)
+            response.async_set_speech(err)
+            qpl_flow.mark_subspan_end("list_reminders")
+            return
+
+        start, end = window
+        occurrences = await self._reminder_cache.async_get_occurrences(
+            calendar_id, start, end
+        )
+        point = qpl_flow.mark_subspan_end("list_reminders")
+        if occurrences is None:
+            err = "Could not read the reminders calendar"
+            qpl_flow.mark_failed(err)
+            response.async_set_speech(err)
+            return
+        maybe(point).annotate("occurrence_count", len(occurrences))
+
+        when = range_name.replace("_", " ")
+        if not occurrences:
+            response.async_set_speech(f"You have no reminders {when}")
+            return
+
+        items = [
+            f"{o.get('summary') or 'Reminder'} {self._format_datetime_friendly(o['start'])}"
+            for o in occurrences[:LIST_SPOKEN_LIMIT]
+        ]
+        more = len(occurrences) - len(items)
+        if more > 0:
+            items.append(f"and {more} more")
+        count = "1 reminder" if len(occurrences) == 1 else f"{len(occurrences)} reminders"
+        response.async_set_speech(f"You have {count} {when}: {', '.join(items)}")
+
+    def _list_window(self, range_name: str) -> tuple[datetime, datetime] | None:
+        now = self._get_current_time()
+        today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        week_start = today - timedelta(days=today.weekday())
+        month_start = today.replace(day=1)
+        windows = {
+            "today": (now, today + timedelta(days=1)),
+            "tomorrow": (today + timedelta(days=1), today + timedelta(days=2)),
+            "this_week": (now, week_start + timedelta(weeks=1)),
+            "next_week": (week_start + timedelta(weeks=1), week_start + timedelta(weeks=2)),
+            "this_month": (now, month_start + relativedelta(months=1)),
+            "next_month": (
+                month_start + relativedelta(months=1),
+                month_start + relativedelta(months=2),
+            ),
+        }
+        return windows.get(range_name)
+
     async def _update_reminder(
         self,
         calendar_id: str,
@@ -569,25 +651,12 @@ class Reminders(AbstractSkill):
         # Find the existing reminder
         # For recurring events, we need to find the EARLIEST instance (series start)
         best_match = None
-        all_matches = []
-        for reminder in existing_reminders:
-            summary = reminder.get("summary", "").lower()
-            if match_summary in summary or summary in match_summary:
-                all_matches.append(reminder)
-
+        all_matches = self._reminder_index(calendar_id, existing_reminders).match(
+            match_summary, now=self._get_current_time()
+        )
         if all_matches:
-            # Sort by start time to get the first instance (original series start)
-            def get_sort_key(r):
-                start = r.get("start")
-                if start is None:
-                    return datetime.max.replace(tzinfo=self._get_timezone())
-                if isinstance(start, str):
-                    from dateutil import parser
-                    start = parser.parse(start)
-                if start.tzinfo is None:
-                    start = start.replace(tzinfo=self._get_timezone())
-                return start
-            all_matches.sort(key=get_sort_key)
+            # Matches are sorted by start time, so the first match is
+            # the first instance (original series start)
             best_match = all_matches[0]
 
         if not best_match:
@@ -645,11 +714,6 @@ class Reminders(AbstractSkill):
         else:
             # Keep existing time
             start_dt = best_match.get("start")
-            if isinstance(start_dt, str):
-                from dateutil import parser
-                start_dt = parser.parse(start_dt)
-            if start_dt.tzinfo is None:
-                start_dt = start_dt.replace(tzinfo=self._get_timezone())
 
         end_dt = start_dt + timedelta(hours=1)
 
@@ -678,11 +742,6 @@ class Reminders(AbstractSkill):
         description = self._encode_reminder_hashtag(targets) if targets else ""
 
         try:
-            # Delete old event first
-            await calendar_entity.async_delete_event(old_uid)
-            _LOGGER.debug(f"Deleted old reminder with uid: {old_uid}")
-
-            # Create new event with updated data
             event_data = {
                 "summary": new_summary,
                 "dtstart": start_dt,
@@ -700,15 +759,22 @@ class Reminders(AbstractSkill):
             elif existing_rrule:
                 event_data["rrule"] = existing_rrule
 
-            # Generate new UID
-            uid = self._generate_uid(new_summary, start_dt, end_dt)
-            event_data["uid"] = uid
+            # The UID is kept, so the scheduler and undo keep tracking the same reminder
+            update_path = await self._write_updated_event(
+                calendar_entity, old_uid, event_data, best_match
+            )
+            maybe(point).annotate("update_path", update_path)
+            event_data["uid"] = old_uid
 
-            await calendar_entity.async_create_event(**event_data)
+            self._scheduler.async_request_refresh(calendar_id)
+            self._reminder_cache.async_remove(calendar_id, old_uid)
+            self._reminder_cache.async_add(
+                calendar_id, self._cached_reminder(event_data)
+            )
 
             # Track for undo
             self.created_reminders.append(
-                CreatedReminder(calendar_id=calendar_id, uid=uid, summary=new_summary)
+                CreatedReminder(calendar_id=calendar_id, uid=old_uid, summary=new_summary)
             )
 
             qpl_flow.mark_subspan_end("update_reminder")
@@ -734,6 +800,44 @@ class Reminders(AbstractSkill):
             response.async_set_speech("Failed to update reminder")
             qpl_flow.mark_subspan_end("update_reminder")
 
+    async def _write_updated_event(
+        self,
+        calendar_entity: CalendarEntity,
+        uid: str,
+        event_data: dict,
+        original: dict,
+    ) -> str:
+        """Write an edited reminder and return which path was used.
+
+        Calendars that support updates are edited in place with a single write;
+        others get delete plus create under the same UID. If the create fails,
+        the original reminder is put back so it isn't lost.
+        """
+        features = calendar_entity.supported_features or 0
+        if features & CalendarEntityFeature.UPDATE_EVENT:
+            await calendar_entity.async_update_event(uid, event_data)
+            _LOGGER.debug(f"Updated reminder in place: {uid}")
+            return "update_event"
+
+        await calendar_entity.async_delete_event(uid)
+        _LOGGER.debug(f"Deleted old reminder with uid: {uid}")
+        try:
+            await calendar_entity.async_create_event(**event_data, uid=uid)
+        except Exception:
+            restore = {
+                "summary": original.get("summary", "Reminder"),
+                "dtstart": original["start"],
+                "dtend": original.get("end") or original["start"] + timedelta(hours=1),
+                "uid": uid,
+            }
+            if original.get("description"):
+                restore["description"] = original["description"]
+            if original.get("rrule"):
+                restore["rrule"] = original["rrule"]
+            await calendar_entity.async_create_event(**restore)
+            raise
+        return "delete_create"
+
     async def _delete_reminder(
         self,
         calendar_id: str,
@@ -754,47 +858,26 @@ class Reminders(AbstractSkill):
         maybe(point).annotate("time_filter", time_filter)
 
         # Find reminders to delete
-        reminders_to_delete = []
         now = self._get_current_time()
-
-        for reminder in existing_reminders:
-            summary = reminder.get("summary", "").lower()
-            start = reminder.get("start")
-
-            # Convert start to datetime if needed
-            if isinstance(start, str):
-                from dateutil import parser
-                start = parser.parse(start)
-            if start and start.tzinfo is None:
-                start = start.replace(tzinfo=self._get_timezone())
-
-            # Check time filter
-            if time_filter:
-                if not start:
-                    continue
-                if time_filter == "today" and start.date() != now.date():
-                    continue
-                elif time_filter == "tomorrow" and start.date() != (now + timedelta(days=1)).date():
-                    continue
-                elif time_filter not in ("today", "tomorrow"):
-                    # Try parsing as date
-                    try:
-                        filter_date = datetime.strptime(time_filter, "%Y-%m-%d").date()
-                        if start.date() != filter_date:
-                            continue
-                    except ValueError:
-                        pass
-
-            # Check summary match (if provided)
-            if match_summary:
-                if match_summary not in summary and summary not in match_summary:
-                    continue
-
-            # If delete_all with time_filter, add all matching
-            # If not delete_all, only add first match
-            reminders_to_delete.append(reminder)
-            if not delete_all and not time_filter:
-                break  # Only delete first match for single delete
+        day = None
+        if time_filter == "today":
+            day = now.date()
+        elif time_filter == "tomorrow":
+            day = (now + timedelta(days=1)).date()
+        elif time_filter:
+            try:
+                day = datetime.strptime(time_filter, "%Y-%m-%d").date()
+            except ValueError:
+                pass
+
+        reminders_to_delete = self._reminder_index(
+            calendar_id, existing_reminders
+        ).match(match_summary, day, now)
+        # Recurring reminders show up once per occurrence, delete each series once
+        reminders_to_delete = list(
+            {r.get("uid") or id(r): r for r in reminders_to_delete}.values()
+        )
+        maybe(point).annotate("matches_found", len(reminders_to_delete))
 
         if not reminders_to_delete:
             if time_filter:
@@ -808,7 +891,7 @@ class Reminders(AbstractSkill):
             qpl_flow.mark_subspan_end("delete_reminder")
             return
 
-        # For single delete without delete_all flag, just use first match
+        # Single delete unless the user asked for all, or for a day
         if not delete_all and not time_filter:
             reminders_to_delete = [reminders_to_delete[0]]
 
@@ -822,25 +905,13 @@ class Reminders(AbstractSkill):
             return
 
         # Delete all matched reminders
-        deleted_summaries = []
-        failed_count = 0
-
-        for reminder in reminders_to_delete:
-            uid = reminder.get("uid")
-            summary = reminder.get("summary", "")
-
-            if not uid:
-                failed_count += 1
-                continue
-
-            try:
-                await calendar_entity.async_delete_event(uid)
-                deleted_summaries.append(summary)
-                _LOGGER.debug(f"Deleted reminder: {summary} (uid: {uid})")
-            except Exception as e:
-                _LOGGER.warning(f"Failed to delete reminder {summary}: {e}")
-                failed_count += 1
-
+        results = await self._delete_events(
+            calendar_entity,
+            calendar_id,
+            [(r.get("uid"), r.get("summary", "")) for r in reminders_to_delete],
+            qpl_flow,
+        )
+        deleted_summaries = [r["summary"] for r in results if r["result"] == "deleted"]
         qpl_flow.mark_subspan_end("delete_reminder")
 
         # Build response message
@@ -851,6 +922,66 @@ class Reminders(AbstractSkill):
         else:
             response.async_set_speech(f"Deleted {len(deleted_summaries)} reminders")
 
+    def _reminder_index(
+        self, calendar_id: str, existing_reminders: list[dict]
+    ) -> ReminderIndex:
+        """Cached match index for the calendar, or one over the given reminders."""
+        index = self._reminder_cache.get_index(calendar_id)
+        return index if index is not None else ReminderIndex(existing_reminders)
+
+    async def _delete_events(
+        self,
+        calendar_entity: CalendarEntity,
+        calendar_id: str,
+        items: list[tuple[str | None, str]],
+        qpl_flow: QPLFlow,
+    ) -> list[dict]:
+        """Delete (uid, summary) items concurrently, with bounded parallelism.
+
+        Returns a result per item: "deleted", "no_uid" or "failed".
+        """
+        point = qpl_flow.mark_subspan_begin("delete_events")
+        maybe(point).annotate("calendar_id", calendar_id)
+        maybe(point).annotate("count", len(items))
+        semaphore = asyncio.Semaphore(DELETE_PARALLELISM)
+
+        async def delete_one(uid: str | None, summary: str) -> dict:
+            if not uid:
+                return {"uid": uid, "summary": summary, "result": "no_uid"}
+            async with semaphore:
+                try:
+                    await calendar_entity.async_delete_event(uid)
+                except Exception as e:
+                    _LOGGER.warning(f"Failed to delete reminder {summary}: {e}")
+                    return {"uid": uid, "summary": summary, "result": "failed"}
+            self._reminder_cache.async_remove(calendar_id, uid)
+            _LOGGER.debug(f"Deleted reminder: {summary} (uid: {uid})")
+            return {"uid": uid, "summary": summary, "result": "deleted"}
+
+        results = await asyncio.gather(
+            *(delete_one(uid, summary) for uid, summary in items)
+        )
+        if any(r["result"] == "deleted" for r in results):
+            self._scheduler.async_request_refresh(calendar_id)
+
+        point = qpl_flow.mark_subspan_end("delete_events")
+        maybe(point).annotate("results", json.dumps(results))
+        maybe(point).annotate(
+            "failed_count", sum(1 for r in results if r["result"] != "deleted")
+        )
+        return results
+
+    def _cached_reminder(self, event_data: dict) -> dict:
+        """Reminder cache entry for an event the skill just created."""
+        return {
+            "summary": event_data["summary"],
+            "start": event_data["dtstart"],
+            "end": event_data["dtend"],
+            "uid": event_data["uid"],
+            "description": event_data.get("description", ""),
+            "rrule": event_data.get("rrule"),
+        }
+
     def _generate_uid(
         self,
         summary: str,
@@ -946,26 +1077,7 @@ class Reminders(AbstractSkill):
 
     def _get_calendar_entity(self, entity_id: str) -> CalendarEntity | None:
         """Get the CalendarEntity instance for the given entity_id."""
-        # Try the standard EntityComponent path
-        entity_component = self.hass.data.get("calendar")
-        if entity_component is not None and hasattr(entity_component, "get_entity"):
-            entity = entity_component.get_entity(entity_id)
-            if entity:
-                return entity
-
-        # Try via entity_platform
-        try:
-            from homeassistant.helpers.entity_platform import async_get_platforms
-
-            platforms = async_get_platforms(self.hass, "calendar")
-            for platform in platforms:
-                if entity_id in platform.entities:
-                    return platform.entities[entity_id]
-        except Exception as e:
-            _LOGGER.debug(f"Could not get calendar entity via platforms: {e}")
-
-        _LOGGER.warning(f"Could not find calendar entity: {entity_id}")
-        return None
+        return self._calendar_entities.get(entity_id)
 
     def _parse_time_spec(self, time_spec: dict) -> datetime | None:
         """Parse the time specification from LLM and return a datetime."""
@@ -1110,6 +1222,14 @@ class Reminders(AbstractSkill):
             qpl_flow.mark_subspan_end("select_calendar")
             return None
 
+        # A calendar pinned in the agent options wins over everything else
+        pinned = self.client.runtime_options.get(CONF_REMINDER_CALENDAR)
+        if pinned and any(cal["entity_id"] == pinned for cal in calendars):
+            point = qpl_flow.mark_subspan_end("select_calendar")
+            maybe(point).annotate("selected_calendar_id", pinned)
+            maybe(point).annotate("selection_source", "pinned")
+            return pinned
+
         if len(calendars) == 1:
             qpl_flow.mark_subspan_end("select_calendar")
             return calendars[0]["entity_id"]
@@ -1125,19 +1245,28 @@ class Reminders(AbstractSkill):
                     maybe(point).annotate("matched_keyword", keyword)
                     return cal["entity_id"]
 
+        # Reuse the previous choice while the set of calendars is unchanged
+        selection_cache = get_selection_cache(self.hass)
+        if selection_cache is not None:
+            calendar_id = selection_cache.get("reminder_calendar", calendars)
+            if calendar_id is not None:
+                point = qpl_flow.mark_subspan_end("select_calendar")
+                maybe(point).annotate("selected_calendar_id", calendar_id)
+                maybe(point).annotate("selection_source", "cache")
+                return calendar_id
+
         # Build and send prompt to select calendar
         qpl_flow.mark_subspan_begin("render_select_calendar_prompt")
         prompt_key = os.path.join(
             os.path.dirname(__file__), "reminders_select_calendar.md"
         )
-        prompt_template = await self.prompt_cache.get(prompt_key)
-        template = Template(prompt_template, trim_blocks=True)
+        template = await self.prompt_cache.get(prompt_key)
         prompt = template.render(calendars=calendars_json)
         point = qpl_flow.mark_subspan_end("render_select_calendar_prompt")
         maybe(point).annotate("prompt", prompt)
 
         qpl_flow.mark_subspan_begin("sending_select_calendar_to_llm")
-        llm_response = await self.client.send_message(prompt)
+        llm_response = await self.client.send_message(prompt, qpl_flow)
         point = qpl_flow.mark_subspan_end("sending_select_calendar_to_llm")
         llm_response = llm_response.replace("```json", "")
         llm_response = llm_response.replace("```", "")
@@ -1146,8 +1275,11 @@ class Reminders(AbstractSkill):
         try:
             json_data = json.loads(llm_response)
             calendar_id = json_data.get("entity_id")
+            if selection_cache is not None and calendar_id:
+                selection_cache.async_set("reminder_calendar", calendars, calendar_id)
             point = qpl_flow.mark_subspan_end("select_calendar")
             maybe(point).annotate("selected_calendar_id", calendar_id)
+            maybe(point).annotate("selection_source", "llm")
             return calendar_id
         except json.JSONDecodeError:
             qpl_flow.mark_subspan_end("select_calendar")
@@ -1156,42 +1288,17 @@ class Reminders(AbstractSkill):
     async def _get_existing_reminders(
         self, calendar_id: str, qpl_flow: QPLFlow
     ) -> list[dict]:
-        """Get existing reminders from the calendar."""
+        """Get upcoming reminders from the calendar, soonest first."""
         point = qpl_flow.mark_subspan_begin("get_existing_reminders")
         maybe(point).annotate("calendar_id", calendar_id)
 
-        reminders = []
-        try:
-            # Get the calendar entity directly
-            calendar_entity = self._get_calendar_entity(calendar_id)
-            if calendar_entity is None:
-                qpl_flow.mark_subspan_end("get_existing_reminders")
-                return []
-
-            now = self._get_current_time()
-            end = now + timedelta(days=30)
-
-            events = await calendar_entity.async_get_events(self.hass, now, end)
-
-            for event in events:
-                reminders.append(
-                    {
-                        "summary": event.summary or "",
-                        "start": event.start,
-                        "end": event.end,
-                        "uid": event.uid,
-                        "description": event.description or "",
-                        "rrule": getattr(event, "rrule", None),
-                    }
-                )
-
-            point = qpl_flow.mark_subspan_end("get_existing_reminders")
-            maybe(point).annotate("reminder_count", len(reminders))
-            return reminders
-
-        except Exception:
-            qpl_flow.mark_subspan_end("get_existing_reminders")
-            return []
+        reminders, cache_status = await self._reminder_cache.async_get_reminders(
+            calendar_id
+        )
+        point = qpl_flow.mark_subspan_end("get_existing_reminders")
+        maybe(point).annotate("reminder_count", len(reminders))
+        maybe(point).annotate("reminder_cache", cache_status)
+        return reminders
 
     async def _build_action_prompt(
         self,
@@ -1203,20 +1310,29 @@ class Reminders(AbstractSkill):
         qpl_flow.mark_subspan_begin("build_action_prompt")
 
         prompt_key = os.path.join(os.path.dirname(__file__), "reminders.md")
-        prompt_template = await self.prompt_cache.get(prompt_key, request.conversation_id)
-        template = Template(prompt_template, trim_blocks=True)
+        template = await self.prompt_cache.get(prompt_key)
+
+        budget = self.client.token_budgeter.create_budget()
+        budget.reserve("static_instructions", template.render(user_prompt=request.text))
 
-        # Use clean summaries (without hashtags) for LLM
+        # Use clean summaries (without hashtags) for LLM, soonest first
         reminder_summaries = [r.get("summary", "") for r in existing_reminders]
-        reminders_json = json.dumps(reminder_summaries)
+        reminders_json = json.dumps(
+            budget.fit_items("existing_items", reminder_summaries)
+        )
+        conversation_history = self.prompt_cache.get_history(
+            request.conversation_id, budget
+        )
 
         output = template.render(
             existing_reminders=reminders_json,
             user_prompt=request.text,
+            conversation_history=conversation_history,
         )
         point = qpl_flow.mark_subspan_end("build_action_prompt")
         maybe(point).annotate("prompt", output)
         maybe(point).annotate("existing_reminders", reminders_json)
+        budget.annotate(point)
         return output
 
     async def undo(self, response: intent.IntentResponse, qpl_flow: QPLFlow):
@@ -1228,27 +1344,25 @@ class Reminders(AbstractSkill):
             qpl_flow.mark_subspan_end("reminders_undo")
             return
 
-        deleted_summaries = []
-
+        # Group by calendar, so each calendar's deletes run concurrently
+        by_calendar: dict[str, list[tuple[str | None, str]]] = {}
         for reminder in self.created_reminders:
-            point = qpl_flow.mark_subspan_begin("undo_single_reminder")
-            maybe(point).annotate("uid", reminder.uid)
-            maybe(point).annotate("summary", reminder.summary)
-
-            try:
-                # Get the calendar entity directly
-                calendar_entity = self._get_calendar_entity(reminder.calendar_id)
-                if calendar_entity is not None:
-                    _LOGGER.debug(f"Deleting event with uid: {reminder.uid}")
-                    await calendar_entity.async_delete_event(reminder.uid)
-                    deleted_summaries.append(reminder.summary)
-                else:
-                    _LOGGER.warning(f"Could not get calendar entity for undo: {reminder.calendar_id}")
-
-            except Exception as e:
-                _LOGGER.error(f"Failed to undo reminder: {e}")
+            by_calendar.setdefault(reminder.calendar_id, []).append(
+                (reminder.uid, reminder.summary)
+            )
 
-            qpl_flow.mark_subspan_end("undo_single_reminder")
+        deleted_summaries = []
+        for calendar_id, items in by_calendar.items():
+            calendar_entity = self._get_calendar_entity(calendar_id)
+            if calendar_entity is None:
+                _LOGGER.warning(f"Could not get calendar entity for undo: {calendar_id}")
+                continue
+            results = await self._delete_events(
+                calendar_entity, calendar_id, items, qpl_flow
+            )
+            deleted_summaries.extend(
+                r["summary"] for r in results if r["result"] == "deleted"
+            )
 
         self.created_reminders = []
         qpl_flow.mark_subspan_end("reminders_undo")
@@ -4,7 +4,6 @@ from homeassistant.components.homeassistant.exposed_entities import async_should
 from homeassistant.helpers import entity_registry, area_registry, device_registry
 import json
 import os
-from jinja2 import Template
 from homeassistant.helpers import intent
 from homeassistant.components.conversation import ConversationInput
 from homeassistant.components.todo.intent import (
@@ -32,7 +31,7 @@ class ShoppingList(AbstractSkill):
         self.intents = []
         prompt = await self._build_prompt(request, qpl_flow)
         qpl_flow.mark_subspan_begin("sending_message_to_llm")
-        llm_response = await self.client.send_message(prompt)
+        llm_response = await self.client.send_message(prompt, qpl_flow)
         point = qpl_flow.mark_subspan_end("sending_message_to_llm")
         llm_response = llm_response.replace("```json", "")
         llm_response = llm_response.replace("```", "")
@@ -161,20 +160,27 @@ class ShoppingList(AbstractSkill):
             entities.append(entry)
 
         point = qpl_flow.mark_subspan_end("quering_entities_from_ha")
-        device_list = json.dumps(entities)
-        maybe(point).annotate("entity_list", device_list)
+        maybe(point).annotate("entity_list", json.dumps(entities))
         qpl_flow.mark_subspan_begin("render_prompt")
         prompt_key = os.path.join(
             os.path.dirname(__file__), "shopping_list_todo_list.md"
         )
-        prompt_template = await self.prompt_cache.get(prompt_key, request.conversation_id)
-        template = Template(prompt_template, trim_blocks=True)
+        template = await self.prompt_cache.get(prompt_key)
+
+        budget = self.client.token_budgeter.create_budget()
+        budget.reserve("static_instructions", template.render(user_prompt=request.text))
+        device_list = json.dumps(budget.fit_items("snapshot", entities))
+        conversation_history = self.prompt_cache.get_history(
+            request.conversation_id, budget
+        )
 
         output = template.render(
             device_list=device_list,
             user_prompt=request.text,
+            conversation_history=conversation_history,
         )
         point = qpl_flow.mark_subspan_end("render_prompt")
         maybe(point).annotate("prompt", output)
+        budget.annotate(point)
         qpl_flow.mark_subspan_end("build_prompt")
         return output
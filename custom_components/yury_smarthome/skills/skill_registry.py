@@ -86,6 +86,24 @@ class SkillRegistry:
         else:
             raise UnknownSkillException
 
+    async def try_fast_path(
+        self,
+        original_request: ConversationInput,
+        response: intent.IntentResponse,
+        qpl_flow: QPLFlow,
+    ) -> bool:
+        """Let skills handle unambiguous requests locally, skipping skill selection."""
+        for skill in self.registry.values():
+            if not await skill.try_fast_path(original_request, response, qpl_flow):
+                continue
+
+            qpl_flow.annotate("fast_path_skill", skill.name())
+            conversation_id = original_request.conversation_id
+            if conversation_id is not None:
+                self.history[conversation_id] = (datetime.now(), skill.name())
+            return True
+        return False
+
     def _get_skill_from_history(
         self, original_request: ConversationInput
     ) -> AbstractSkill | None:
@@ -0,0 +1,296 @@
+"""Local grammar for simple timer commands, so they don't need the LLM."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import re
+
+ONES = {
+    "a": 1,
+    "an": 1,
+    "one": 1,
+    "two": 2,
+    "three": 3,
+    "four": 4,
+    "five": 5,
+    "six": 6,
+    "seven": 7,
+    "eight": 8,
+    "nine": 9,
+    "ten": 10,
+    "eleven": 11,
+    "twelve": 12,
+    "thirteen": 13,
+    "fourteen": 14,
+    "fifteen": 15,
+    "sixteen": 16,
+    "seventeen": 17,
+    "eighteen": 18,
+    "nineteen": 19,
+}
+TENS = {
+    "twenty": 20,
+    "thirty": 30,
+    "forty": 40,
+    "fifty": 50,
+    "sixty": 60,
+    "seventy": 70,
+    "eighty": 80,
+    "ninety": 90,
+}
+
+UNIT_SECONDS = {"h": 3600, "m": 60, "s": 1}
+
+_ONES = "|".join(sorted((re.escape(word) for word in ONES), key=len, reverse=True))
+_TENS = "|".join(TENS)
+_NUMBER = rf"\d+(?:\.\d+)?|half an?|(?:{_TENS})(?:[\s-](?:{_ONES}))?|{_ONES}"
+_HALF = r" and a half"
+DURATION_RE = re.compile(
+    rf"\b(?P<value>{_NUMBER})(?P<half_before>{_HALF})?[\s-]+"
+    r"(?P<unit>hours?|hrs?|minutes?|mins?|seconds?|secs?)\b"
+    rf"(?P<half_after>{_HALF})?"
+)
+START_RE = re.compile(
+    r"^(?:please )?(?:set|start|create|make)(?: me)?(?: (?:a|an|new))* (?P<rest>.+)$"
+)
+CONTROL_RE = re.compile(
+    r"^(?:please )?(?P<verb>cancel|stop|delete|remove|pause|hold|resume|continue|unpause)"
+    r"(?: (?:the|my))? ?(?P<label>[\w ]*?) ?timers?$"
+)
+REMAINING_RES = [
+    re.compile(
+        r"^how (?:much (?:time|longer)|long)(?: is| do i have)?(?: left| remaining)"
+        r"(?: (?:on|for))?(?: (?:the|my))? ?(?P<label>[\w ]*?) ?(?:timer)?$"
+    ),
+    re.compile(
+        r"^(?:what is |whats )?(?:the )?time (?:left|remaining) on(?: (?:the|my))?"
+        r" ?(?P<label>[\w ]*?) ?timer$"
+    ),
+]
+# Words around a start command that are not part of the timer label
+LABEL_FILLER = {"a", "an", "the", "for", "my", "me", "of", "on", "called", "named"}
+POLITENESS_RE = re.compile(r"\b(?:please|thanks|thank you)\b")
+# "timer in/to 10 minutes", "10 minutes from now"
+DURATION_LEAD_RE = re.compile(r"\b(?:for|in|to)\s*$")
+DURATION_TAIL_RE = re.compile(r"^\s*from now\b")
+# Leftover prepositions, e.g. "in the kitchen", are more than a label
+PREPOSITIONS = {
+    "about",
+    "after",
+    "at",
+    "before",
+    "by",
+    "from",
+    "in",
+    "inside",
+    "into",
+    "near",
+    "to",
+    "until",
+    "with",
+}
+MAX_LABEL_WORDS = 3
+# Leftover words that mean there is more to the request than one timer
+CONJUNCTIONS = {"and", "then", "also", "plus", "but", "or", "another"}
+VERBS = {
+    "add",
+    "call",
+    "check",
+    "close",
+    "dim",
+    "lock",
+    "make",
+    "open",
+    "play",
+    "put",
+    "remind",
+    "send",
+    "set",
+    "start",
+    "stop",
+    "switch",
+    "tell",
+    "turn",
+    "unlock",
+}
+
+VERB_ACTIONS = {
+    "cancel": "cancel",
+    "stop": "cancel",
+    "delete": "cancel",
+    "remove": "cancel",
+    "pause": "pause",
+    "hold": "pause",
+    "resume": "resume",
+    "continue": "resume",
+    "unpause": "resume",
+}
+# States a timer must be in for the action to apply to it
+ACTION_STATES = {
+    "cancel": {"active", "paused"},
+    "pause": {"active"},
+    "resume": {"paused"},
+    "remaining": {"active", "paused"},
+}
+
+
+@dataclass
+class TimerTarget:
+    entity_id: str
+    label: str | None
+    state: str
+
+
+def parse_timer_command(text: str, targets: list[TimerTarget]) -> list[dict] | None:
+    """Parse a timer command into the command dicts the LLM would produce.
+
+    Returns None if the text isn't a simple timer command or the target is
+    ambiguous, in which case the LLM should handle it.
+    """
+    text = _normalize(text)
+
+    match = START_RE.match(text)
+    if match and match.group("rest").count("timer") == 1:
+        return _parse_start(match.group("rest"))
+
+    match = CONTROL_RE.match(text)
+    if match:
+        action = VERB_ACTIONS[match.group("verb")]
+        return _resolve(action, match.group("label"), targets)
+
+    for regex in REMAINING_RES:
+        match = regex.match(text)
+        if match:
+            return _resolve("remaining", match.group("label"), targets)
+
+    return None
+
+
+def _normalize(text: str) -> str:
+    text = text.lower().replace("'", "")
+    text = re.sub(r"[^\w\s.:-]", " ", text)
+    text = re.sub(r"(?<!\d)\.|\.(?!\d)", " ", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def _parse_start(rest: str) -> list[dict] | None:
+    if re.search(r"\btimers\b", rest):
+        return None
+
+    matches = list(DURATION_RE.finditer(rest))
+    if not matches or not _single_duration(rest, matches):
+        return None
+
+    total_seconds = 0.0
+    for match in matches:
+        amount = _number(match.group("value"))
+        if match.group("half_before") or match.group("half_after"):
+            amount += 0.5
+        total_seconds += amount * UNIT_SECONDS[match.group("unit")[0]]
+
+    if total_seconds <= 0:
+        return None
+
+    # The "and" joining the units of one duration is not part of the label
+    before = DURATION_LEAD_RE.sub("", rest[: matches[0].start()])
+    after = DURATION_TAIL_RE.sub("", rest[matches[-1].end() :])
+    leftover = POLITENESS_RE.sub(" ", f"{before} {after}")
+    words = [
+        word
+        for word in leftover.replace("timer", " ").split()
+        if word not in LABEL_FILLER
+    ]
+    if len(words) > MAX_LABEL_WORDS or not all(_is_label_word(word) for word in words):
+        return None
+
+    total_seconds = round(total_seconds)
+    hours = int(total_seconds // 3600)
+    minutes = int((total_seconds % 3600) // 60)
+    seconds = int(total_seconds % 60)
+    return [
+        {
+            "action": "start",
+            "entity_id": None,
+            "duration": f"{hours:02d}:{minutes:02d}:{seconds:02d}",
+            "context": " ".join(words),
+        }
+    ]
+
+
+def _single_duration(rest: str, matches: list[re.Match]) -> bool:
+    """Whether the matches spell one duration, e.g. "1 hour and 30 minutes".
+
+    Units must get smaller and be next to each other; anything else, like
+    "5 minutes and another for 10 minutes", is more than one timer.
+    """
+    for previous, match in zip(matches, matches[1:]):
+        if rest[previous.end() : match.start()].strip() not in ("", "and"):
+            return False
+        previous_unit = UNIT_SECONDS[previous.group("unit")[0]]
+        if UNIT_SECONDS[match.group("unit")[0]] >= previous_unit:
+            return False
+        if previous.group("half_after"):
+            return False
+    return True
+
+
+def _number(value: str) -> float:
+    if value.startswith("half"):
+        return 0.5
+    words = value.replace("-", " ").split()
+    if all(word in ONES or word in TENS for word in words):
+        return sum(ONES.get(word, TENS.get(word, 0)) for word in words)
+    return float(value)
+
+
+def _is_label_word(word: str) -> bool:
+    return (
+        word not in CONJUNCTIONS
+        and word not in PREPOSITIONS
+        and word not in VERBS
+        and word not in ONES
+        and word not in TENS
+        and not any(char.isdigit() for char in word)
+    )
+
+
+def _resolve(action: str, label: str, targets: list[TimerTarget]) -> list[dict] | None:
+    candidates = [target for target in targets if target.state in ACTION_STATES[action]]
+    label = label.strip()
+
+    if label == "all":
+        if action == "remaining" or not candidates:
+            return None
+        matches = candidates
+    elif label:
+        matches = [
+            target for target in candidates if _label_matches(label, target.label)
+        ]
+        if len(matches) != 1:
+            return None
+    else:
+        if len(candidates) != 1:
+            return None
+        matches = candidates
+
+    return [
+        {
+            "action": action,
+            "entity_id": target.entity_id,
+            "duration": None,
+            "context": target.label or "",
+        }
+        for target in matches
+    ]
+
+
+def _label_matches(spoken: str, label: str | None) -> bool:
+    if not label:
+        return False
+    spoken_words = {_singular(word) for word in spoken.split()}
+    label_words = {_singular(word) for word in _normalize(label).split()}
+    return spoken_words <= label_words or label_words <= spoken_words
+
+
+def _singular(word: str) -> str:
+    return word[:-1] if len(word) > 3 and word.endswith("s") else word
@@ -0,0 +1,169 @@
+"""Pool of timer.* helper entities with an idle free list."""
+
+from __future__ import annotations
+
+import logging
+from typing import Callable
+
+from homeassistant.core import Event, HomeAssistant, State, callback
+from homeassistant.helpers.event import (
+    TrackStates,
+    async_track_state_change_filtered,
+)
+from custom_components.yury_smarthome.const import DATA_TIMER_POOL
+
+_LOGGER = logging.getLogger(__name__)
+
+TIMER_DOMAIN = "timer"
+TIMER_STATES = ("idle", "active", "paused")
+
+
+class TimerPool:
+    """Tracks idle, active and paused timer entities from state change events.
+
+    Idle timers are kept in an insertion-ordered free list, so handing one out
+    is O(1) and doesn't depend on how many other entities exist. Reservations
+    are made synchronously on the event loop, so two concurrent requests can't
+    grab the same timer.
+
+    The pool owns the only timer state subscription, filtered to the timer
+    domain, and reports timers going from active to idle to a single handler.
+    """
+
+    hass: HomeAssistant
+    _states: dict[str, str]
+    _idle: dict[str, None]  # Ordered set of idle, unreserved timers
+    _reserved: set[str]
+
+    def __init__(self, hass: HomeAssistant):
+        self.hass = hass
+        self._states = {}
+        self._idle = {}
+        self._reserved = set()
+        self._tracker = None
+        self._finished_handler: Callable[[str], None] | None = None
+
+    @callback
+    def async_setup(self):
+        """Load current timer states and subscribe to timer state changes."""
+        for state in self.hass.states.async_all(TIMER_DOMAIN):
+            self._update(state.entity_id, state)
+
+        self._tracker = async_track_state_change_filtered(
+            self.hass,
+            TrackStates(False, set(), {TIMER_DOMAIN}),
+            self._async_state_changed,
+        )
+        _LOGGER.debug("Timer pool tracking %d timers", len(self._states))
+
+    @callback
+    def async_shutdown(self):
+        """Unsubscribe from state changes and drop the shared instance."""
+        if self._tracker is not None:
+            self._tracker.async_remove()
+            self._tracker = None
+        self._finished_handler = None
+        if self.hass.data.get(DATA_TIMER_POOL) is self:
+            del self.hass.data[DATA_TIMER_POOL]
+
+    @callback
+    def async_set_finished_handler(self, handler: Callable[[str], None]):
+        """Set the single handler called with the entity_id of a finished timer."""
+        self._finished_handler = handler
+
+    @callback
+    def _async_state_changed(self, event: Event):
+        entity_id = event.data["entity_id"]
+        old_state = event.data.get("old_state")
+        new_state = event.data.get("new_state")
+        self._update(entity_id, new_state)
+
+        if (
+            self._finished_handler is not None
+            and old_state is not None
+            and new_state is not None
+            and old_state.state == "active"
+            and new_state.state == "idle"
+        ):
+            self._finished_handler(entity_id)
+
+    def _update(self, entity_id: str, state: State | None):
+        if state is None or state.state not in TIMER_STATES:
+            # Removed or unavailable timers can't be handed out
+            self._states.pop(entity_id, None)
+            self._idle.pop(entity_id, None)
+            self._reserved.discard(entity_id)
+            return
+
+        self._states[entity_id] = state.state
+        if state.state == "idle":
+            if entity_id not in self._reserved:
+                self._idle[entity_id] = None
+        else:
+            self._idle.pop(entity_id, None)
+            self._reserved.discard(entity_id)
+
+    @property
+    def entity_ids(self) -> list[str]:
+        """All known timer entity ids."""
+        return list(self._states)
+
+    def get_state(self, entity_id: str) -> str | None:
+        return self._states.get(entity_id)
+
+    @callback
+    def async_reserve(self, preferred: str | None = None) -> str | None:
+        """Reserve an idle timer, preferring the given one if it's free.
+
+        Returns None if all timers are in use.
+        """
+        if preferred is not None and preferred in self._idle:
+            entity_id = preferred
+        elif self._idle:
+            entity_id = next(iter(self._idle))
+        else:
+            return None
+
+        del self._idle[entity_id]
+        self._reserved.add(entity_id)
+        return entity_id
+
+    @callback
+    def async_release(self, entity_id: str):
+        """Return a reserved timer to the pool, e.g. if starting it failed."""
+        if entity_id not in self._reserved:
+            return
+        self._reserved.discard(entity_id)
+        if self._states.get(entity_id) == "idle":
+            self._idle[entity_id] = None
+
+    @callback
+    def async_mark_active(self, entity_id: str):
+        """Mark a reserved timer as started without waiting for its state change."""
+        self._reserved.discard(entity_id)
+        self._idle.pop(entity_id, None)
+        if entity_id in self._states:
+            self._states[entity_id] = "active"
+
+    def utilization(self) -> dict[str, int]:
+        """Pool counters for QPL annotations."""
+        counts = {state: 0 for state in TIMER_STATES}
+        for state in self._states.values():
+            counts[state] += 1
+        return {
+            "total": len(self._states),
+            "free": len(self._idle),
+            "reserved": len(self._reserved),
+            **counts,
+        }
+
+
+@callback
+def async_get_timer_pool(hass: HomeAssistant) -> TimerPool:
+    """Get the shared TimerPool, creating it on first use."""
+    pool = hass.data.get(DATA_TIMER_POOL)
+    if pool is None:
+        pool = TimerPool(hass)
+        pool.async_setup()
+        hass.data[DATA_TIMER_POOL] = pool
+    return pool
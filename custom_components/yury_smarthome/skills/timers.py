@@ -1,15 +1,31 @@
 from .abstract_skill import AbstractSkill
-from homeassistant.core import HomeAssistant, Event, callback
-from homeassistant.const import EVENT_STATE_CHANGED
-from homeassistant.helpers import intent, entity_registry, device_registry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import intent
 from homeassistant.components.conversation import ConversationInput
 from custom_components.yury_smarthome.entity import LocalLLMEntity
 from custom_components.yury_smarthome.prompt_cache import PromptCache
 from custom_components.yury_smarthome.qpl import QPL, QPLFlow
-from custom_components.yury_smarthome.const import CONF_TTS_ENGINE, SUBENTRY_TYPE_TTS
+from custom_components.yury_smarthome.const import (
+    CONF_TIMER_BACKEND,
+    CONF_TIMER_MIRROR_SENSORS,
+    CONF_TTS_ENGINE,
+    DEFAULT_TIMER_BACKEND,
+    SUBENTRY_TYPE_TTS,
+    TIMER_BACKEND_HELPERS,
+    TIMER_BACKEND_VIRTUAL,
+)
 from custom_components.yury_smarthome.maybe import maybe
+from custom_components.yury_smarthome.tts_targets import async_get_tts_target_index
+from homeassistant.util import dt as dt_util
+from .timer_parser import TimerTarget, parse_timer_command
+from .timer_pool import async_get_timer_pool
+from .virtual_timers import (
+    VIRTUAL_TIMER_PREFIX,
+    VirtualTimer,
+    VirtualTimerEngine,
+    get_virtual_timer_engine,
+)
 from dataclasses import dataclass
-from jinja2 import Template
 import json
 import logging
 import os
@@ -23,7 +39,7 @@ _LOGGER = logging.getLogger(__name__)
 
 @dataclass
 class TimerAction:
-    action: str  # "start", "cancel", "pause", "resume"
+    action: str  # "start", "cancel", "pause", "resume", "remaining"
     entity_id: str
     duration: str | None = None
     friendly_name: str | None = None
@@ -54,43 +70,41 @@ class Timers(AbstractSkill):
         self.qpl_provider = qpl_provider
         self.last_actions = []  # Instance variable, not shared
         self._register_timer_listener()
+        self._register_virtual_timer_handler()
 
     def name(self) -> str:
         return "Timers"
 
     def _register_timer_listener(self):
-        """Register the timer finished event listener."""
+        """Announce finished timer.* helpers via the pool's shared subscription.
 
-        @callback
-        def _handle_timer_state_change(event: Event):
-            """Handle timer state changes to detect when our timers finish."""
-            entity_id = event.data.get("entity_id", "")
-            if not entity_id.startswith("timer."):
-                return
-
-            new_state = event.data.get("new_state")
-            old_state = event.data.get("old_state")
-
-            if old_state is None or new_state is None:
-                return
-
-            # Check if timer just finished (went from active to idle)
-            if old_state.state == "active" and new_state.state == "idle":
-                self._on_timer_finished(entity_id)
-
-        self.hass.bus.async_listen(EVENT_STATE_CHANGED, _handle_timer_state_change)
-        _LOGGER.debug("Timer state change listener registered")
+        The latest agent's handler wins, so each finished timer is handled once.
+        """
+        async_get_timer_pool(self.hass).async_set_finished_handler(
+            self._on_timer_finished
+        )
+        _LOGGER.debug("Timer finished handler registered")
+
+    def _register_virtual_timer_handler(self):
+        """Announce finished virtual timers. The latest agent's handler wins, so each fires once."""
+        virtual_timers = get_virtual_timer_engine(self.hass)
+        if virtual_timers is not None:
+            virtual_timers.async_set_finished_handler(self._on_virtual_timer_finished)
+
+    def _virtual_timers(self) -> VirtualTimerEngine | None:
+        """The virtual timer engine, unless this agent is configured to use timer.* helpers."""
+        backend = self.client.runtime_options.get(CONF_TIMER_BACKEND, DEFAULT_TIMER_BACKEND)
+        if backend != TIMER_BACKEND_VIRTUAL:
+            return None
+        return get_virtual_timer_engine(self.hass)
 
-    def _get_available_timer(self) -> str | None:
-        """Find an available (idle) timer from the pool of exposed timers."""
-        for state in self.hass.states.async_all():
-            if not state.entity_id.startswith("timer."):
-                continue
-            # Timer is available if it's idle and not tracked by us
-            if state.state == "idle" and state.entity_id not in Timers._tracked_timers:
-                return state.entity_id
-        return None
+    def _reserve_timer(self, preferred: str | None) -> str | None:
+        """Reserve an idle timer from the pool, preferring the one the LLM picked."""
+        if preferred in Timers._tracked_timers:
+            preferred = None
+        return async_get_timer_pool(self.hass).async_reserve(preferred)
 
+    @callback
     def _on_timer_finished(self, entity_id: str):
         """Called when a timer finishes. Notify user if it's one we started."""
         tracked = Timers._tracked_timers.get(entity_id)
@@ -109,7 +123,26 @@ class Timers(AbstractSkill):
 
         # Remove from tracked timers
         del Timers._tracked_timers[entity_id]
+        self._announce_timer_finished(tracked, qpl_flow)
 
+    @callback
+    def _on_virtual_timer_finished(self, timer: VirtualTimer):
+        qpl_flow = self.qpl_provider.create_flow("timer_finished")
+        point = qpl_flow.mark_subspan_begin("on_timer_finished")
+        maybe(point).annotate("entity_id", timer.timer_id)
+        maybe(point).annotate("device_id", timer.device_id)
+        maybe(point).annotate("backend", TIMER_BACKEND_VIRTUAL)
+        _LOGGER.info(f"Virtual timer {timer.timer_id} finished, notifying user")
+
+        tracked = TrackedTimer(
+            entity_id=timer.timer_id,
+            device_id=timer.device_id,
+            conversation_id=timer.conversation_id,
+            friendly_name=timer.label,
+        )
+        self._announce_timer_finished(tracked, qpl_flow)
+
+    def _announce_timer_finished(self, tracked: TrackedTimer, qpl_flow: QPLFlow):
         # Use TTS to notify on the device that started the timer
         try:
             self.hass.async_create_task(self._notify_timer_finished(tracked, qpl_flow))
@@ -133,8 +166,10 @@ class Timers(AbstractSkill):
         # Try to use TTS on the device that started the timer
         if tracked.device_id:
             qpl_flow.mark_subspan_begin("find_tts_target")
-            target = await self._get_tts_target_for_device(tracked.device_id)
+            targets = async_get_tts_target_index(self.hass).get_targets(tracked.device_id)
+            target = targets[0] if targets else None
             point = qpl_flow.mark_subspan_end("find_tts_target")
+            maybe(point).annotate("tts_candidates", str(targets))
 
             if target:
                 tts_engine = self._get_tts_engine()
@@ -180,30 +215,6 @@ class Timers(AbstractSkill):
         else:
             qpl_flow.mark_failed("no notification sent")
 
-    async def _get_tts_target_for_device(self, device_id: str) -> str | None:
-        """Find a media_player entity associated with the given device for TTS."""
-        er = entity_registry.async_get(self.hass)
-        dr = device_registry.async_get(self.hass)
-
-        device = dr.async_get(device_id)
-        if device is None:
-            return None
-
-        # Look for media_player entities in the same area or on the same device
-        for entity in er.entities.values():
-            if not entity.entity_id.startswith("media_player."):
-                continue
-
-            # Check if entity is on the same device
-            if entity.device_id == device_id:
-                return entity.entity_id
-
-            # Check if entity is in the same area
-            if device.area_id and entity.area_id == device.area_id:
-                return entity.entity_id
-
-        return None
-
     def _get_tts_engine(self) -> str | None:
         """Get the configured TTS engine from the TTS subentry."""
         entry = self.client.entry
@@ -221,7 +232,7 @@ class Timers(AbstractSkill):
         self.last_actions = []
         prompt = await self._build_prompt(request, qpl_flow)
         qpl_flow.mark_subspan_begin("sending_message_to_llm")
-        llm_response = await self.client.send_message(prompt)
+        llm_response = await self.client.send_message(prompt, qpl_flow)
         point = qpl_flow.mark_subspan_end("sending_message_to_llm")
         llm_response = llm_response.replace("```json", "")
         llm_response = llm_response.replace("```", "")
@@ -241,39 +252,7 @@ class Timers(AbstractSkill):
                 response.async_set_speech(err)
                 return
 
-            messages = []
-            for cmd in commands:
-                action = cmd.get("action")
-                if action is None or action not in {"start", "cancel", "pause", "resume"}:
-                    messages.append("Invalid action")
-                    continue
-
-                entity_id = cmd.get("entity_id")
-                duration = cmd.get("duration")
-                context = cmd.get("context")
-                if context in {"", "timer"}:
-                    context = None
-
-                result = None
-                if action == "start":
-                    result = await self._start_timer(
-                        entity_id, duration, context, request, qpl_flow
-                    )
-                elif action == "cancel":
-                    result = await self._cancel_timer(entity_id, context, qpl_flow)
-                elif action == "pause":
-                    result = await self._pause_timer(entity_id, qpl_flow)
-                elif action == "resume":
-                    result = await self._resume_timer(entity_id, qpl_flow)
-
-                if result:
-                    messages.append(result)
-
-            # Combine all messages into a single response
-            if messages:
-                response.async_set_speech(". ".join(messages))
-            else:
-                response.async_set_speech("No timer actions performed")
+            await self._run_commands(commands, request, response, qpl_flow)
 
         except json.JSONDecodeError as err:
             qpl_flow.mark_failed(err.msg)
@@ -282,6 +261,92 @@ class Timers(AbstractSkill):
             qpl_flow.mark_failed(traceback.format_exc())
             response.async_set_speech("Failed to set timer")
 
+    async def try_fast_path(
+        self,
+        request: ConversationInput,
+        response: intent.IntentResponse,
+        qpl_flow: QPLFlow,
+    ) -> bool:
+        qpl_flow.mark_subspan_begin("timers_fast_path")
+        commands = parse_timer_command(request.text, self._timer_targets())
+        point = qpl_flow.mark_subspan_end("timers_fast_path")
+        if commands is None:
+            return False
+
+        maybe(point).annotate("commands", json.dumps(commands))
+        self.last_actions = []
+        try:
+            await self._run_commands(commands, request, response, qpl_flow)
+        except Exception:
+            qpl_flow.mark_failed(traceback.format_exc())
+            response.async_set_speech("Failed to set timer")
+        return True
+
+    async def _run_commands(
+        self,
+        commands: list[dict],
+        request: ConversationInput,
+        response: intent.IntentResponse,
+        qpl_flow: QPLFlow,
+    ):
+        messages = []
+        for cmd in commands:
+            action = cmd.get("action")
+            if action is None or action not in {"start", "cancel", "pause", "resume", "remaining"}:
+                messages.append("Invalid action")
+                continue
+
+            entity_id = cmd.get("entity_id")
+            duration = cmd.get("duration")
+            context = cmd.get("context")
+            if context in {"", "timer"}:
+                context = None
+
+            result = None
+            if action == "start":
+                result = await self._start_timer(
+                    entity_id, duration, context, request, qpl_flow
+                )
+            elif action == "cancel":
+                result = await self._cancel_timer(entity_id, context, qpl_flow)
+            elif action == "pause":
+                result = await self._pause_timer(entity_id, qpl_flow)
+            elif action == "resume":
+                result = await self._resume_timer(entity_id, qpl_flow)
+            elif action == "remaining":
+                result = self._remaining_time(entity_id, context, qpl_flow)
+
+            if result:
+                messages.append(result)
+
+        # Combine all messages into a single response
+        if messages:
+            response.async_set_speech(". ".join(messages))
+        else:
+            response.async_set_speech("No timer actions performed")
+
+    def _timer_targets(self) -> list[TimerTarget]:
+        """Timers the user can refer to, labelled with the context they were started with."""
+        virtual_timers = self._virtual_timers()
+        if virtual_timers is not None:
+            return [
+                TimerTarget(timer.timer_id, timer.label, timer.state)
+                for timer in virtual_timers.timers
+            ]
+
+        timer_pool = async_get_timer_pool(self.hass)
+        targets = []
+        for entity_id in timer_pool.entity_ids:
+            tracked = Timers._tracked_timers.get(entity_id)
+            targets.append(
+                TimerTarget(
+                    entity_id,
+                    tracked.friendly_name if tracked else None,
+                    timer_pool.get_state(entity_id),
+                )
+            )
+        return targets
+
     async def _start_timer(
         self,
         entity_id: str | None,
@@ -297,14 +362,21 @@ class Timers(AbstractSkill):
             qpl_flow.mark_canceled(err)
             return err
 
-        # If no entity_id provided or the specified one is busy, find an available timer
-        if entity_id is None or entity_id in Timers._tracked_timers:
-            available_timer = self._get_available_timer()
-            if available_timer is None:
-                err = "No available timers. All timers are currently in use."
-                qpl_flow.mark_canceled(err)
-                return err
-            entity_id = available_timer
+        virtual_timers = self._virtual_timers()
+        if virtual_timers is not None:
+            return self._start_virtual_timer(
+                virtual_timers, duration, context, request, qpl_flow
+            )
+        maybe(point).annotate("backend", TIMER_BACKEND_HELPERS)
+
+        # Reserve the requested timer, or any idle one if it's busy or not provided
+        timer_pool = async_get_timer_pool(self.hass)
+        maybe(point).annotate("timer_pool", json.dumps(timer_pool.utilization()))
+        entity_id = self._reserve_timer(entity_id)
+        if entity_id is None:
+            err = "No available timers. All timers are currently in use."
+            qpl_flow.mark_canceled(err)
+            return err
 
         # Normalize duration to HH:MM:SS format if needed
         duration = self._normalize_duration(duration)
@@ -319,6 +391,7 @@ class Timers(AbstractSkill):
             await self.hass.services.async_call(
                 "timer", "start", service_data, blocking=True
             )
+            timer_pool.async_mark_active(entity_id)
 
             # Record action for undo
             self.last_actions.append(TimerAction("start", entity_id, duration, context))
@@ -337,17 +410,51 @@ class Timers(AbstractSkill):
             )
 
             qpl_flow.mark_subspan_end("start_timer")
-
-            # Build friendly response
-            friendly_duration = self._format_duration_friendly(duration)
-            if context:
-                return f"{context} timer set for {friendly_duration}"
-            else:
-                return f"Timer set for {friendly_duration}"
+            return self._timer_set_message(duration, context)
         except Exception:
+            timer_pool.async_release(entity_id)
             qpl_flow.mark_failed(traceback.format_exc())
             return "Failed to set timer"
 
+    def _start_virtual_timer(
+        self,
+        virtual_timers: VirtualTimerEngine,
+        duration: str,
+        context: str | None,
+        request: ConversationInput,
+        qpl_flow: QPLFlow,
+    ) -> str:
+        duration = self._normalize_duration(duration)
+        seconds = self._duration_to_seconds(duration)
+        if not seconds:
+            err = f"Could not understand timer duration {duration}"
+            qpl_flow.mark_canceled(err)
+            return err
+
+        timer = virtual_timers.async_start(
+            seconds,
+            context,
+            request.device_id,
+            request.conversation_id,
+            mirror=self.client.runtime_options.get(CONF_TIMER_MIRROR_SENSORS, False),
+            entry_id=self.client.entry_id,
+        )
+        self.last_actions.append(TimerAction("start", timer.timer_id, duration, context))
+
+        point = qpl_flow.mark_subspan_end("start_timer")
+        maybe(point).annotate("backend", TIMER_BACKEND_VIRTUAL)
+        maybe(point).annotate("duration", duration)
+        maybe(point).annotate("entity_id", timer.timer_id)
+        maybe(point).annotate("context", context if context else "default")
+        maybe(point).annotate("virtual_timer_count", len(virtual_timers.timers))
+        return self._timer_set_message(duration, context)
+
+    def _timer_set_message(self, duration: str, context: str | None) -> str:
+        friendly_duration = self._format_duration_friendly(duration)
+        if context:
+            return f"{context} timer set for {friendly_duration}"
+        return f"Timer set for {friendly_duration}"
+
     async def _cancel_timer(
         self,
         entity_id: str | None,
@@ -361,6 +468,28 @@ class Timers(AbstractSkill):
             qpl_flow.mark_canceled(err)
             return err
 
+        if entity_id.startswith(VIRTUAL_TIMER_PREFIX):
+            maybe(point).annotate("entity_id", entity_id)
+            virtual_timers = get_virtual_timer_engine(self.hass)
+            timer = virtual_timers.async_cancel(entity_id) if virtual_timers else None
+            if timer is None:
+                err = "Timer not found"
+                qpl_flow.mark_canceled(err)
+                return err
+            self.last_actions.append(
+                TimerAction(
+                    "cancel",
+                    entity_id,
+                    self._seconds_to_duration(timer.remaining()),
+                    timer.label,
+                )
+            )
+            qpl_flow.mark_subspan_end("cancel_timer")
+            label = context or timer.label
+            if label is not None:
+                return f"Timer {label} cancelled"
+            return "Timer cancelled"
+
         # Get remaining time before cancelling so we can restore on undo
         remaining_duration = None
         state = self.hass.states.get(entity_id)
@@ -401,6 +530,16 @@ class Timers(AbstractSkill):
             return err
 
         maybe(point).annotate("entity_id", entity_id)
+        if entity_id.startswith(VIRTUAL_TIMER_PREFIX):
+            virtual_timers = get_virtual_timer_engine(self.hass)
+            if virtual_timers is None or virtual_timers.async_pause(entity_id) is None:
+                err = "Timer not found"
+                qpl_flow.mark_canceled(err)
+                return err
+            self.last_actions.append(TimerAction("pause", entity_id))
+            qpl_flow.mark_subspan_end("pause_timer")
+            return "Timer paused"
+
         await self.hass.services.async_call(
             "timer", "pause", {"entity_id": entity_id}, blocking=True
         )
@@ -424,6 +563,16 @@ class Timers(AbstractSkill):
             return err
 
         maybe(point).annotate("entity_id", entity_id)
+        if entity_id.startswith(VIRTUAL_TIMER_PREFIX):
+            virtual_timers = get_virtual_timer_engine(self.hass)
+            if virtual_timers is None or virtual_timers.async_resume(entity_id) is None:
+                err = "Timer not found"
+                qpl_flow.mark_canceled(err)
+                return err
+            self.last_actions.append(TimerAction("resume", entity_id))
+            qpl_flow.mark_subspan_end("resume_timer")
+            return "Timer resumed"
+
         await self.hass.services.async_call(
             "timer", "start", {"entity_id": entity_id}, blocking=True
         )
@@ -434,6 +583,73 @@ class Timers(AbstractSkill):
         qpl_flow.mark_subspan_end("resume_timer")
         return "Timer resumed"
 
+    def _remaining_time(
+        self,
+        entity_id: str | None,
+        context: str | None,
+        qpl_flow: QPLFlow,
+    ) -> str:
+        point = qpl_flow.mark_subspan_begin("timer_remaining")
+
+        if entity_id is None:
+            err = "No timer specified"
+            qpl_flow.mark_canceled(err)
+            return err
+
+        maybe(point).annotate("entity_id", entity_id)
+        seconds = None
+        paused = False
+        if entity_id.startswith(VIRTUAL_TIMER_PREFIX):
+            virtual_timers = get_virtual_timer_engine(self.hass)
+            timer = virtual_timers.get(entity_id) if virtual_timers else None
+            if timer is not None:
+                seconds = timer.remaining()
+                paused = timer.state == "paused"
+                context = context or timer.label
+        else:
+            state = self.hass.states.get(entity_id)
+            if state is not None and state.state == "active":
+                finishes_at = dt_util.parse_datetime(
+                    state.attributes.get("finishes_at") or ""
+                )
+                if finishes_at is not None:
+                    seconds = max(0.0, (finishes_at - dt_util.utcnow()).total_seconds())
+            elif state is not None and state.state == "paused":
+                seconds = self._duration_to_seconds(
+                    state.attributes.get("remaining") or ""
+                )
+                paused = True
+            tracked = Timers._tracked_timers.get(entity_id)
+            if tracked is not None:
+                context = context or tracked.friendly_name
+
+        if seconds is None:
+            err = "That timer is not running"
+            qpl_flow.mark_canceled(err)
+            return err
+
+        friendly = self._format_duration_friendly(self._seconds_to_duration(seconds))
+        qpl_flow.mark_subspan_end("timer_remaining")
+        message = f"{friendly} left on the {context} timer" if context else f"{friendly} left"
+        if paused:
+            message += ", it is paused"
+        return message
+
+    def _duration_to_seconds(self, duration: str) -> int | None:
+        """Convert HH:MM:SS to seconds."""
+        match = re.match(r"^(\d+):(\d{2}):(\d{2})(?:\.\d+)?$", duration.strip())
+        if not match:
+            return None
+        hours, minutes, seconds = (int(part) for part in match.groups())
+        return hours * 3600 + minutes * 60 + seconds
+
+    def _seconds_to_duration(self, seconds: float) -> str:
+        """Convert seconds to HH:MM:SS."""
+        total_seconds = round(seconds)
+        hours = int(total_seconds // 3600)
+        minutes = int((total_seconds % 3600) // 60)
+        return f"{hours:02d}:{minutes:02d}:{total_seconds % 60:02d}"
+
     def _normalize_duration(self, duration: str) -> str:
         """Normalize duration to HH:MM:SS format."""
         # If already in HH:MM:SS format, return as is
@@ -551,8 +767,25 @@ class Timers(AbstractSkill):
         qpl_flow.mark_subspan_begin("build_prompt")
         qpl_flow.mark_subspan_begin("querying_entities_from_ha")
 
-        for state in self.hass.states.async_all():
-            if not state.entity_id.startswith("timer."):
+        # Virtual timers replace the timer.* helpers entirely, the pool is only a fallback
+        virtual_timers = self._virtual_timers()
+        helper_timers = async_get_timer_pool(self.hass).entity_ids
+        if virtual_timers is not None:
+            helper_timers = []
+            for timer in virtual_timers.timers:
+                entities.append(
+                    {
+                        "entity_id": timer.timer_id,
+                        "friendly_name": timer.label or "timer",
+                        "state": timer.state,
+                        "context": timer.label,
+                        "remaining": self._seconds_to_duration(timer.remaining()),
+                    }
+                )
+
+        for entity_id in helper_timers:
+            state = self.hass.states.get(entity_id)
+            if state is None:
                 continue
 
             entry = {
@@ -572,19 +805,33 @@ class Timers(AbstractSkill):
             entities.append(entry)
 
         point = qpl_flow.mark_subspan_end("querying_entities_from_ha")
-        timer_list = json.dumps(entities)
-        maybe(point).annotate("timer_list", timer_list)
+        maybe(point).annotate("timer_list", json.dumps(entities))
 
         qpl_flow.mark_subspan_begin("render_prompt")
         prompt_key = os.path.join(os.path.dirname(__file__), "timers.md")
-        prompt_template = await self.prompt_cache.get(prompt_key, request.conversation_id)
-        template = Template(prompt_template, trim_blocks=True)
+        template = await self.prompt_cache.get(prompt_key)
+
+        budget = self.client.token_budgeter.create_budget()
+        budget.reserve(
+            "static_instructions",
+            template.render(
+                user_prompt=request.text,
+                virtual_timers=virtual_timers is not None,
+            ),
+        )
+        timer_list = json.dumps(budget.fit_items("snapshot", entities))
+        conversation_history = self.prompt_cache.get_history(
+            request.conversation_id, budget
+        )
 
         output = template.render(
             timer_list=timer_list,
+            virtual_timers=virtual_timers is not None,
             user_prompt=request.text,
+            conversation_history=conversation_history,
         )
         point = qpl_flow.mark_subspan_end("render_prompt")
         maybe(point).annotate("prompt", output)
+        budget.annotate(point)
         qpl_flow.mark_subspan_end("build_prompt")
         return output
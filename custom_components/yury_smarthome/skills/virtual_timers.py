@@ -0,0 +1,264 @@
+"""In-process timers scheduled on the event loop, not limited by timer.* helpers."""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+import heapq
+import logging
+import time
+from typing import Callable
+from uuid import uuid4
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from custom_components.yury_smarthome.const import DATA_VIRTUAL_TIMERS, DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_KEY = f"{DOMAIN}.virtual_timers"
+STORAGE_VERSION = 1
+# Persist at most this often (seconds) when timers change
+SAVE_DELAY = 1
+# Timers that expired longer ago than this while HA was down are dropped, not announced
+RESTORE_GRACE_SECONDS = 60
+
+VIRTUAL_TIMER_PREFIX = "virtual."
+
+# Events passed to listeners
+TIMER_STARTED = "started"
+TIMER_UPDATED = "updated"
+TIMER_REMOVED = "removed"
+
+
+@dataclass
+class VirtualTimer:
+    timer_id: str
+    duration: float  # seconds
+    label: str | None
+    device_id: str | None
+    conversation_id: str | None
+    state: str  # "active" or "paused"
+    deadline: float | None = None  # Unix timestamp when active
+    paused_remaining: float | None = None  # seconds left when paused
+    mirror: bool = False  # Expose as a sensor entity
+    entry_id: str | None = None  # Config entry whose sensor platform mirrors it
+
+    def remaining(self, now: float | None = None) -> float:
+        """Seconds left on the timer."""
+        if self.state == "paused" or self.deadline is None:
+            return self.paused_remaining or 0.0
+        return max(0.0, self.deadline - (now if now is not None else time.time()))
+
+
+class VirtualTimerEngine:
+    """Heap scheduler for virtual timers.
+
+    A single loop.call_at handle is armed for the earliest deadline. Cancelled,
+    paused or rescheduled timers leave stale heap entries behind, which are
+    skipped lazily when they reach the top of the heap. Nothing is armed until
+    a finished handler is set, so timers restored at setup are announced once
+    the Timers skill is ready instead of firing into the void.
+    """
+
+    hass: HomeAssistant
+    _timers: dict[str, VirtualTimer]
+    _heap: list[tuple[float, str]]
+
+    def __init__(self, hass: HomeAssistant):
+        self.hass = hass
+        self._timers = {}
+        self._heap = []
+        self._handle = None
+        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._listeners: list[Callable[[VirtualTimer, str], None]] = []
+        self._finished_handler: Callable[[VirtualTimer], None] | None = None
+
+    async def async_load(self):
+        """Restore timers from the persisted snapshot."""
+        data = await self._store.async_load()
+        if not data:
+            return
+
+        now = time.time()
+        for raw in data.get("timers", []):
+            timer = VirtualTimer(**raw)
+            if (
+                timer.state == "active"
+                and timer.deadline is not None
+                and timer.deadline < now - RESTORE_GRACE_SECONDS
+            ):
+                _LOGGER.debug("Dropping virtual timer %s that expired while stopped", timer.timer_id)
+                continue
+            self._timers[timer.timer_id] = timer
+            if timer.state == "active" and timer.deadline is not None:
+                heapq.heappush(self._heap, (timer.deadline, timer.timer_id))
+
+        _LOGGER.debug("Restored %d virtual timers", len(self._timers))
+        self._schedule()
+
+    async def async_shutdown(self):
+        """Stop scheduling and persist the current snapshot."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self._listeners = []
+        self._finished_handler = None
+        await self._store.async_save(self._data_to_save())
+        if self.hass.data.get(DATA_VIRTUAL_TIMERS) is self:
+            del self.hass.data[DATA_VIRTUAL_TIMERS]
+
+    def _data_to_save(self) -> dict:
+        return {"timers": [asdict(timer) for timer in self._timers.values()]}
+
+    def _save(self):
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def async_add_listener(
+        self, listener: Callable[[VirtualTimer, str], None]
+    ) -> Callable[[], None]:
+        """Listen for timers being started, updated or removed."""
+        self._listeners.append(listener)
+
+        @callback
+        def remove_listener():
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+        return remove_listener
+
+    @callback
+    def async_set_finished_handler(self, handler: Callable[[VirtualTimer], None]):
+        """Set the single handler called when a timer runs out."""
+        self._finished_handler = handler
+        # Timers restored before the handler existed may already be due
+        self._schedule()
+
+    def _notify(self, timer: VirtualTimer, event: str):
+        for listener in list(self._listeners):
+            try:
+                listener(timer, event)
+            except Exception:
+                _LOGGER.exception("Virtual timer listener failed")
+
+    @property
+    def timers(self) -> list[VirtualTimer]:
+        return list(self._timers.values())
+
+    def get(self, timer_id: str) -> VirtualTimer | None:
+        return self._timers.get(timer_id)
+
+    @callback
+    def async_start(
+        self,
+        duration: float,
+        label: str | None,
+        device_id: str | None,
+        conversation_id: str | None,
+        mirror: bool = False,
+        entry_id: str | None = None,
+    ) -> VirtualTimer:
+        timer = VirtualTimer(
+            timer_id=f"{VIRTUAL_TIMER_PREFIX}{uuid4().hex[:8]}",
+            duration=duration,
+            label=label,
+            device_id=device_id,
+            conversation_id=conversation_id,
+            state="active",
+            deadline=time.time() + duration,
+            mirror=mirror,
+            entry_id=entry_id,
+        )
+        self._timers[timer.timer_id] = timer
+        heapq.heappush(self._heap, (timer.deadline, timer.timer_id))
+        self._schedule()
+        self._save()
+        self._notify(timer, TIMER_STARTED)
+        return timer
+
+    @callback
+    def async_cancel(self, timer_id: str) -> VirtualTimer | None:
+        timer = self._timers.pop(timer_id, None)
+        if timer is None:
+            return None
+        # The heap entry goes stale and is skipped when it reaches the top
+        self._schedule()
+        self._save()
+        self._notify(timer, TIMER_REMOVED)
+        return timer
+
+    @callback
+    def async_pause(self, timer_id: str) -> VirtualTimer | None:
+        timer = self._timers.get(timer_id)
+        if timer is None or timer.state != "active":
+            return timer
+        timer.paused_remaining = timer.remaining()
+        timer.deadline = None
+        timer.state = "paused"
+        self._schedule()
+        self._save()
+        self._notify(timer, TIMER_UPDATED)
+        return timer
+
+    @callback
+    def async_resume(self, timer_id: str) -> VirtualTimer | None:
+        timer = self._timers.get(timer_id)
+        if timer is None or timer.state != "paused":
+            return timer
+        timer.deadline = time.time() + (timer.paused_remaining or 0.0)
+        timer.paused_remaining = None
+        timer.state = "active"
+        heapq.heappush(self._heap, (timer.deadline, timer.timer_id))
+        self._schedule()
+        self._save()
+        self._notify(timer, TIMER_UPDATED)
+        return timer
+
+    def _is_current(self, entry: tuple[float, str]) -> bool:
+        deadline, timer_id = entry
+        timer = self._timers.get(timer_id)
+        return timer is not None and timer.state == "active" and timer.deadline == deadline
+
+    def _schedule(self):
+        """Arm the loop for the earliest live deadline."""
+        while self._heap and not self._is_current(self._heap[0]):
+            heapq.heappop(self._heap)
+
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        if not self._heap or self._finished_handler is None:
+            return
+
+        loop = self.hass.loop
+        delay = max(0.0, self._heap[0][0] - time.time())
+        self._handle = loop.call_at(loop.time() + delay, self._fire_due)
+
+    @callback
+    def _fire_due(self):
+        self._handle = None
+        now = time.time()
+        finished = []
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            if not self._is_current(entry):
+                continue
+            finished.append(self._timers.pop(entry[1]))
+
+        self._schedule()
+        if not finished:
+            return
+
+        self._save()
+        for timer in finished:
+            self._notify(timer, TIMER_REMOVED)
+            if self._finished_handler is not None:
+                try:
+                    self._finished_handler(timer)
+                except Exception:
+                    _LOGGER.exception("Virtual timer finished handler failed")
+
+
+def get_virtual_timer_engine(hass: HomeAssistant) -> VirtualTimerEngine | None:
+    """Get the engine set up by the integration, if any."""
+    return hass.data.get(DATA_VIRTUAL_TIMERS)
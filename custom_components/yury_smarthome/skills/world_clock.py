@@ -3,7 +3,6 @@ import json
 import os
 from datetime import datetime
 from zoneinfo import ZoneInfo
-from jinja2 import Template
 from homeassistant.helpers import intent
 from homeassistant.components.conversation import ConversationInput
 from custom_components.yury_smarthome.qpl import QPLFlow
@@ -23,7 +22,7 @@ class WorldClock(AbstractSkill):
     ):
         prompt = await self._build_prompt(request, qpl_flow)
         qpl_flow.mark_subspan_begin("sending_message_to_llm")
-        llm_response = await self.client.send_message(prompt)
+        llm_response = await self.client.send_message(prompt, qpl_flow)
         point = qpl_flow.mark_subspan_end("sending_message_to_llm")
         llm_response = llm_response.replace("```json", "")
         llm_response = llm_response.replace("```", "")
@@ -79,10 +78,19 @@ class WorldClock(AbstractSkill):
     async def _build_prompt(self, request: ConversationInput, qpl_flow: QPLFlow) -> str:
         qpl_flow.mark_subspan_begin("build_prompt")
         prompt_key = os.path.join(os.path.dirname(__file__), "world_clock.md")
-        prompt_template = await self.prompt_cache.get(prompt_key, request.conversation_id)
-        template = Template(prompt_template, trim_blocks=True)
+        template = await self.prompt_cache.get(prompt_key)
 
-        output = template.render(user_prompt=request.text)
+        budget = self.client.token_budgeter.create_budget()
+        budget.reserve("static_instructions", template.render(user_prompt=request.text))
+        conversation_history = self.prompt_cache.get_history(
+            request.conversation_id, budget
+        )
+
+        output = template.render(
+            user_prompt=request.text,
+            conversation_history=conversation_history,
+        )
         point = qpl_flow.mark_subspan_end("build_prompt")
         maybe(point).annotate("prompt", output)
+        budget.annotate(point)
         return output
@@ -0,0 +1,173 @@
+"""Token budgeting for prompt assembly."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from typing import Any
+
+from .maybe import maybe
+
+_LOGGER = logging.getLogger(__name__)
+
+# Starting characters-per-token ratio, roughly right for English and JSON
+DEFAULT_CHARS_PER_TOKEN = 4.0
+# Weight of a new (estimated, actual) observation when calibrating the ratio
+CALIBRATION_SMOOTHING = 0.2
+# prompt_eval_count leaves out the tokens of a prefix the server had cached from
+# the previous prompt, so prompts sharing more than this much of it are skipped
+MAX_REUSED_PREFIX_SHARE = 0.05
+# Tokens kept free for the model's answer unless a skill asks for a different amount
+DEFAULT_RESPONSE_TOKENS = 512
+
+
+class TokenBudgeter:
+    """Estimates prompt size and calibrates the estimate against prompt_eval_count."""
+
+    context_length: int
+    chars_per_token: float
+    samples: int
+    _last_prompt: str
+
+    def __init__(self, context_length: int):
+        self.context_length = context_length
+        self.chars_per_token = DEFAULT_CHARS_PER_TOKEN
+        self.samples = 0
+        self._last_prompt = ""
+
+    def estimate(self, text: str) -> int:
+        """Estimate the number of tokens in the given text."""
+        if not text:
+            return 0
+        return int(len(text) / self.chars_per_token) + 1
+
+    def create_budget(
+        self, response_tokens: int = DEFAULT_RESPONSE_TOKENS
+    ) -> PromptBudget:
+        """Create a budget for one prompt, leaving room for the response."""
+        return PromptBudget(self, max(0, self.context_length - response_tokens))
+
+    def record(self, prompt: str, actual_tokens: int | None, point=None):
+        """Record the actual prompt_eval_count for a prompt and recalibrate.
+
+        The estimate, the actual count and their ratio are attached to the QPL
+        point if given.
+        """
+        if not prompt or not actual_tokens:
+            return
+
+        estimated = self.estimate(prompt)
+        maybe(point).annotate("estimated_tokens", estimated)
+        maybe(point).annotate("actual_tokens", actual_tokens)
+        maybe(point).annotate("actual_to_estimated", round(actual_tokens / estimated, 3))
+
+        reused = len(os.path.commonprefix([prompt, self._last_prompt]))
+        self._last_prompt = prompt
+        if reused > len(prompt) * MAX_REUSED_PREFIX_SHARE:
+            maybe(point).annotate("reused_prefix_chars", reused)
+            maybe(point).annotate("calibrated", False)
+            _LOGGER.debug(
+                "Prompt reused a cached prefix of %d chars, not calibrating", reused
+            )
+            return
+
+        observed = len(prompt) / actual_tokens
+        self.chars_per_token += CALIBRATION_SMOOTHING * (
+            observed - self.chars_per_token
+        )
+        self.samples += 1
+        maybe(point).annotate("calibrated", True)
+        maybe(point).annotate("chars_per_token", round(self.chars_per_token, 3))
+        _LOGGER.debug(
+            "Prompt tokens estimated %d, actual %d, calibrated to %.2f chars per token",
+            estimated,
+            actual_tokens,
+            self.chars_per_token,
+        )
+
+
+class PromptBudget:
+    """Token budget for assembling a single prompt.
+
+    Sections are accounted in priority order: whatever is reserved or fitted
+    first is kept, and later (lower-priority) sections are trimmed to fit what
+    is left.
+    """
+
+    budgeter: TokenBudgeter
+    limit: int
+    sections: dict[str, int]
+    trimmed: dict[str, int]
+
+    def __init__(self, budgeter: TokenBudgeter, limit: int):
+        self.budgeter = budgeter
+        self.limit = limit
+        self.sections = {}
+        self.trimmed = {}
+
+    @property
+    def used(self) -> int:
+        return sum(self.sections.values())
+
+    @property
+    def remaining(self) -> int:
+        return max(0, self.limit - self.used)
+
+    def reserve(self, name: str, text: str) -> str:
+        """Account for a section that is always included in full."""
+        self.sections[name] = self.sections.get(name, 0) + self.budgeter.estimate(text)
+        return text
+
+    def fit_items(self, name: str, items: list[Any], keep_last: bool = False) -> list[Any]:
+        """Keep as many items of a JSON list section as fit in the remaining budget.
+
+        Items are kept from the start of the list, or from the end if keep_last
+        is set, so callers should order items by importance.
+        """
+        available = self.remaining
+        ordered = list(reversed(items)) if keep_last else items
+        used = self.budgeter.estimate("[]")
+        kept = []
+        for item in ordered:
+            # +1 for the separator between items
+            cost = self.budgeter.estimate(json.dumps(item)) + 1
+            if used + cost > available:
+                break
+            kept.append(item)
+            used += cost
+
+        if keep_last:
+            kept.reverse()
+        self.sections[name] = used
+        if len(kept) < len(items):
+            self.trimmed[name] = len(items) - len(kept)
+        return kept
+
+    def fit_text(self, name: str, candidates: list[str]) -> str:
+        """Pick the first candidate text that fits in the remaining budget.
+
+        Candidates should be ordered from the most to the least complete version
+        of the section. Returns an empty string if none fit.
+        """
+        available = self.remaining
+        for index, text in enumerate(candidates):
+            tokens = self.budgeter.estimate(text)
+            if tokens <= available:
+                self.sections[name] = tokens
+                if index > 0:
+                    self.trimmed[name] = index
+                return text
+
+        self.sections[name] = 0
+        if candidates:
+            self.trimmed[name] = len(candidates)
+        return ""
+
+    def annotate(self, point):
+        """Attach the budget breakdown to a QPL point."""
+        maybe(point).annotate("token_budget", self.limit)
+        maybe(point).annotate("estimated_tokens", self.used)
+        maybe(point).annotate("estimated_section_tokens", json.dumps(self.sections))
+        if self.trimmed:
+            maybe(point).annotate("trimmed_sections", json.dumps(self.trimmed))
@@ -0,0 +1,159 @@
+"""Index of TTS-capable media players by satellite device and area."""
+
+from __future__ import annotations
+
+import logging
+from typing import Callable
+
+from homeassistant.components.media_player import MediaPlayerEntityFeature
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import area_registry, device_registry, entity_registry
+
+from .area_resolver import async_get_area_resolver
+from .const import DATA_TTS_TARGETS
+
+_LOGGER = logging.getLogger(__name__)
+
+MEDIA_PLAYER_DOMAIN = "media_player"
+
+
+class TtsTargetIndex:
+    """Maps a satellite device to a ranked list of media players to speak on.
+
+    Ranking: overrides configured by any loaded entry, then players on the
+    satellite itself, then players in the satellite's area. Within a group,
+    players that support announcements come before players that can only play
+    media. The index is rebuilt lazily on the first lookup after an entity,
+    device or area registry update.
+    Areas come from the shared AreaResolver.
+    """
+
+    hass: HomeAssistant
+    _by_device: dict[str, list[str]]
+    _by_area: dict[str, list[str]]
+    _overrides: dict[str, dict[str, str]]
+    _dirty: bool
+    _unsubscribers: list[Callable[[], None]]
+
+    def __init__(self, hass: HomeAssistant):
+        self.hass = hass
+        self._by_device = {}
+        self._by_area = {}
+        self._overrides = {}
+        self._dirty = True
+        self._unsubscribers = []
+
+    @callback
+    def async_setup(self):
+        """Subscribe to registry updates."""
+        for event_type in (
+            entity_registry.EVENT_ENTITY_REGISTRY_UPDATED,
+            device_registry.EVENT_DEVICE_REGISTRY_UPDATED,
+            area_registry.EVENT_AREA_REGISTRY_UPDATED,
+        ):
+            self._unsubscribers.append(
+                self.hass.bus.async_listen(event_type, self._async_invalidate)
+            )
+
+    @callback
+    def async_shutdown(self):
+        """Unsubscribe from registry updates and drop the shared instance."""
+        for unsubscribe in self._unsubscribers:
+            unsubscribe()
+        self._unsubscribers = []
+        if self.hass.data.get(DATA_TTS_TARGETS) is self:
+            del self.hass.data[DATA_TTS_TARGETS]
+
+    @callback
+    def _async_invalidate(self, event: Event):
+        self._dirty = True
+
+    @callback
+    def async_set_overrides(
+        self, entry_id: str, overrides: dict[str, str]
+    ) -> Callable[[], None]:
+        """Set a config entry's satellite device_id -> media_player overrides."""
+        self._overrides[entry_id] = dict(overrides)
+
+        @callback
+        def remove_overrides():
+            self._overrides.pop(entry_id, None)
+
+        return remove_overrides
+
+    def get_targets(self, device_id: str | None) -> list[str]:
+        """Ranked media players to use for TTS on behalf of the given device."""
+        if device_id is None:
+            return []
+        self._ensure_built()
+
+        targets = []
+        for overrides in self._overrides.values():
+            override = overrides.get(device_id)
+            if override is not None:
+                targets.append(override)
+        targets.extend(self._by_device.get(device_id, []))
+        location = async_get_area_resolver(self.hass).get_device_location(device_id)
+        if location is not None and location.area_id is not None:
+            targets.extend(self._by_area.get(location.area_id, []))
+
+        # Keep the first occurrence of every player
+        return list(dict.fromkeys(targets))
+
+    def get_target(self, device_id: str | None) -> str | None:
+        """The best media player to use for TTS on behalf of the given device."""
+        targets = self.get_targets(device_id)
+        return targets[0] if targets else None
+
+    def _ensure_built(self):
+        if not self._dirty:
+            return
+
+        er = entity_registry.async_get(self.hass)
+        area_resolver = async_get_area_resolver(self.hass)
+
+        by_device: dict[str, list[tuple[int, str]]] = {}
+        by_area: dict[str, list[tuple[int, str]]] = {}
+        for entity in er.entities.values():
+            if entity.domain != MEDIA_PLAYER_DOMAIN or entity.disabled:
+                continue
+
+            features = entity.supported_features or 0
+            if features & MediaPlayerEntityFeature.MEDIA_ANNOUNCE:
+                rank = 0
+            elif features & MediaPlayerEntityFeature.PLAY_MEDIA:
+                rank = 1
+            else:
+                continue
+
+            if entity.device_id is not None:
+                by_device.setdefault(entity.device_id, []).append((rank, entity.entity_id))
+            location = area_resolver.get_entity_location(entity.entity_id)
+            if location is not None and location.area_id is not None:
+                by_area.setdefault(location.area_id, []).append((rank, entity.entity_id))
+
+        self._by_device = {
+            key: [entity_id for _, entity_id in sorted(players)]
+            for key, players in by_device.items()
+        }
+        self._by_area = {
+            key: [entity_id for _, entity_id in sorted(players)]
+            for key, players in by_area.items()
+        }
+        self._dirty = False
+        _LOGGER.debug(
+            "TTS target index rebuilt: %d devices, %d areas",
+            len(self._by_device),
+            len(self._by_area),
+        )
+
+
+@callback
+def async_get_tts_target_index(hass: HomeAssistant) -> TtsTargetIndex:
+    """Get the shared TtsTargetIndex, creating it on first use."""
+    index = hass.data.get(DATA_TTS_TARGETS)
+    if index is None:
+        index = TtsTargetIndex(hass)
+        index.async_setup()
+        hass.data[DATA_TTS_TARGETS] = index
+    return index
@@ -0,0 +1,93 @@
+"""Tests for the local transport-control grammar."""
+
+import importlib.util
+from pathlib import Path
+import sys
+
+import pytest
+
+# Loaded by path: the package __init__ needs Home Assistant, the parser doesn't
+_PATH = (
+    Path(__file__).parents[1]
+    / "custom_components"
+    / "yury_smarthome"
+    / "skills"
+    / "music_parser.py"
+)
+_spec = importlib.util.spec_from_file_location("music_parser", _PATH)
+music_parser = importlib.util.module_from_spec(_spec)
+sys.modules["music_parser"] = music_parser
+_spec.loader.exec_module(music_parser)
+
+PlayerTarget = music_parser.PlayerTarget
+
+
+@pytest.mark.parametrize(
+    ("text", "action"),
+    [
+        ("pause", "pause"),
+        ("Pause the music, please", "pause"),
+        ("skip this song", "next"),
+        ("play the next track", "next"),
+        ("previous song", "previous"),
+        ("mute", "mute"),
+        ("unmute the sound", "unmute"),
+    ],
+)
+def test_transport(text, action):
+    assert music_parser.parse_music_command(text) == {"action": action, "entity_id": None}
+
+
+@pytest.mark.parametrize(
+    ("text", "action", "amount"),
+    [
+        ("volume up", "volume_up", 10),
+        ("turn the volume down by 20", "volume_down", 20),
+        ("turn it up 5 percent", "volume_up", 5),
+        ("make it a bit quieter", "volume_down", 10),
+    ],
+)
+def test_volume(text, action, amount):
+    assert music_parser.parse_music_command(text) == {
+        "action": action,
+        "entity_id": None,
+        "amount": amount,
+    }
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "pause the kitchen speaker",
+        "play some jazz",
+        "volume up by 200",
+        "stop the timer",
+    ],
+)
+def test_left_to_the_llm(text):
+    assert music_parser.parse_music_command(text) is None
+
+
+def test_player_playing_in_area_wins():
+    players = [
+        PlayerTarget("media_player.kitchen", "kitchen", "playing"),
+        PlayerTarget("media_player.office", "office", "playing"),
+    ]
+    assert music_parser.resolve_player(players, "office") == "media_player.office"
+
+
+def test_only_player_playing_anywhere():
+    players = [
+        PlayerTarget("media_player.kitchen", "kitchen", "playing"),
+        PlayerTarget("media_player.office", "office", "idle"),
+        PlayerTarget("media_player.office_tv", "office", "idle"),
+    ]
+    assert music_parser.resolve_player(players, "office") == "media_player.kitchen"
+
+
+def test_ambiguous_player():
+    players = [
+        PlayerTarget("media_player.kitchen", "kitchen", "playing"),
+        PlayerTarget("media_player.bedroom", "bedroom", "playing"),
+    ]
+    assert music_parser.resolve_player(players, "office") is None
@@ -0,0 +1,73 @@
+"""Tests for the local expansion of recurring reminders."""
+
+from datetime import datetime, timedelta, timezone
+import importlib.util
+from pathlib import Path
+import sys
+
+# Loaded by path: the package __init__ needs Home Assistant, the engine doesn't
+_PATH = (
+    Path(__file__).parents[1]
+    / "custom_components"
+    / "yury_smarthome"
+    / "skills"
+    / "reminder_occurrences.py"
+)
+_spec = importlib.util.spec_from_file_location("reminder_occurrences", _PATH)
+reminder_occurrences = importlib.util.module_from_spec(_spec)
+sys.modules["reminder_occurrences"] = reminder_occurrences
+_spec.loader.exec_module(reminder_occurrences)
+
+TZ = timezone(timedelta(hours=2))
+
+
+def _expand(rrule: str, start: datetime, end: datetime) -> list[datetime]:
+    engine = reminder_occurrences.OccurrenceEngine()
+    anchor = datetime(2026, 10, 19, 9, 0, tzinfo=TZ)  # A Monday
+    return engine.expand("uid", rrule, anchor, start, end)
+
+
+def test_weekly_rule():
+    starts = _expand(
+        "FREQ=WEEKLY;BYDAY=MO",
+        datetime(2026, 10, 20, tzinfo=TZ),
+        datetime(2026, 11, 3, tzinfo=TZ),
+    )
+    assert starts == [
+        datetime(2026, 10, 26, 9, 0, tzinfo=TZ),
+        datetime(2026, 11, 2, 9, 0, tzinfo=TZ),
+    ]
+
+
+def test_utc_until_is_applied():
+    starts = _expand(
+        "FREQ=WEEKLY;BYDAY=MO;UNTIL=20261231T235959Z",
+        datetime(2026, 12, 20, tzinfo=TZ),
+        datetime(2027, 1, 10, tzinfo=TZ),
+    )
+    assert starts == [
+        datetime(2026, 12, 21, 9, 0, tzinfo=TZ),
+        datetime(2026, 12, 28, 9, 0, tzinfo=TZ),
+    ]
+
+
+def test_utc_until_on_the_last_occurrence():
+    # 07:00 UTC is 09:00 in the series' timezone, so the last Monday is included
+    starts = _expand(
+        "FREQ=WEEKLY;BYDAY=MO;UNTIL=20261102T070000Z",
+        datetime(2026, 10, 20, tzinfo=TZ),
+        datetime(2026, 11, 20, tzinfo=TZ),
+    )
+    assert starts == [
+        datetime(2026, 10, 26, 9, 0, tzinfo=TZ),
+        datetime(2026, 11, 2, 9, 0, tzinfo=TZ),
+    ]
+
+
+def test_local_until_is_unchanged():
+    starts = _expand(
+        "FREQ=DAILY;UNTIL=20261021T090000",
+        datetime(2026, 10, 19, tzinfo=TZ),
+        datetime(2026, 10, 25, tzinfo=TZ),
+    )
+    assert [s.day for s in starts] == [19, 20, 21]
@@ -0,0 +1,125 @@
+"""Tests for the local reminder grammar."""
+
+import importlib.util
+from pathlib import Path
+import sys
+
+import pytest
+
+# Loaded by path: the package __init__ needs Home Assistant, the parser doesn't
+_PATH = (
+    Path(__file__).parents[1]
+    / "custom_components"
+    / "yury_smarthome"
+    / "skills"
+    / "reminder_parser.py"
+)
+_spec = importlib.util.spec_from_file_location("reminder_parser", _PATH)
+reminder_parser = importlib.util.module_from_spec(_spec)
+sys.modules["reminder_parser"] = reminder_parser
+_spec.loader.exec_module(reminder_parser)
+
+
+def _time(text: str) -> tuple[str, str] | None:
+    """(day, time) of an absolute reminder, None if it goes to the LLM."""
+    action = reminder_parser.parse_reminder_request(text)
+    if action is None:
+        return None
+    value = action["time_spec"]["value"]
+    return value["day"], value["time"]
+
+
+def test_relative():
+    action = reminder_parser.parse_reminder_request(
+        "remind me in 20 minutes to check the oven"
+    )
+    assert action["summary"] == "check the oven"
+    assert action["target"] == "yury"
+    assert action["time_spec"] == {"type": "relative", "value": {"minutes": 20}}
+    assert action["recurrence"] is None
+
+
+def test_tomorrow_at_bare_hour():
+    action = reminder_parser.parse_reminder_request("remind me tomorrow at 9 to call mom")
+    assert action["summary"] == "call mom"
+    assert action["time_spec"] == {
+        "type": "absolute",
+        "value": {"day": "tomorrow", "time": "09:00"},
+    }
+
+
+def test_every_monday():
+    action = reminder_parser.parse_reminder_request(
+        "remind me every monday at 8am to take out the trash"
+    )
+    assert action["time_spec"]["value"] == {"day": "next_monday", "time": "08:00"}
+    assert action["recurrence"]["frequency"] == "weekly"
+    assert action["recurrence"]["byday"] == ["MO"]
+
+
+def test_every_monday_at_bare_hour():
+    action = reminder_parser.parse_reminder_request(
+        "remind me every monday at 8 to take out trash"
+    )
+    assert action["time_spec"]["value"] == {"day": "next_monday", "time": "08:00"}
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("remind me tonight at 8 to lock the door", ("today", "20:00")),
+        ("remind me this evening at 7 to water plants", ("today", "19:00")),
+        ("remind me tomorrow afternoon at 3 to call bob", ("tomorrow", "15:00")),
+        ("remind me tomorrow morning at 6 to run", ("tomorrow", "06:00")),
+        ("remind me today at 12 to eat", ("today", "12:00")),
+        ("remind me today at 17:30 to leave", ("today", "17:30")),
+        ("remind me tomorrow at 3pm to call bob", ("tomorrow", "15:00")),
+        ("remind me on friday evening to call bob", ("next_friday", "18:00")),
+        ("remind me on friday evening at 7 to call bob", ("next_friday", "19:00")),
+    ],
+)
+def test_time_of_day(text, expected):
+    assert _time(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        # Could be at night or in the afternoon
+        "remind me tomorrow at 3 to call bob",
+        "remind me tomorrow at 13pm to call bob",
+        "remind me to call bob",
+        "remind me tomorrow on friday to call bob",
+        # Midnight or noon, neither fits the evening
+        "remind me this evening at 12 to call bob",
+        # Without a day, this morning may be over already
+        "remind me at 7 to call bob",
+        # Today with no time of day, 09:00 may be over already
+        "remind me today to call mom",
+    ],
+)
+def test_left_to_the_llm(text):
+    assert reminder_parser.parse_reminder_request(text) is None
+
+
+def test_weekday_part_of_day_is_not_in_the_summary():
+    action = reminder_parser.parse_reminder_request(
+        "remind me to call mom on monday morning"
+    )
+    assert action["summary"] == "call mom"
+    assert action["time_spec"]["value"] == {"day": "next_monday", "time": "09:00"}
+
+
+def test_unparsed_part_of_day_goes_to_the_llm():
+    # The day is already taken by "tomorrow", "afternoon" would stay in the summary
+    assert (
+        reminder_parser.parse_reminder_request("remind me tomorrow to call mom afternoon")
+        is None
+    )
+
+
+def test_list():
+    assert reminder_parser.parse_reminder_request("what reminders do I have tomorrow") == {
+        "action": "list",
+        "range": "tomorrow",
+    }
@@ -0,0 +1,69 @@
+"""Tests for keeping the reminder scheduler's index in sync with the calendar."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.yury_smarthome.skills import reminder_scheduler  # noqa: E402
+
+CALENDAR_ID = "calendar.reminders"
+START = datetime.now(timezone.utc) + timedelta(hours=1)
+
+
+class _FakeReminderCache:
+    def __init__(self):
+        self.reminders = []
+
+    async def async_get_occurrences(self, calendar_id, start, end):
+        return list(self.reminders)
+
+
+class _FakeHass:
+    def __init__(self):
+        self.data = {}
+
+
+def _reminder(summary: str, description: str) -> dict:
+    return {
+        "uid": "event-1",
+        "start": START,
+        "summary": summary,
+        "description": description,
+    }
+
+
+def test_in_place_update_rearms_the_occurrence(monkeypatch):
+    cache = _FakeReminderCache()
+    triggers = []
+
+    def track_point_in_time(hass, action, point_in_time):
+        trigger = {"action": action, "cancelled": False}
+        triggers.append(trigger)
+        return lambda: trigger.update(cancelled=True)
+
+    monkeypatch.setattr(reminder_scheduler, "NotifiedReminders", lambda hass: set())
+    monkeypatch.setattr(reminder_scheduler, "async_get_reminder_cache", lambda hass: cache)
+    monkeypatch.setattr(
+        reminder_scheduler, "async_track_point_in_time", track_point_in_time
+    )
+
+    scheduler = reminder_scheduler.ReminderScheduler(_FakeHass())
+    scheduler._get_calendar_entity = lambda calendar_id: object()
+
+    cache.reminders = [_reminder("call mom", "#remind:yury")]
+    asyncio.run(scheduler._async_refresh_calendar(CALENDAR_ID))
+    # Same uid and start, only the text and the target changed
+    cache.reminders = [_reminder("call dad", "#remind:eugenia")]
+    asyncio.run(scheduler._async_refresh_calendar(CALENDAR_ID))
+
+    [occurrence] = scheduler.occurrences
+    assert occurrence.summary == "call dad"
+    assert occurrence.description == "#remind:eugenia"
+    assert [trigger["cancelled"] for trigger in triggers] == [True, False]
+
+    # Refreshing an unchanged calendar keeps the current trigger
+    asyncio.run(scheduler._async_refresh_calendar(CALENDAR_ID))
+    assert len(triggers) == 2
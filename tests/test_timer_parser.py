@@ -0,0 +1,83 @@
+"""Tests for the local timer grammar."""
+
+import importlib.util
+from pathlib import Path
+import sys
+
+import pytest
+
+# Loaded by path: the package __init__ needs Home Assistant, the parser doesn't
+_PATH = (
+    Path(__file__).parents[1]
+    / "custom_components"
+    / "yury_smarthome"
+    / "skills"
+    / "timer_parser.py"
+)
+_spec = importlib.util.spec_from_file_location("timer_parser", _PATH)
+timer_parser = importlib.util.module_from_spec(_spec)
+sys.modules["timer_parser"] = timer_parser
+_spec.loader.exec_module(timer_parser)
+
+
+def _start(text: str) -> tuple[str, str] | None:
+    commands = timer_parser.parse_timer_command(text, [])
+    if commands is None:
+        return None
+    assert len(commands) == 1
+    assert commands[0]["action"] == "start"
+    return commands[0]["duration"], commands[0]["context"]
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("set a timer for 10 minutes", ("00:10:00", "")),
+        ("start a timer for twenty five minutes", ("00:25:00", "")),
+        ("set a timer for forty-five seconds", ("00:00:45", "")),
+        ("set a timer for an hour and a half", ("01:30:00", "")),
+        ("set a timer for two and a half hours", ("02:30:00", "")),
+        ("set a timer for half an hour", ("00:30:00", "")),
+        ("set a timer for 1 hour and 30 minutes", ("01:30:00", "")),
+        ("set a pasta timer for 12 minutes", ("00:12:00", "pasta")),
+        ("start a 3 minute tea timer", ("00:03:00", "tea")),
+        ("set a timer for 10 minutes please", ("00:10:00", "")),
+        ("start a timer in 5 minutes", ("00:05:00", "")),
+        ("set the oven timer to 10 minutes", ("00:10:00", "oven")),
+        ("set a timer for 10 minutes from now", ("00:10:00", "")),
+    ],
+)
+def test_start(text, expected):
+    assert _start(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "set a timer for 5 minutes and another for 10 minutes",
+        "set two timers for 5 minutes",
+        "set a 5 minute timer and turn off lights",
+        "set a timer for 5 minutes 5 minutes",
+        "set a timer for 10 minutes then play music",
+        "set a timer for 10 minutes in the kitchen",
+        "set a timer to 10 minutes at the stove",
+    ],
+)
+def test_start_falls_back_to_llm(text):
+    assert timer_parser.parse_timer_command(text, []) is None
+
+
+def test_control_single_timer():
+    targets = [timer_parser.TimerTarget("timer.pasta", "pasta", "active")]
+    commands = timer_parser.parse_timer_command("cancel the pasta timer", targets)
+    assert commands == [
+        {"action": "cancel", "entity_id": "timer.pasta", "duration": None, "context": "pasta"}
+    ]
+
+
+def test_control_ambiguous():
+    targets = [
+        timer_parser.TimerTarget("timer.a", "pasta", "active"),
+        timer_parser.TimerTarget("timer.b", "eggs", "active"),
+    ]
+    assert timer_parser.parse_timer_command("pause the timer", targets) is None
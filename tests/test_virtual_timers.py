@@ -0,0 +1,78 @@
+"""Tests for restoring virtual timers across restarts."""
+
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.yury_smarthome.skills import virtual_timers  # noqa: E402
+
+
+class _FakeStore:
+    def __init__(self, data):
+        self.data = data
+
+    async def async_load(self):
+        return self.data
+
+    def async_delay_save(self, data_func, delay):
+        self.data = data_func()
+
+    async def async_save(self, data):
+        self.data = data
+
+
+class _FakeHass:
+    def __init__(self, loop):
+        self.loop = loop
+        self.data = {}
+
+
+def _snapshot(deadline: float) -> dict:
+    return {
+        "timers": [
+            {
+                "timer_id": "virtual.restored",
+                "duration": 300,
+                "label": "tea",
+                "device_id": None,
+                "conversation_id": None,
+                "state": "active",
+                "deadline": deadline,
+            }
+        ]
+    }
+
+
+async def _restore(deadline: float) -> tuple[virtual_timers.VirtualTimerEngine, list]:
+    engine = virtual_timers.VirtualTimerEngine(_FakeHass(asyncio.get_running_loop()))
+    engine._store = _FakeStore(_snapshot(deadline))
+    await engine.async_load()
+    # Setup still runs: the Timers skill hasn't registered its handler yet
+    await asyncio.sleep(0.01)
+    finished = []
+    engine.async_set_finished_handler(finished.append)
+    await asyncio.sleep(0.01)
+    return engine, finished
+
+
+def test_expired_within_grace_is_announced_once_handler_is_set():
+    async def run():
+        engine, finished = await _restore(time.time() - 5)
+        assert [timer.timer_id for timer in finished] == ["virtual.restored"]
+        assert engine.timers == []
+
+    asyncio.run(run())
+
+
+def test_expired_past_grace_is_dropped():
+    async def run():
+        engine, finished = await _restore(
+            time.time() - virtual_timers.RESTORE_GRACE_SECONDS - 5
+        )
+        assert finished == []
+        assert engine.timers == []
+
+    asyncio.run(run())